@@ -130,5 +130,6 @@ Log.info("Starting systems...")
 web.start()
 display.StartDataRefresh()
 root.mainloop();
+display.StopDataRefresh()
 #except:
  #   Log.exception(F"There was a serious error that crashed the WeatherScreen.")
\ No newline at end of file
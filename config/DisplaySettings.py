@@ -0,0 +1,16 @@
+﻿from dataclasses import dataclass
+
+@dataclass
+class DisplaySettings:
+    BackgroundCacheMB: int = 128
+    BackgroundSecondTier: str = "None"
+    BackgroundSecondTierMB: int = 256
+    IconAtlas: bool = False
+    IconAtlasCellSize: int = 256
+    StrokeMode: str = "Items"
+    TextSpriteCacheSize: int = 512
+    StackedSprites: bool = False
+    StackedSpriteCacheSize: int = 256
+    StaticLayer: bool = False
+    SnapshotMinutes: int = 5
+    SnapshotMaxAgeMinutes: int = 60
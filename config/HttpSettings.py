@@ -0,0 +1,10 @@
+﻿from dataclasses import dataclass
+
+@dataclass
+class HttpSettings:
+    ConnectTimeoutSeconds: float = 5
+    ReadTimeoutSeconds: float = 20
+    Retries: int = 3
+    BackoffSeconds: float = 0.5
+    MaxBackoffSeconds: float = 10
+    PoolSize: int = 4
@@ -4,4 +4,6 @@
 class LoggingSettings:
     EnableTrace: bool = False
     EnableDebug: bool = False
-    LoggingLevel: str = "INFO"
\ No newline at end of file
+    LoggingLevel: str = "INFO"
+    EnableProfiling: bool = False
+    ProfilingSamples: int = 256
@@ -0,0 +1,9 @@
+﻿from dataclasses import dataclass
+
+@dataclass
+class ObservationSettings:
+    Enabled: bool = True
+    RawDays: int = 14
+    HourlyDays: int = 400
+    DailyDays: int = 3650
+    GapMinutes: int = 15
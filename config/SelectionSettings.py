@@ -6,5 +6,5 @@ class SelectionSettings:
     History: str = "WeatherUnderground"
     Forecast: str = "WeatherAPI"
     Station: str = "WeatherUnderground"
-    Sun: str = "SunriseSunset"
+    Sun: str = "SolarCalculator"
     Current: List[str] = field(default_factory=lambda: ["WeatherAPI", "WeatherUnderground"])
@@ -2,4 +2,6 @@
 
 @dataclass
 class ServiceSettings:
-    Key: str = ""
\ No newline at end of file
+    Key: str = ""
+    ErrorCacheSeconds: int = 60
+    DeadlineSeconds: float = 10
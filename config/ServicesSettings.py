@@ -1,10 +1,15 @@
 ﻿from dataclasses import dataclass, field
 
+from .HttpSettings import HttpSettings
+from .ObservationSettings import ObservationSettings
 from .SelectionSettings import SelectionSettings
-from .ServiceSettings import ServiceSettings
+from .WeatherAPISettings import WeatherAPISettings
+from .WeatherUndergroundSettings import WeatherUndergroundSettings
 
 @dataclass
 class ServicesSettings:
-    WeatherAPI: ServiceSettings = field(default_factory=ServiceSettings)
-    WeatherUnderground: ServiceSettings = field(default_factory=ServiceSettings)
+    WeatherAPI: WeatherAPISettings = field(default_factory=WeatherAPISettings)
+    WeatherUnderground: WeatherUndergroundSettings = field(default_factory=WeatherUndergroundSettings)
     Selections: SelectionSettings = field(default_factory=SelectionSettings)
+    Http: HttpSettings = field(default_factory=HttpSettings)
+    Observations: ObservationSettings = field(default_factory=ObservationSettings)
@@ -1,4 +1,5 @@
 ﻿from dataclasses import dataclass, field
+from typing import Optional
 
 from config.TextElementSettings import TextElementSettings
 
@@ -7,4 +8,5 @@ from config.TextElementSettings import TextElementSettings
 class StackedEmojiElementSettings(TextElementSettings):
     Front: TextElementSettings = field(default_factory=lambda:TextElementSettings(FontSize=0, Anchor="center", Stroke=False))
     Middle: TextElementSettings = field(default_factory=lambda:TextElementSettings(FontSize=0, Anchor="center", Stroke=False))
-    Back: TextElementSettings = field(default_factory=lambda:TextElementSettings(FontSize=0, Anchor="center", Stroke=False))
\ No newline at end of file
+    Back: TextElementSettings = field(default_factory=lambda:TextElementSettings(FontSize=0, Anchor="center", Stroke=False))
+    Composite: Optional[bool] = None
\ No newline at end of file
@@ -8,4 +8,5 @@ class StackedIconElementSettings(TextElementSettings):
     Front: TextElementSettings = field(default_factory=lambda:TextElementSettings(FontSize=0, Anchor="center", Stroke=False))
     Middle: TextElementSettings = field(default_factory=lambda:TextElementSettings(FontSize=0, Anchor="center", Stroke=False))
     Height: int = 100
-    Width: int = 100
\ No newline at end of file
+    Width: int = 100
+    Composite: Optional[bool] = None
\ No newline at end of file
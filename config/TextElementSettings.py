@@ -13,4 +13,5 @@ class TextElementSettings(ElementSettings):
     Stroke: Optional[bool] = None
     StrokeColor: Optional[str] = None
     StrokeWidth: Optional[int] = None
+    StrokeMode: Optional[str] = None
     Justify: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,11 @@
+﻿from dataclasses import dataclass
+
+from .ServiceSettings import ServiceSettings
+
+@dataclass
+class WeatherAPISettings(ServiceSettings):
+    CurrentCacheSeconds: int = 900
+    ForecastCacheSeconds: int = 1800
+    AlertsCacheSeconds: int = 900
+    AstronomyCacheSeconds: int = 21600
+    StaleSeconds: int = 300
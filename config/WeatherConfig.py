@@ -9,6 +9,7 @@ from hashlib import md5
 from .LoggingSettings import LoggingSettings
 from .ServicesSettings import ServicesSettings
 from .ChatGPTSettings import ChatGPTSettings
+from .DisplaySettings import DisplaySettings
 from .WeatherSettings import WeatherSettings
 from .WebConfig import WebConfig
 
@@ -98,6 +99,7 @@ class WeatherConfig:
     Services: ServicesSettings = field(default_factory=ServicesSettings)
     ChatGPT: ChatGPTSettings = field(default_factory=ChatGPTSettings)
     Weather: WeatherSettings = field(default_factory=WeatherSettings)
+    Display: DisplaySettings = field(default_factory=DisplaySettings)
     Web: WebConfig = field(default_factory=WebConfig)
 
     _configFileName: str = field(default="weatherscreen.config", init=False, repr=False, compare=False, metadata={"serialize":False})
@@ -0,0 +1,9 @@
+﻿from dataclasses import dataclass
+
+from .ServiceSettings import ServiceSettings
+
+@dataclass
+class WeatherUndergroundSettings(ServiceSettings):
+    ObservationCacheSeconds: int = 55
+    HistoryCacheSeconds: int = 600
+    StaleSeconds: int = 0
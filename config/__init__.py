@@ -1,8 +1,11 @@
 ﻿from .ConfigChangeHandler import ConfigChangeHandler
+from .DisplaySettings import DisplaySettings
 from .ElementSettings import ElementSettings
 from .FormattedTextElementSettings import FormattedTextElementSettings
+from .HttpSettings import HttpSettings
 from .HumiditySquareSettings import HumiditySquareSettings
 from .LoggingSettings import LoggingSettings
+from .ObservationSettings import ObservationSettings
 from .RainForecastSettings import RainForecastSettings
 from .RainSquareSettings import RainSquareSettings
 from .SelectionSettings import SelectionSettings
@@ -17,7 +20,9 @@ from .SkyGradientSettings import SkyGradientSettings
 from .SquareElementSettings import SquareElementSettings
 from .StackedEmojiElementSettings import StackedEmojiElementSettings
 from .TextElementSettings import TextElementSettings
+from .WeatherAPISettings import WeatherAPISettings
 from .WeatherSettings import WeatherSettings
+from .WeatherUndergroundSettings import WeatherUndergroundSettings
 from .WebConfig import WebConfig
 from .WindIndicatorSettings import WindIndicatorSettings
 from .WeatherConfig import WeatherConfig
@@ -0,0 +1,28 @@
+﻿import threading
+
+from typing import Callable
+
+from watchdog.events import FileSystemEventHandler
+
+ImageExtensions = (".jpg", ".png")
+
+class BackgroundChangeHandler(FileSystemEventHandler):
+    def __init__(self, onChanged: Callable[[], None], debounceSeconds: float = 2.0):
+        self.OnChanged = onChanged
+        self.DebounceSeconds = debounceSeconds
+        self.Timer: threading.Timer = None
+        self.Lock = threading.Lock()
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "") or ""]
+        if not any(p.lower().endswith(ImageExtensions) for p in paths):
+            return
+
+        with self.Lock:
+            if self.Timer is not None:
+                self.Timer.cancel()
+            self.Timer = threading.Timer(self.DebounceSeconds, self.OnChanged)
+            self.Timer.daemon = True
+            self.Timer.start()
@@ -0,0 +1,114 @@
+﻿import json, logging, os, threading
+import exiftool
+
+from watchdog.observers import Observer
+
+from .BackgroundChangeHandler import BackgroundChangeHandler, ImageExtensions
+
+class BackgroundImageIndex:
+    FormatVersion = 1
+
+    def __init__(self, imageDirectory: str, indexPath: str):
+        self.Log = logging.getLogger("BackgroundImageIndex")
+        self.ImageDirectory = imageDirectory
+        self.IndexPath = indexPath
+        self.Entries: dict[str, dict] = {}
+        self.Version = 0
+        self.Lock = threading.RLock()
+        self.Observer = None
+        self.Load()
+
+    def Load(self):
+        if not os.path.exists(self.IndexPath):
+            return
+        try:
+            with open(self.IndexPath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("Version") != self.FormatVersion:
+                self.Log.info("Background index format changed, rebuilding.")
+                return
+            self.Entries = data.get("Images", {})
+            self.Log.debug(F"Loaded {len(self.Entries)} indexed background images.")
+        except Exception as ex:
+            self.Log.warning(F"Could not read background index, rebuilding: {ex}")
+            self.Entries = {}
+
+    def Save(self):
+        temporaryPath = self.IndexPath + ".tmp"
+        try:
+            with open(temporaryPath, "w", encoding="utf-8") as f:
+                json.dump({"Version": self.FormatVersion, "Images": self.Entries}, f, indent=1)
+            os.replace(temporaryPath, self.IndexPath)
+        except Exception as ex:
+            self.Log.warning(F"Could not save background index: {ex}")
+
+    def Refresh(self) -> bool:
+        with self.Lock:
+            if not os.path.exists(self.ImageDirectory):
+                self.Log.warning(f"Background directory does not exist: {self.ImageDirectory}")
+                return False
+
+            found = {}
+            for entry in os.scandir(self.ImageDirectory):
+                if entry.is_file() and entry.name.lower().endswith(ImageExtensions):
+                    stat = entry.stat()
+                    found[entry.path] = (stat.st_size, stat.st_mtime)
+
+            removed = [p for p in self.Entries if p not in found]
+            changed = [
+                p for p, (size, mtime) in found.items()
+                if p not in self.Entries or self.Entries[p]["Size"] != size or self.Entries[p]["MTime"] != mtime
+            ]
+
+            for path in removed:
+                del self.Entries[path]
+
+            if changed:
+                self.Log.info(F"Reading tags for {len(changed)} new or changed background images.")
+                tags = self.ReadTags(changed)
+                for path in changed:
+                    size, mtime = found[path]
+                    self.Entries[path] = {"Size": size, "MTime": mtime, "Tags": tags.get(path, [])}
+
+            if removed or changed:
+                self.Version += 1
+                self.Save()
+                return True
+            return False
+
+    def ReadTags(self, paths: list[str]) -> dict[str, list[str]]:
+        results = {}
+        with exiftool.ExifTool() as et:
+            args = ["-IPTC:Keywords", "-XMP:Subject", "-json"] + paths
+            raw_output = et.execute(*args)
+
+            metadata_list = json.loads(raw_output)
+
+            for meta in metadata_list:
+                path = meta.get("SourceFile")
+                keywords = meta.get("IPTC:Keywords") or meta.get("XMP:Subject") or []
+
+                if isinstance(keywords, str):
+                    keywords = [k.strip() for k in keywords.split(";")]
+
+                results[os.path.normpath(path)] = keywords
+
+        return {p: results.get(os.path.normpath(p), []) for p in paths}
+
+    def GetAll(self) -> list[dict]:
+        with self.Lock:
+            return [{"Path": path, "Tags": list(entry["Tags"])} for path, entry in self.Entries.items()]
+
+    def Start(self):
+        if self.Observer is not None or not os.path.exists(self.ImageDirectory):
+            return
+        self.Observer = Observer()
+        self.Observer.schedule(BackgroundChangeHandler(self.Refresh), path=self.ImageDirectory, recursive=False)
+        self.Observer.daemon = True
+        self.Observer.start()
+
+    def Stop(self):
+        if self.Observer is None:
+            return
+        self.Observer.stop()
+        self.Observer = None
@@ -0,0 +1,92 @@
+﻿import logging, random
+
+from itertools import combinations
+from typing import Optional, Tuple
+
+from .BackgroundImageIndex import BackgroundImageIndex
+
+class BackgroundImageSelector:
+    # Fallback levels reported by Select, from most to least specific.
+    Exact = 0
+    TimingOnly = 1
+    Any = 2
+
+    def __init__(self, index: BackgroundImageIndex):
+        self.Log = logging.getLogger("BackgroundImageSelector")
+        self.Index = index
+        self.BuiltVersion = -1
+        self.AllImages: list[dict] = []
+        self.ByTag: dict[str, list[dict]] = {}
+        self.ByPair: dict[frozenset, list[dict]] = {}
+        self.Bags: dict[object, list[dict]] = {}
+        # Images that failed to decode; skipped until the index changes, which may mean the file was replaced.
+        self.BadPaths: set[str] = set()
+
+    def EnsureCurrent(self):
+        if self.BuiltVersion == self.Index.Version:
+            return
+        self.Rebuild()
+
+    def Rebuild(self):
+        version = self.Index.Version
+        images = self.Index.GetAll()
+
+        byTag: dict[str, list[dict]] = {}
+        byPair: dict[frozenset, list[dict]] = {}
+        for img in images:
+            tags = set(img["Tags"])
+            for tag in tags:
+                byTag.setdefault(tag, []).append(img)
+            for pair in combinations(sorted(tags), 2):
+                byPair.setdefault(frozenset(pair), []).append(img)
+
+        self.AllImages = images
+        self.ByTag = byTag
+        self.ByPair = byPair
+        self.Bags = {}
+        self.BadPaths.clear()
+        self.BuiltVersion = version
+        self.Log.debug(F"Indexed {len(images)} images into {len(byPair)} tag pairs.")
+
+    def Candidates(self, timing: str, condition: str) -> Tuple[list[dict], int]:
+        self.EnsureCurrent()
+        exact = self.ByPair.get(frozenset((timing, condition))) if timing != condition else self.ByTag.get(timing)
+        if exact:
+            return (exact, self.Exact)
+        timingOnly = self.ByTag.get(timing)
+        if timingOnly:
+            return (timingOnly, self.TimingOnly)
+        return (self.AllImages, self.Any)
+
+    def Bag(self, timing: str, condition: str, lastPath: Optional[str] = None) -> Tuple[list[dict], int]:
+        candidates, level = self.Candidates(timing, condition)
+        key = (timing, condition) if level == self.Exact else (timing if level == self.TimingOnly else None)
+        bag = self.Bags.get(key)
+        if not bag:
+            bag = [c for c in candidates if c["Path"] not in self.BadPaths]
+            random.shuffle(bag)
+            # Avoid showing the same image twice in a row across a refill.
+            if len(bag) > 1 and bag[-1]["Path"] == lastPath:
+                bag[0], bag[-1] = bag[-1], bag[0]
+            self.Bags[key] = bag
+        return (bag, level)
+
+    def Select(self, timing: str, condition: str, lastPath: Optional[str] = None) -> Tuple[Optional[dict], int]:
+        bag, level = self.Bag(timing, condition, lastPath)
+        if not bag:
+            return (None, level)
+        return (bag.pop(), level)
+
+    def Peek(self, timing: str, condition: str, lastPath: Optional[str] = None) -> Optional[dict]:
+        # The image the next Select for this pair will return, so it can be decoded ahead of time.
+        bag, _ = self.Bag(timing, condition, lastPath)
+        return bag[-1] if bag else None
+
+    def MarkBad(self, path: str):
+        self.BadPaths.add(path)
+        for bag in self.Bags.values():
+            bag[:] = [c for c in bag if c["Path"] != path]
+
+    def Coverage(self, timings: list[str], conditions: list[str]) -> dict[Tuple[str, str], int]:
+        self.EnsureCurrent()
+        return {(t, c): len(self.ByPair.get(frozenset((t, c)), [])) for t in timings for c in conditions}
@@ -0,0 +1,89 @@
+﻿import logging, threading, time
+
+from collections import deque
+from typing import Callable
+
+class ElementProfile:
+    def __init__(self, name: str, samples: int):
+        self.Name = name
+        self.Count = 0
+        self.Created = 0
+        self.Deleted = 0
+        # Each sample is (milliseconds, created, deleted, elements before, elements after).
+        self.Samples: deque[tuple[float, int, int, int, int]] = deque(maxlen=samples)
+
+    def Stats(self) -> dict:
+        samples = list(self.Samples)
+        durations = sorted(s[0] for s in samples)
+        last = samples[-1] if samples else (0.0, 0, 0, 0, 0)
+
+        def Percentile(p: float) -> float:
+            if not durations:
+                return 0.0
+            return durations[min(len(durations) - 1, int(p * len(durations)))]
+
+        return {
+            "Element": self.Name,
+            "Count": self.Count,
+            "P50Ms": round(Percentile(0.5), 3),
+            "P95Ms": round(Percentile(0.95), 3),
+            "MaxMs": round(durations[-1] if durations else 0.0, 3),
+            "LastMs": round(last[0], 3),
+            "Created": self.Created,
+            "Deleted": self.Deleted,
+            "ElementsBefore": last[3],
+            "ElementsAfter": last[4],
+        }
+
+class ElementProfiler:
+    # Times each element refresh and counts the canvas items it created and deleted. Percentiles cover the last Size refreshes.
+    def __init__(self, wrapper, enabled: bool = False, size: int = 256):
+        self.Log = logging.getLogger("ElementProfiler")
+        self.Wrapper = wrapper
+        self.Enabled = enabled
+        self.Size = size
+        self.Profiles: dict[str, ElementProfile] = {}
+        self.Lock = threading.Lock()
+
+    def SetEnabled(self, enabled: bool):
+        self.Enabled = enabled
+        self.Log.info(F"Element profiling {'enabled' if enabled else 'disabled'}.")
+
+    def Reset(self):
+        with self.Lock:
+            self.Profiles = {}
+
+    def Measure(self, element, refresh: Callable, *args):
+        wrapper = self.Wrapper
+        created = wrapper.ItemsCreated
+        deleted = wrapper.ItemsDeleted
+        before = len(wrapper.CurrentElements)
+        start = time.perf_counter()
+        try:
+            return refresh(*args)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.Record(type(element).__name__, elapsed, wrapper.ItemsCreated - created, wrapper.ItemsDeleted - deleted, before, len(wrapper.CurrentElements))
+
+    def Record(self, name: str, elapsed: float, created: int, deleted: int, before: int, after: int):
+        with self.Lock:
+            profile = self.Profiles.get(name)
+            if profile is None:
+                profile = self.Profiles[name] = ElementProfile(name, self.Size)
+            profile.Count += 1
+            profile.Created += created
+            profile.Deleted += deleted
+            profile.Samples.append((elapsed, created, deleted, before, after))
+
+    def Stats(self) -> dict:
+        with self.Lock:
+            elements = [p.Stats() for p in self.Profiles.values()]
+        elements.sort(key=lambda e: e["P95Ms"], reverse=True)
+        return {
+            "Enabled": self.Enabled,
+            "Samples": self.Size,
+            "CurrentElements": len(self.Wrapper.CurrentElements),
+            "ItemsCreated": self.Wrapper.ItemsCreated,
+            "ItemsDeleted": self.Wrapper.ItemsDeleted,
+            "Elements": elements,
+        }
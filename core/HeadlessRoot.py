@@ -0,0 +1,53 @@
+﻿import heapq, itertools, logging, time
+
+from typing import Callable, Optional
+
+class HeadlessRoot:
+    # The after/after_idle/after_cancel subset of tk.Tk, so the scheduler and fetch worker can run without a display server.
+    def __init__(self):
+        self.Log = logging.getLogger("HeadlessRoot")
+        self.Timers: list[tuple[float, int, str, Callable, tuple]] = []
+        self.Sequence = itertools.count()
+        self.Cancelled: set[str] = set()
+        self.Running = False
+
+    def after(self, ms: int, func: Callable, *args) -> str:
+        sequence = next(self.Sequence)
+        id = F"after#{sequence}"
+        heapq.heappush(self.Timers, (time.monotonic() + ms / 1000, sequence, id, func, args))
+        return id
+
+    def after_idle(self, func: Callable, *args) -> str:
+        return self.after(0, func, *args)
+
+    def after_cancel(self, id: str):
+        self.Cancelled.add(id)
+
+    def update(self) -> int:
+        # Runs every callback that is due now, including ones they schedule with no delay.
+        ran = 0
+        while self.Timers and self.Timers[0][0] <= time.monotonic():
+            _, _, id, func, args = heapq.heappop(self.Timers)
+            if id in self.Cancelled:
+                self.Cancelled.discard(id)
+                continue
+            try:
+                func(*args)
+            except Exception:
+                self.Log.exception(F"Callback {id} failed")
+            ran += 1
+        return ran
+
+    def mainloop(self, seconds: Optional[float] = None):
+        self.Running = True
+        end = None if seconds is None else time.monotonic() + seconds
+        while self.Running and (end is None or time.monotonic() < end):
+            self.update()
+            wake = self.Timers[0][0] if self.Timers else time.monotonic() + 0.1
+            if end is not None:
+                wake = min(wake, end)
+            time.sleep(max(0, min(wake - time.monotonic(), 0.1)))
+        self.Running = False
+
+    def quit(self):
+        self.Running = False
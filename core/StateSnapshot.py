@@ -0,0 +1,133 @@
+﻿import dataclasses, gzip, json, logging, os, threading
+
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from data.CurrentData import CurrentData
+from data.ForecastData import DaytimeData, ForecastData, HourlyForecast, NighttimeData, RainTimesData
+from data.HistoryData import HistoryData, HistoryLine
+from data.MoonPhase import MoonPhase
+from data.SunData import DailySunTimes, SunData
+from data.WeatherConditions import WeatherConditions
+
+# Bump whenever the layout of a saved type changes; older snapshots are then ignored instead of half-loaded.
+SnapshotVersion = 1
+
+SnapshotTypes = {t.__name__: t for t in (CurrentData, ForecastData, DaytimeData, NighttimeData, HourlyForecast, RainTimesData, HistoryLine, DailySunTimes)}
+SnapshotEnums = {t.__name__: t for t in (MoonPhase,)}
+
+class StateSnapshot:
+    # Gzipped JSON checkpoint of the last known data, so a restart can draw the full screen before any service answers.
+    def __init__(self, path: str):
+        self.Log = logging.getLogger("StateSnapshot")
+        self.Path = path
+        self.Lock = threading.Lock()
+
+    def Encode(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, datetime):
+            return {"$dt": value.isoformat()}
+        if isinstance(value, Enum):
+            return {"$enum": type(value).__name__, "v": value.value}
+        if isinstance(value, (list, tuple)):
+            return [self.Encode(v) for v in value]
+        if isinstance(value, HistoryData):
+            return {"$type": "HistoryData", "Lines": [self.Encode(l) for l in value.Store.Iterate()]}
+        if isinstance(value, SunData):
+            return {"$type": "SunData", "Yesterday": self.Encode(value.Yesterday), "Today": self.Encode(value.Today), "Tomorrow": self.Encode(value.Tomorrow), "Latitude": value.Latitude}
+        if isinstance(value, WeatherConditions):
+            encoded = {name: self.Encode(v) for name, v in vars(value).items() if v is not None}
+            encoded["$type"] = "WeatherConditions"
+            return encoded
+        if dataclasses.is_dataclass(value) and type(value).__name__ in SnapshotTypes:
+            # Unset fields are left out; they come back as the field default.
+            encoded = {f.name: self.Encode(getattr(value, f.name)) for f in dataclasses.fields(value) if getattr(value, f.name) is not None}
+            encoded["$type"] = type(value).__name__
+            return encoded
+        raise TypeError(F"Cannot snapshot a {type(value).__name__}")
+
+    def Decode(self, value):
+        if isinstance(value, list):
+            return [self.Decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$enum" in value:
+            return SnapshotEnums[value["$enum"]](value["v"])
+
+        typeName = value.get("$type")
+        if typeName == "HistoryData":
+            history = HistoryData()
+            history.Store.Extend(self.Decode(l) for l in value["Lines"])
+            return history
+        if typeName == "SunData":
+            return SunData(self.Decode(value["Yesterday"]), self.Decode(value["Today"]), self.Decode(value["Tomorrow"]), value["Latitude"])
+        if typeName == "WeatherConditions":
+            conditions = WeatherConditions(time=None)
+            for name, v in value.items():
+                if name != "$type":
+                    setattr(conditions, name, self.Decode(v))
+            return conditions
+        if typeName in SnapshotTypes:
+            cls = SnapshotTypes[typeName]
+            names = {f.name for f in dataclasses.fields(cls)}
+            return cls(**{name: self.Decode(v) for name, v in value.items() if name in names})
+        raise ValueError(F"Unknown snapshot type {typeName}")
+
+    def Serialize(self, current: Optional[CurrentData], forecast: Optional[ForecastData], history: Optional[HistoryData], sun: Optional[SunData]) -> bytes:
+        # Runs on the UI thread so the data cannot change underneath it; only the file write is left to a worker.
+        document = {
+            "Version": SnapshotVersion,
+            "SavedAt": datetime.now(timezone.utc).isoformat(),
+            "CurrentData": self.Encode(current),
+            "ForecastData": self.Encode(forecast),
+            "HistoryData": self.Encode(history),
+            "SunData": self.Encode(sun),
+        }
+        return gzip.compress(json.dumps(document, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+
+    def Write(self, data: bytes):
+        temp = self.Path + ".tmp"
+        with self.Lock:
+            try:
+                os.makedirs(os.path.dirname(self.Path), exist_ok=True)
+                with open(temp, "wb") as f:
+                    f.write(data)
+                # Replacing the file in one step means a crash mid-write leaves the previous snapshot intact.
+                os.replace(temp, self.Path)
+            except Exception as ex:
+                self.Log.warning(F"Could not write state snapshot: {ex}")
+
+    def Save(self, current: Optional[CurrentData], forecast: Optional[ForecastData], history: Optional[HistoryData], sun: Optional[SunData]):
+        self.Write(self.Serialize(current, forecast, history, sun))
+
+    def SaveAsync(self, current: Optional[CurrentData], forecast: Optional[ForecastData], history: Optional[HistoryData], sun: Optional[SunData]):
+        data = self.Serialize(current, forecast, history, sun)
+        threading.Thread(target=self.Write, args=(data,), name="StateSnapshot", daemon=True).start()
+
+    def Load(self, maxAgeSeconds: float) -> Optional[dict]:
+        # Returns the saved data keyed by name, or None when there is no usable snapshot.
+        if not os.path.exists(self.Path):
+            return None
+        try:
+            with open(self.Path, "rb") as f:
+                document = json.loads(gzip.decompress(f.read()).decode("utf-8"))
+            if document.get("Version") != SnapshotVersion:
+                self.Log.info(F"Ignoring snapshot version {document.get('Version')}.")
+                return None
+
+            savedAt = datetime.fromisoformat(document["SavedAt"])
+            age = (datetime.now(timezone.utc) - savedAt).total_seconds()
+            if age > maxAgeSeconds:
+                self.Log.info(F"Ignoring snapshot saved {age / 60:.0f} minutes ago.")
+                return None
+
+            state = {name: self.Decode(document.get(name)) for name in ("CurrentData", "ForecastData", "HistoryData", "SunData")}
+            state["SavedAt"] = savedAt
+            return state
+        except Exception as ex:
+            self.Log.warning(F"Could not read state snapshot: {ex}")
+            return None
@@ -4,9 +4,9 @@ import importlib
 import inspect
 import pkgutil
 import json, logging, os, random
-import exiftool
 
 from datetime import datetime, timedelta, timezone
+from time import monotonic
 from typing import List, Optional, Tuple
 
 from dateutil import tz
@@ -16,6 +16,11 @@ from tkinter import Tk
 
 from core.elements.ElementRefresh import ElementRefresh
 
+from .BackgroundImageIndex import BackgroundImageIndex
+from .BackgroundImageSelector import BackgroundImageSelector
+from .ElementProfiler import ElementProfiler
+from .StateSnapshot import StateSnapshot
+from .WeatherFetchWorker import WeatherFetchWorker
 from .WeatherScheduler import WeatherScheduler
 
 from config.SettingsEnums import *
@@ -32,7 +37,9 @@ from services.WeatherService import WeatherService
 from data.CurrentData import CurrentData
 from data.ForecastData import ForecastData
 from data.HistoryData import HistoryData, HistoryLine
+from data.HistoryStore import LineTimestamp, ToEpoch
 from data.SunData import SunData
+from data.WeatherConditions import WeatherConditions
 
 def GetAllElements(wrapper: CanvasWrapper, config: WeatherConfig) -> List[ElementBase]:
     foundItems: List[ElementBase] = []
@@ -83,17 +90,31 @@ class WeatherDisplay:
 
         canvas = tk.Canvas(self.Root, width=1920, height=1080, bg="#0f0", highlightthickness=0)
         canvas.pack(fill="both", expand=True)
-        self.CanvasWrapper = CanvasWrapper(canvas, "tk")
+        self.CanvasWrapper = CanvasWrapper(canvas, "tk", self.Config.Display, str(self.BasePath))
+        self.CanvasWrapper.WarmFonts(self.Config)
 
         self.Begin = datetime.now()
 
+        imageDirectory = os.path.join(self.BasePath, "assets", "backgrounds")
+        if (self.Config.Logging.EnableDebug):
+            self.Log.debug(F"image_dir: {imageDirectory}")
+        self.BackgroundImageIndex = BackgroundImageIndex(imageDirectory, os.path.join(self.BasePath, "assets", "backgrounds.index.json"))
+        self.BackgroundImageSelector = BackgroundImageSelector(self.BackgroundImageIndex)
         self.CheckBackgroundImages()
+        self.BackgroundImageIndex.Start()
 
         self.WeatherDisplayStore = WeatherDisplayStore()
         self.Elements = GetAllElements(self.CanvasWrapper, self.Config)
+        self.Profiler = ElementProfiler(self.CanvasWrapper, self.Config.Logging.EnableProfiling, self.Config.Logging.ProfilingSamples)
 
         self.WeatherScheduler = WeatherScheduler(self)
+        self.FetchWorker = WeatherFetchWorker(self.Root)
+        self.IsInitialized = False
         self.Start = datetime.now()
+        self.LaunchClock = monotonic()
+        self.FirstPaintClock: Optional[float] = None
+        self.Placeholders: Optional[Tuple[ForecastData, CurrentData, HistoryData]] = None
+        self.StateSnapshot = StateSnapshot(os.path.join(self.BasePath, "assets", "cache", "state.json.gz"))
 
     def CheckBackgroundImages(self):
         allBackgroundImages = self.GetAllBackgroundImages()
@@ -101,14 +122,9 @@ class WeatherDisplay:
         allStates = ['Sunrise','Sunset','Night','Daylight']
         allConditions = ['Clear','PartlyCloudy','Cloudy','Overcast','Foggy','Lightning','LightRain','MediumRain','HeavyRain','Snow']
 
-        for s in allStates:
-            for c in allConditions:
-                checkTags = [s,c]
-                MatchingImages = [
-                    img for img in allBackgroundImages
-                    if (all(tag in img["Tags"] for tag in checkTags))]
-                if not MatchingImages:
-                    self.Log.warning(F'No image matches tags ["{s}","{c}"]')
+        for (s, c), count in self.BackgroundImageSelector.Coverage(allStates, allConditions).items():
+            if count == 0:
+                self.Log.warning(F'No image matches tags ["{s}","{c}"]')
 
     def Initialize(self, wrapper: CanvasWrapper, store: WeatherDisplayStore, elements:list[ElementBase], history:HistoryData, current:CurrentData, forecast:ForecastData, sun:SunData):
         wrapper.Clear()
@@ -128,50 +144,30 @@ class WeatherDisplay:
         return local
 
     def GetAllBackgroundImages(self):
-        image_dir = os.path.join(self.BasePath, "assets", "backgrounds")
-        if (self.Config.Logging.EnableDebug):
-            self.Log.debug(F"image_dir: {image_dir}")
-        if not os.path.exists(image_dir):
-            self.Log.warning(f"Background directory does not exist: {image_dir}")
-            return []
-
-        image_data = []
-        image_files = [
-            os.path.join(image_dir, f)
-            for f in os.listdir(image_dir)
-            if f.lower().endswith(".jpg") or f.lower().endswith(".png")
-        ]
-
-        if not image_files:
-            return []
-
-        with exiftool.ExifTool() as et:
-            args = ["-IPTC:Keywords", "-XMP:Subject", "-json"] + image_files
-            raw_output = et.execute(*args)  # already returns a str
-
-            metadata_list = json.loads(raw_output)
-
-            for meta in metadata_list:
-                path = meta.get("SourceFile")
-                keywords = meta.get("IPTC:Keywords") or meta.get("XMP:Subject") or []
-
-                if isinstance(keywords, str):
-                    keywords = [k.strip() for k in keywords.split(";")]
-
-                image_data.append({
-                    "Path": path,
-                    "Tags": keywords
-                })
-
-        return image_data
+        self.BackgroundImageIndex.Refresh()
+        return self.BackgroundImageIndex.GetAll()
 
     def ChangeBackgroundImage(self):
         now = datetime.now()
         current_tags = [self.CurrentData.Conditions.GetTimingTag(), self.CurrentData.Conditions.GetWeatherTag()]
 
-        if (self.CurrentData.CurrentBackgroundImagePath != self.CurrentData.LastBackgroundImagePath and self.WeatherDisplayStore.Background is not None and self.CanvasWrapper.Canvas.winfo_ismapped()):
+        pending = self.CurrentData.LastBackgroundImagePath
+        if (pending is not None and pending != self.CurrentData.CurrentBackgroundImagePath):
+            if (self.CanvasWrapper.HasBackgroundImageFailed(pending)):
+                # It would never become ready, so drop it and let the selection below pick another image.
+                self.Log.warning(F"Could not decode {pending}, choosing another background.")
+                self.BackgroundImageSelector.MarkBad(pending)
+                self.CurrentData.LastBackgroundImagePath = self.CurrentData.CurrentBackgroundImagePath
+                self.CurrentData.LastBackgroundImageTags = None
+            else:
+                # Queues the decode again if it was skipped while the canvas was unmapped or evicted by later preloads.
+                self.CanvasWrapper.PreloadBackgroundImage(pending)
+
+        if (self.CurrentData.CurrentBackgroundImagePath != self.CurrentData.LastBackgroundImagePath and self.WeatherDisplayStore.Background is not None and self.CanvasWrapper.Canvas.winfo_ismapped()
+                and self.CanvasWrapper.IsBackgroundImageReady(self.CurrentData.LastBackgroundImagePath)):
             self.WeatherDisplayStore.Background.ChangeBackgroundImage(self.CurrentData.LastBackgroundImagePath)
             self.CurrentData.CurrentBackgroundImagePath = self.CurrentData.LastBackgroundImagePath
+            self.WeatherScheduler.UpdateBackground(self.WeatherDisplayStore, *self.ElementData())
 
         ShouldChange = False
         if (self.CurrentData.LastBackgroundImageTags is None or set(current_tags) != set(self.CurrentData.LastBackgroundImageTags)):
@@ -180,6 +176,7 @@ class WeatherDisplay:
             ShouldChange = True
 
         if not ShouldChange and self.CurrentData.LastBackgroundImagePath == self.CurrentData.CurrentBackgroundImagePath:
+            self.PreloadLikelyBackgrounds(now)
             self.Root.after(60 * 1000, self.ChangeBackgroundImage)
             return
         elif not ShouldChange:
@@ -189,44 +186,190 @@ class WeatherDisplay:
         self.CurrentData.LastBackgroundImageChange = now
         self.CurrentData.LastBackgroundImageTags = current_tags
         
-        AllImages = self.GetAllBackgroundImages()
-        MatchingImages = [
-            img for img in AllImages
-            if (all(tag in img["Tags"] for tag in current_tags))
-        ]
-
-        self.ImageTagMessage = ""
+        SelectedFile, level = self.BackgroundImageSelector.Select(current_tags[0], current_tags[1], self.CurrentData.LastBackgroundImagePath)
+        if SelectedFile is None:
+            self.Log.warning("No background images available.")
+            self.Root.after(60 * 1000, self.ChangeBackgroundImage)
+            return
 
-        if not MatchingImages:
-            SelectedFile = random.choice(AllImages)
-            self.ImageTagMessage = "Could not find Matching Image"
-        else:
-            SelectedFile = random.choice(MatchingImages)
+        self.CurrentData.ImageTagMessage = ""
+        if level != BackgroundImageSelector.Exact:
+            self.CurrentData.ImageTagMessage = "Could not find Matching Image"
 
         self.CurrentData.ThisImageTags = SelectedFile["Tags"]
         self.CurrentData.LastBackgroundImagePath = SelectedFile["Path"]
+        self.CanvasWrapper.PreloadBackgroundImage(SelectedFile["Path"])
 
-
-        if (self.WeatherDisplayStore.Background is not None and self.CanvasWrapper.Canvas.winfo_ismapped()):
+        if (self.WeatherDisplayStore.Background is not None and self.CanvasWrapper.Canvas.winfo_ismapped()
+                and self.CanvasWrapper.IsBackgroundImageReady(SelectedFile["Path"])):
             self.WeatherDisplayStore.Background.ChangeBackgroundImage(self.CurrentData.LastBackgroundImagePath)
             self.CurrentData.CurrentBackgroundImagePath = self.CurrentData.LastBackgroundImagePath
-            self.WeatherScheduler.UpdateBackground(self.WeatherDisplayStore, self.ForecastData, self.CurrentData, self.HistoryData, self.SunData)
+            self.WeatherScheduler.UpdateBackground(self.WeatherDisplayStore, *self.ElementData())
+            if (self.Config.Logging.EnableDebug):
+                self.Log.debug(F"Background cache: {self.CanvasWrapper.CachedBackgroundImages.Stats()}")
+            self.PreloadLikelyBackgrounds(now)
             self.Root.after(60 * 1000, self.ChangeBackgroundImage)
         else:
             self.Root.after(1000, self.ChangeBackgroundImage)
 
-    def StartDataRefresh(self):
-        self.GrabHistoricalData();
-        self.RefreshCurrentData();
-        self.RefreshSunData();
-        self.RefreshForecastData();
-        self.ChangeBackgroundImage()
+    def PredictBackgroundTags(self, now: datetime) -> List[Tuple[str, str]]:
+        conditions = self.CurrentData.Conditions
+        predicted = [(conditions.GetTimingTag(), conditions.GetWeatherTag())]
 
-        self.Initialize(self.CanvasWrapper, self.WeatherDisplayStore, self.Elements, self.HistoryData, self.CurrentData, self.ForecastData, self.SunData)
+        # Catch sunrise/sunset coming up within the next half hour under the current weather.
+        if (self.SunData is not None):
+            soon = copy.copy(conditions)
+            soon.Time = now + timedelta(minutes=30)
+            soon.SunAngle = self.SunData.GetDegreesAboveHorizon(soon.Time)
+            predicted.append((soon.GetTimingTag(), conditions.GetWeatherTag()))
+
+        # And weather changes such as rain starting in the next hour.
+        if (self.ForecastData is not None):
+            for hour in self.ForecastData.Next24Hours[:2]:
+                if (hour.Conditions is not None and hour.Conditions.SunAngle is not None):
+                    predicted.append((hour.Conditions.GetTimingTag(), hour.Conditions.GetWeatherTag()))
+
+        return list(dict.fromkeys(predicted))
+
+    def PreloadLikelyBackgrounds(self, now: datetime):
+        try:
+            for timing, condition in self.PredictBackgroundTags(now):
+                image = self.BackgroundImageSelector.Peek(timing, condition, self.CurrentData.LastBackgroundImagePath)
+                if (image is not None and image["Path"] != self.CurrentData.CurrentBackgroundImagePath):
+                    self.CanvasWrapper.PreloadBackgroundImage(image["Path"])
+        except Exception as ex:
+            self.Log.warning(F"Could not preload backgrounds: {ex}")
+
+    def StartDataRefresh(self):
+        # A fresh snapshot is drawn right away; the refreshes below then revalidate it in the background.
+        self.RestoreSnapshot()
+        # The observation database fills in whatever happened while the screen was off, even after a snapshot restore.
+        if (self.HistoryData is None or self.WeatherService.Observations is not None):
+            self.GrabHistoricalData()
+        self.RefreshCurrentData()
+        self.RefreshForecastData()
+        # Sun data needs coordinates; when the location is given as "lat,lon" it does not have to wait for current data.
+        if (self.SunLocation() is not None):
+            self.FirstTry = False
+            self.RefreshSunData()
+        self.Root.after(0, self.PaintSkeleton)
+        if (self.Config.Display.SnapshotMinutes > 0):
+            self.Root.after(self.Config.Display.SnapshotMinutes * 60 * 1000, self.CheckpointState)
 
         if (PlatformHelpers.IsRaspberryPi()):
             self.Root.after(2000, self.EnsureFullscreen)
 
+    def RestoreSnapshot(self):
+        if (self.Config.Display.SnapshotMinutes <= 0):
+            return
+        state = self.StateSnapshot.Load(self.Config.Display.SnapshotMaxAgeMinutes * 60)
+        if (state is None):
+            return
+
+        self.CurrentData = state["CurrentData"]
+        self.ForecastData = state["ForecastData"]
+        self.HistoryData = state["HistoryData"]
+        sun = state["SunData"]
+        # Sun times are relative to the day they were fetched for, so yesterday's cannot be reused after midnight.
+        if (sun is not None and sun.Today.SolarNoon is not None and sun.Today.SolarNoon.date() == datetime.now().date()):
+            self.SunData = sun
+
+        if (self.CurrentData is not None):
+            path = self.CurrentData.LastBackgroundImagePath
+            if (path is not None and os.path.exists(path)):
+                self.CanvasWrapper.PreloadBackgroundImage(path)
+            else:
+                # Forces ChangeBackgroundImage to pick a new image before the first Initialize.
+                self.CurrentData.LastBackgroundImageTags = None
+        self.Log.info(F"Restored state saved at {state['SavedAt'].astimezone():%H:%M:%S}.")
+
+    def CheckpointState(self):
+        self.SaveSnapshot(background=True)
+        self.Root.after(self.Config.Display.SnapshotMinutes * 60 * 1000, self.CheckpointState)
+
+    def SaveSnapshot(self, background: bool = False):
+        # Only a fully populated screen is worth restoring; anything less would overwrite a better snapshot.
+        if (not self.IsInitialized):
+            return
+        try:
+            if (background):
+                self.StateSnapshot.SaveAsync(self.CurrentData, self.ForecastData, self.HistoryData, self.SunData)
+            else:
+                self.StateSnapshot.Save(self.CurrentData, self.ForecastData, self.HistoryData, self.SunData)
+        except Exception as ex:
+            self.Log.warning(F"Could not snapshot state: {ex}")
+
+    def TryInitialize(self):
+        if (self.IsInitialized):
+            return
+        if (self.HistoryData is None or self.CurrentData is None or self.ForecastData is None or self.SunData is None):
+            # Redraw the skeleton so whatever has arrived so far is shown.
+            self.PaintSkeleton()
+            return
+
+        self.IsInitialized = True
+        self.ChangeBackgroundImage()
+        self.Initialize(self.CanvasWrapper, self.WeatherDisplayStore, self.Elements, self.HistoryData, self.CurrentData, self.ForecastData, self.SunData)
+        self.Log.info(F"Fully populated {(monotonic() - self.LaunchClock) * 1000:.0f} ms after launch.")
+
+    def PaintSkeleton(self):
+        if (self.IsInitialized):
+            return
+        if (not self.CanvasWrapper.Canvas.winfo_ismapped()):
+            self.Root.after(50, self.PaintSkeleton)
+            return
+        if (self.HistoryData is not None and self.CurrentData is not None and self.ForecastData is not None and self.SunData is not None):
+            # Everything came back from the snapshot, so the real screen can be drawn instead.
+            self.TryInitialize()
+            return
+
+        # Every element is drawn from its Initialize path, with empty data standing in for sources that have not answered yet.
+        now = datetime.now()
+        forecast, current, history, sun = self.ElementData()
+        store = self.WeatherDisplayStore
+
+        self.CanvasWrapper.Clear()
+        timing = "Daylight" if 7 <= now.hour < 19 else "Night"
+        image = self.BackgroundImageSelector.Peek(timing, "Clear")
+        if (image is not None):
+            store.Background = self.CanvasWrapper.BackgroundImage(image["Path"])
+
+        timers:List[Tuple[ElementBase, ElementRefresh]] = []
+        for e in self.Elements:
+            try:
+                timers.append((e, e.Initialize(store, forecast, current, history, sun)))
+            except Exception as ex:
+                self.Log.warning(F"{type(e).__name__} could not draw its skeleton: {ex}")
+        # Clocks and other timed elements keep running while the remaining sources are still loading.
+        self.WeatherScheduler.UpdateTimers(timers)
+
+        if (self.FirstPaintClock is None):
+            self.FirstPaintClock = monotonic()
+            self.Log.info(F"First paint {(self.FirstPaintClock - self.LaunchClock) * 1000:.0f} ms after launch.")
+
+    def ElementData(self) -> Tuple[ForecastData, CurrentData, HistoryData, Optional[SunData]]:
+        # Before every source has answered, elements are drawn and refreshed with empty stand-ins for what is missing.
+        if (self.IsInitialized):
+            return (self.ForecastData, self.CurrentData, self.HistoryData, self.SunData)
+        if (self.Placeholders is None):
+            now = datetime.now()
+            self.Placeholders = (ForecastData(), CurrentData(LastUpdate=now, ObservedTimeLocal=now, Conditions=WeatherConditions(time=now)), HistoryData())
+        forecast, current, history = self.Placeholders
+        return (
+            self.ForecastData if self.ForecastData is not None else forecast,
+            self.CurrentData if self.CurrentData is not None else current,
+            self.HistoryData if self.HistoryData is not None else history,
+            self.SunData)
+
+    def SunLocation(self) -> Optional[Tuple[float, float]]:
+        if (self.CurrentData is not None and self.CurrentData.Latitude is not None and self.CurrentData.Longitude is not None):
+            return (self.CurrentData.Latitude, self.CurrentData.Longitude)
+        try:
+            latitude, longitude = (float(part) for part in self.Config.Weather.Location.split(","))
+            return (latitude, longitude)
+        except ValueError:
+            return None
+
     def EnsureFullscreen(self):
         width = self.Root.winfo_width()
         height = self.Root.winfo_height()
@@ -238,17 +381,37 @@ class WeatherDisplay:
             self.Root.attributes("-fullscreen", True)
 
     def GrabHistoricalData(self):
-        historicalData = self.WeatherService.GetHistoryData();
+        self.FetchWorker.Submit("HistoryData", self.WeatherService.GetHistoryData, self.ApplyHistoryData, lambda ex: self.Root.after(60 * 1000, self.GrabHistoricalData))
+
+    def ApplyHistoryData(self, historicalData: HistoryData):
+        if (historicalData is None):
+            historicalData = HistoryData()
+        if (self.HistoryData is not None):
+            # Lines already in the stored history (such as ones recorded since startup) would otherwise show up twice.
+            known = set(historicalData.Store.TimestampColumn())
+            historicalData.Store.Extend(l for l in self.HistoryData.Store.Iterate() if ToEpoch(LineTimestamp(l)) not in known)
         self.HistoryData = historicalData
 
+        self.WeatherScheduler.UpdateHistoryData(self.WeatherDisplayStore, *self.ElementData())
+        self.TryInitialize()
+
     def RefreshSunData(self):
         now = datetime.now()
-        self.SunData = self.WeatherService.GetSunData(self.CurrentData.Latitude, self.CurrentData.Longitude, now);
+        location = self.SunLocation()
+        if (location is None):
+            self.Root.after(60 * 1000, self.RefreshSunData)
+            return
+        self.FetchWorker.Submit("SunData", lambda: self.WeatherService.GetSunData(location[0], location[1], now), self.ApplySunData, lambda ex: self.Root.after(60 * 1000, self.RefreshSunData))
+
+    def ApplySunData(self, sunData: SunData):
+        now = datetime.now()
+        self.SunData = sunData
 
         tomorrow = (now + timedelta(days = 1)).replace(hour = 0, minute = 0, second = 5, microsecond = 0)
         delay = (tomorrow - now).total_seconds() * 1000
-        self.WeatherScheduler.UpdateSunData(self.WeatherDisplayStore, self.ForecastData, self.CurrentData, self.HistoryData, self.SunData)
+        self.WeatherScheduler.UpdateSunData(self.WeatherDisplayStore, *self.ElementData())
         self.Root.after(int(delay), self.RefreshSunData)
+        self.TryInitialize()
 
     def AppendToHistory(self):
         now = datetime.now(timezone.utc)
@@ -272,21 +435,24 @@ class WeatherDisplay:
             Conditions=copy.copy(currentData.Conditions)
             )
 
-        self.HistoryData.Lines.insert(0, entry)
-        newHistory = []
-        for line in self.HistoryData.Lines:
-            timestamp = line.ObservedTimeUtc
-            if (DateTimeHelpers.GreaterThanOrEqual(timestamp, cutoff)):
-                newHistory.append(line)
-        
-        newHistory.sort(key=lambda x: x.LastUpdate or datetime.min, reverse=True)
-        self.HistoryData.Lines = newHistory
+        if (self.HistoryData is None):
+            self.HistoryData = HistoryData()
+
+        self.HistoryData.Store.Append(entry)
+        self.HistoryData.Store.ExpireBefore(cutoff)
+        self.WeatherService.RecordObservation(entry)
         if (self.Config.Logging.EnableTrace):
-            self.Log.debug(F"HistoryData now has {len(self.HistoryData.Lines)}")
-        self.WeatherScheduler.UpdateHistoryData(self.WeatherDisplayStore, self.ForecastData, self.CurrentData, self.HistoryData, self.SunData)
+            self.Log.debug(F"HistoryData now has {self.HistoryData.Store.Count}")
+        self.WeatherScheduler.UpdateHistoryData(self.WeatherDisplayStore, *self.ElementData())
 
     def RefreshCurrentData(self):
-        currentData = self.WeatherService.GetCurrentData()
+        self.FetchWorker.Submit("CurrentData", self.WeatherService.GetCurrentData, self.ApplyCurrentData, lambda ex: self.Root.after(60 * 1000, self.RefreshCurrentData))
+
+    def ApplyCurrentData(self, currentData: CurrentData):
+        if (currentData is None):
+            self.Root.after(60 * 1000, self.RefreshCurrentData)
+            return
+
         if (self.CurrentData is None):
             self.CurrentData = currentData;
         else:
@@ -305,15 +471,36 @@ class WeatherDisplay:
         if (self.Config.Logging.EnableTrace):
             self.Log.debug(F"RefreshCurrentData: {currentData}")
 
-        self.WeatherScheduler.UpdateCurrentData(self.WeatherDisplayStore, self.ForecastData, self.CurrentData, self.HistoryData, self.SunData)
+        self.WeatherScheduler.UpdateCurrentData(self.WeatherDisplayStore, *self.ElementData())
         self.Root.after(60 * 1000, self.RefreshCurrentData)
 
+        if (self.FirstTry):
+            self.FirstTry = False
+            self.RefreshSunData()
+        self.TryInitialize()
+
     def RefreshForecastData(self):
-        self.ForecastData = self.WeatherService.GetForecastData()
+        self.FetchWorker.Submit("ForecastData", self.WeatherService.GetForecastData, self.ApplyForecastData, lambda ex: self.Root.after(60 * 1000, self.RefreshForecastData))
+
+    def ApplyForecastData(self, forecastData: ForecastData):
+        if (forecastData is None):
+            self.Root.after(60 * 1000, self.RefreshForecastData)
+            return
+
+        self.ForecastData = forecastData
         if (self.Config.Logging.EnableTrace):
             self.Log.debug(F"RefreshForecastData: {self.ForecastData}")
             self.Log.debug("----")
 
-        self.WeatherScheduler.UpdateForecastData(self.WeatherDisplayStore, self.ForecastData, self.CurrentData, self.HistoryData, self.SunData)
+        self.WeatherScheduler.UpdateForecastData(self.WeatherDisplayStore, *self.ElementData())
         self.Root.after(60 * 60 * 1000, self.RefreshForecastData)
-            
+        self.TryInitialize()
+
+    def StopDataRefresh(self):
+        if (self.Config.Display.SnapshotMinutes > 0):
+            self.SaveSnapshot()
+        self.FetchWorker.Shutdown()
+        self.CanvasWrapper.BackgroundLoader.Shutdown()
+        self.BackgroundImageIndex.Stop()
+        if (self.WeatherService.Observations is not None):
+            self.WeatherService.Observations.Close()
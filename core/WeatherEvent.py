@@ -1,4 +1,6 @@
-﻿from typing import List, Tuple
+﻿import logging
+
+from typing import List, Tuple
 from core.WeatherScheduleItem import WeatherScheduleItem
 from core.elements import ElementBase
 from core.elements.ElementRefresh import ElementRefresh
@@ -7,7 +9,11 @@ from data import *
 
 
 class WeatherEvent:
+    # How long an element whose refresh raised waits before it is tried again.
+    FailureDelay = 10 * 1000
+
     def __init__(self, ev:str, delay:int = 0):
+        self.Log = logging.getLogger("WeatherEvent")
         self.Event = ev
         self.ActiveItems:list[WeatherScheduleItem] = []
         self.Delay = delay
@@ -19,7 +25,14 @@ class WeatherEvent:
             if (i.IsSatisfied):
                 self.ActiveItems.remove(i)
                 continue
-            r = i.Call(store, forecast, current, history, sun)
+            try:
+                r = i.Call(store, forecast, current, history, sun)
+            except Exception:
+                # One broken element must not take the rest of this batch, or its own later refreshes, down with it.
+                self.Log.exception(F"{type(i.ElementBase).__name__} failed to refresh on {self.Event}; retrying in {self.FailureDelay} ms.")
+                i.IsSatisfied = True
+                r = ElementRefresh(*dict.fromkeys(i.ElementRefresh.Reasons + (ElementRefresh.OnTimer,)))
+                r.Delay = self.FailureDelay
             results.append((i.ElementBase, r))
             self.ActiveItems.remove(i)
 
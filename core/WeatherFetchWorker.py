@@ -0,0 +1,68 @@
+﻿import logging, queue
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from tkinter import Tk
+
+class WeatherFetchWorker:
+    def __init__(self, root:Tk, maxWorkers:int = 4, pollInterval:int = 100):
+        self.Log = logging.getLogger("WeatherFetchWorker")
+        self.Root = root
+        self.Executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix="WeatherFetch")
+        self.Results: queue.Queue = queue.Queue()
+        self.Pending: set[str] = set()
+        self.PollInterval = pollInterval
+        self.IsRunning = True
+        self.DrainId = None
+
+    def Submit(self, name:str, fetch:Callable[[], Any], onComplete:Callable[[Any], None], onError:Optional[Callable[[Exception], None]] = None) -> bool:
+        if (not self.IsRunning):
+            return False
+        if (name in self.Pending):
+            self.Log.debug(F"{name} is already being fetched, skipping.")
+            return False
+
+        self.Pending.add(name)
+
+        def Run():
+            try:
+                result = fetch()
+                self.Results.put((name, onComplete, result))
+            except Exception as ex:
+                self.Log.warning(F"{name} failed: {ex}")
+                self.Results.put((name, onError, ex))
+
+        self.Executor.submit(Run)
+        # Polling only runs while something is in flight, so an idle screen is not woken ten times a second.
+        if (self.DrainId is None):
+            self.DrainId = self.Root.after(self.PollInterval, self.Drain)
+        return True
+
+    def Drain(self):
+        self.DrainId = None
+        if (not self.IsRunning):
+            return
+
+        while True:
+            try:
+                name, callback, result = self.Results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.Pending.discard(name)
+            if (callback is not None):
+                self.Root.after_idle(self._Apply, name, callback, result)
+
+        if (self.Pending):
+            self.DrainId = self.Root.after(self.PollInterval, self.Drain)
+
+    def _Apply(self, name:str, callback:Callable[[Any], None], result:Any):
+        try:
+            callback(result)
+        except Exception:
+            self.Log.exception(F"Applying {name} failed.")
+
+    def Shutdown(self):
+        self.IsRunning = False
+        self.Executor.shutdown(wait=False, cancel_futures=True)
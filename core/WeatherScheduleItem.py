@@ -4,12 +4,16 @@ from core.store.WeatherDisplayStore import WeatherDisplayStore
 from data import *
 
 class WeatherScheduleItem:
-    def __init__(self, elementRefresh:ElementRefresh, elementBase:ElementBase):
+    def __init__(self, elementRefresh:ElementRefresh, elementBase:ElementBase, profiler = None):
         self.IsSatisfied = False
         self.ElementBase = elementBase
         self.ElementRefresh = elementRefresh
+        self.Profiler = profiler
 
     def Call(self, store: WeatherDisplayStore, forecast:ForecastData, current:CurrentData, history:HistoryData, sun:SunData) -> ElementRefresh:
-        r = self.ElementBase.Refresh(store, forecast, current, history, sun)
+        if (self.Profiler is not None and self.Profiler.Enabled):
+            r = self.Profiler.Measure(self.ElementBase, self.ElementBase.Refresh, store, forecast, current, history, sun)
+        else:
+            r = self.ElementBase.Refresh(store, forecast, current, history, sun)
         self.IsSatisfied = True
         return r
\ No newline at end of file
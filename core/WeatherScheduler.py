@@ -1,5 +1,6 @@
-﻿from collections import defaultdict
-from typing import List, Tuple
+﻿import heapq, itertools, time
+
+from typing import List, Optional, Tuple
 
 from core.WeatherEvent import WeatherEvent
 from core.elements.ElementBase import ElementBase
@@ -12,20 +13,40 @@ from core.store.WeatherDisplayStore import WeatherDisplayStore
 from .WeatherScheduleItem import WeatherScheduleItem
 
 class WeatherScheduler:
-    def __init__(self, display):
+    def __init__(self, display, tolerance:int = 50):
         self.Display = display
         self.OnUpdateBackground = WeatherEvent(ElementRefresh.OnUpdateBackground)
         self.OnUpdateSunData = WeatherEvent(ElementRefresh.OnUpdateSunData)
         self.OnUpdateCurrentData = WeatherEvent(ElementRefresh.OnUpdateCurrentData)
         self.OnUpdateForecastData = WeatherEvent(ElementRefresh.OnUpdateForecastData)
         self.OnUpdateHistoryData = WeatherEvent(ElementRefresh.OnUpdateHistoryData)
-        self.Timers:list[WeatherEvent] = []
+        self.OnTimer = WeatherEvent(ElementRefresh.OnTimer)
+
+        # Single timer wheel: a heap of (deadline in monotonic ms, sequence, item) driven by one after() callback.
+        self.Tolerance = tolerance
+        self.Timers:list[Tuple[int, int, WeatherScheduleItem]] = []
+        self.Sequence = itertools.count()
+        self.ScheduledItems:dict[ElementBase, WeatherScheduleItem] = {}
+        self.ArmedDeadline:Optional[int] = None
+        self.ArmedId = None
+
+    def Now(self) -> int:
+        return int(time.monotonic() * 1000)
 
     def UpdateTimers(self, timers:List[Tuple[ElementBase, ElementRefresh]]):
-        timersByDelay = defaultdict(list)
+        # Every batch of refreshes ends here, so static items they redrew are composited once per batch.
+        self.Display.CanvasWrapper.FlushStaticLayer()
+        now = self.Now()
 
         for (elementBase, elementRefresh) in timers:
-            weatherScheduleItem = WeatherScheduleItem(elementRefresh, elementBase)
+            weatherScheduleItem = WeatherScheduleItem(elementRefresh, elementBase, self.Display.Profiler)
+
+            # An element only ever has one pending refresh; a newer schedule supersedes the old one.
+            previous = self.ScheduledItems.get(elementBase)
+            if (previous is not None):
+                previous.IsSatisfied = True
+            self.ScheduledItems[elementBase] = weatherScheduleItem
+
             for ev in elementRefresh.Reasons:
                 if ev == ElementRefresh.OnUpdateBackground:
                     self.OnUpdateBackground.ActiveItems.append(weatherScheduleItem)
@@ -38,14 +59,37 @@ class WeatherScheduler:
                 elif ev == ElementRefresh.OnUpdateSunData:
                     self.OnUpdateSunData.ActiveItems.append(weatherScheduleItem)
                 elif ev == ElementRefresh.OnTimer:
-                    timersByDelay[elementRefresh.Delay].append(weatherScheduleItem)
+                    heapq.heappush(self.Timers, (now + elementRefresh.Delay, next(self.Sequence), weatherScheduleItem))
+
+        self._Compact()
+        self._Arm()
+
+    def _Compact(self):
+        # Superseded and already-fired entries are skipped lazily; rebuild once they outnumber the live ones.
+        live = len(self.ScheduledItems)
+        if (len(self.Timers) > 2 * live + 16):
+            self.Timers = [t for t in self.Timers if not t[2].IsSatisfied]
+            heapq.heapify(self.Timers)
 
-        for delay, items in timersByDelay.items():
-            event = WeatherEvent(ElementRefresh.OnTimer, delay)
-            event.ActiveItems.extend(items)
-            self.Timers.append(event)
-            self.Display.Root.after(delay, lambda ev=event: self._OnTimerFired(ev))
-                
+        for events in (self.OnUpdateBackground, self.OnUpdateSunData, self.OnUpdateCurrentData, self.OnUpdateForecastData, self.OnUpdateHistoryData):
+            if (len(events.ActiveItems) > 2 * live + 16):
+                events.ActiveItems = [i for i in events.ActiveItems if not i.IsSatisfied]
+
+    def _Arm(self):
+        while (self.Timers and self.Timers[0][2].IsSatisfied):
+            heapq.heappop(self.Timers)
+        if (not self.Timers):
+            return
+
+        deadline = self.Timers[0][0]
+        if (self.ArmedId is not None and self.ArmedDeadline is not None and self.ArmedDeadline <= deadline):
+            return
+        if (self.ArmedId is not None):
+            self.Display.Root.after_cancel(self.ArmedId)
+
+        # Fire at the end of the tolerance window rather than the start, so nothing ever runs before its deadline.
+        self.ArmedDeadline = deadline
+        self.ArmedId = self.Display.Root.after(max(0, deadline + self.Tolerance - self.Now()), self._OnTimerFired)
 
     def UpdateBackground(self, store: WeatherDisplayStore, forecast:ForecastData, current:CurrentData, history:HistoryData, sun:SunData):
         i = self.OnUpdateBackground.OnEvent(store, forecast, current, history, sun)
@@ -67,13 +111,25 @@ class WeatherScheduler:
         i = self.OnUpdateSunData.OnEvent(store, forecast, current, history, sun)
         self.UpdateTimers(i)
 
-    def _OnTimerFired(self, event: WeatherEvent):
-        result = event.OnEvent(
+    def _OnTimerFired(self):
+        self.ArmedId = None
+        self.ArmedDeadline = None
+
+        # Everything that came due during the tolerance window runs in this tick.
+        cutoff = self.Now()
+        while (self.Timers and self.Timers[0][0] <= cutoff):
+            _, _, item = heapq.heappop(self.Timers)
+            if (not item.IsSatisfied):
+                self.OnTimer.ActiveItems.append(item)
+
+        # OnEvent catches failures per element, so every item due in this tick comes back with its next schedule.
+        forecast, current, history, sun = self.Display.ElementData()
+        result = self.OnTimer.OnEvent(
             store=self.Display.WeatherDisplayStore,
-            forecast=self.Display.ForecastData,
-            current=self.Display.CurrentData,
-            history=self.Display.HistoryData,
-            sun=self.Display.SunData
+            forecast=forecast,
+            current=current,
+            history=history,
+            sun=sun
         )
+        self.OnTimer.ActiveItems.clear()
         self.UpdateTimers(result)
-
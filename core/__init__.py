@@ -1,2 +1,5 @@
+﻿from .ElementProfiler import ElementProfiler
+from .HeadlessRoot import HeadlessRoot
+from .StateSnapshot import StateSnapshot
 from .WeatherDisplay import WeatherDisplay
 from .WeatherEncoder import WeatherEncoder
@@ -0,0 +1,173 @@
+﻿import hashlib, logging, os, threading
+
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional
+
+from PIL import Image, ImageTk
+
+class BackgroundImageCache:
+    # Byte-budgeted LRU of full-screen PhotoImages. The displayed image is pinned and never evicted.
+    def __init__(self, maxBytes: int):
+        self.Log = logging.getLogger("BackgroundImageCache")
+        self.MaxBytes = maxBytes
+        self.Entries: OrderedDict[str, tuple[ImageTk.PhotoImage, int]] = OrderedDict()
+        self.Bytes = 0
+        self.Pinned: Optional[str] = None
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.Entries
+
+    def __len__(self) -> int:
+        return len(self.Entries)
+
+    def Get(self, path: str) -> Optional[ImageTk.PhotoImage]:
+        entry = self.Entries.get(path)
+        if entry is None:
+            self.Misses += 1
+            return None
+        self.Hits += 1
+        self.Entries.move_to_end(path)
+        return entry[0]
+
+    def Put(self, path: str, image: ImageTk.PhotoImage):
+        if path in self.Entries:
+            self.Bytes -= self.Entries.pop(path)[1]
+        # Tk holds photo images as 32-bit pixels regardless of the source format.
+        size = image.width() * image.height() * 4
+        self.Entries[path] = (image, size)
+        self.Bytes += size
+        self.Evict()
+
+    def Pin(self, path: str):
+        self.Pinned = path
+        self.Evict()
+
+    def Evict(self):
+        for path in list(self.Entries):
+            if self.Bytes <= self.MaxBytes:
+                break
+            if path == self.Pinned:
+                continue
+            self.Bytes -= self.Entries.pop(path)[1]
+            self.Evictions += 1
+
+    def Stats(self) -> dict:
+        return {
+            "Entries": len(self.Entries),
+            "Bytes": self.Bytes,
+            "MaxBytes": self.MaxBytes,
+            "Hits": self.Hits,
+            "Misses": self.Misses,
+            "Evictions": self.Evictions,
+        }
+
+class ResizedImageTier:
+    # Second tier holding resized images as compressed bytes, so a re-display skips the full decode and resize.
+    def __init__(self, maxBytes: int, directory: Optional[str] = None, quality: int = 90):
+        self.Log = logging.getLogger("ResizedImageTier")
+        self.MaxBytes = maxBytes
+        self.Directory = directory
+        self.Quality = quality
+        self.Entries: OrderedDict[str, int] = OrderedDict()
+        self.Data: dict[str, bytes] = {}
+        self.Bytes = 0
+        self.Hits = 0
+        self.Misses = 0
+        self.Evictions = 0
+        self.Lock = threading.Lock()
+        if self.Directory is not None:
+            os.makedirs(self.Directory, exist_ok=True)
+            self.LoadDirectory()
+
+    @staticmethod
+    def Key(path: str, width: int, height: int) -> str:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = 0
+        return hashlib.md5(F"{path}|{mtime}|{width}x{height}".encode("utf-8")).hexdigest()
+
+    def LoadDirectory(self):
+        files = []
+        for entry in os.scandir(self.Directory):
+            if entry.is_file() and entry.name.endswith(".jpg"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self.Entries[key] = size
+            self.Bytes += size
+        self.Evict()
+
+    def FilePath(self, key: str) -> str:
+        return os.path.join(self.Directory, key + ".jpg")
+
+    def Get(self, path: str, width: int, height: int) -> Optional[Image.Image]:
+        key = self.Key(path, width, height)
+        with self.Lock:
+            if key not in self.Entries:
+                self.Misses += 1
+                return None
+            self.Entries.move_to_end(key)
+            self.Hits += 1
+            data = self.Data.get(key)
+
+        try:
+            if data is None:
+                with open(self.FilePath(key), "rb") as f:
+                    data = f.read()
+            img = Image.open(BytesIO(data))
+            img.load()
+            return img
+        except Exception as ex:
+            self.Log.warning(F"Could not read cached image for {path}: {ex}")
+            return None
+
+    def Put(self, path: str, width: int, height: int, img: Image.Image):
+        buffer = BytesIO()
+        img.save(buffer, format="JPEG", quality=self.Quality)
+        data = buffer.getvalue()
+        key = self.Key(path, width, height)
+
+        if self.Directory is not None:
+            try:
+                with open(self.FilePath(key), "wb") as f:
+                    f.write(data)
+            except Exception as ex:
+                self.Log.warning(F"Could not write cached image for {path}: {ex}")
+                return
+
+        with self.Lock:
+            if key in self.Entries:
+                self.Bytes -= self.Entries.pop(key)
+            self.Entries[key] = len(data)
+            self.Bytes += len(data)
+            if self.Directory is None:
+                self.Data[key] = data
+            self.Evict()
+
+    def Evict(self):
+        while self.Bytes > self.MaxBytes and self.Entries:
+            key, size = self.Entries.popitem(last=False)
+            self.Bytes -= size
+            self.Evictions += 1
+            if self.Directory is None:
+                self.Data.pop(key, None)
+            else:
+                try:
+                    os.remove(self.FilePath(key))
+                except OSError:
+                    pass
+
+    def Stats(self) -> dict:
+        return {
+            "Entries": len(self.Entries),
+            "Bytes": self.Bytes,
+            "MaxBytes": self.MaxBytes,
+            "Hits": self.Hits,
+            "Misses": self.Misses,
+            "Evictions": self.Evictions,
+        }
@@ -0,0 +1,65 @@
+﻿import logging
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from PIL import Image
+
+from .BackgroundImageCache import ResizedImageTier
+
+class BackgroundImageLoader:
+    def __init__(self, maxReady: int = 4, secondTier: Optional[ResizedImageTier] = None):
+        self.Log = logging.getLogger("BackgroundImageLoader")
+        self.SecondTier = secondTier
+        self.Executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="BackgroundDecode")
+        self.MaxReady = maxReady
+        self.Futures: OrderedDict[tuple[str, int, int], Future] = OrderedDict()
+
+    def Decode(self, path: str, width: int, height: int) -> Image.Image:
+        if self.SecondTier is not None:
+            img = self.SecondTier.Get(path, width, height)
+            if img is not None:
+                return img
+
+        img = Image.open(path)
+        # JPEG draft mode lets libjpeg decode at 1/2, 1/4 or 1/8 scale, so large photos never decode at full size.
+        img.draft("RGB", (width, height))
+        img = img.convert("RGB")
+        img = img.resize((width, height), Image.Resampling.LANCZOS)
+
+        if self.SecondTier is not None:
+            self.SecondTier.Put(path, width, height, img)
+        return img
+
+    def Preload(self, path: str, width: int, height: int):
+        key = (path, width, height)
+        if key in self.Futures:
+            self.Futures.move_to_end(key)
+            return
+
+        self.Futures[key] = self.Executor.submit(self.Decode, path, width, height)
+        while len(self.Futures) > self.MaxReady:
+            _, future = self.Futures.popitem(last=False)
+            future.cancel()
+
+    def IsReady(self, path: str, width: int, height: int) -> bool:
+        future = self.Futures.get((path, width, height))
+        return future is not None and future.done() and not future.cancelled() and future.exception() is None
+
+    def HasFailed(self, path: str, width: int, height: int) -> bool:
+        future = self.Futures.get((path, width, height))
+        return future is not None and future.done() and not future.cancelled() and future.exception() is not None
+
+    def Take(self, path: str, width: int, height: int) -> Optional[Image.Image]:
+        # Returns the decoded image, waiting on an in-flight decode or decoding inline if it was never preloaded.
+        future = self.Futures.pop((path, width, height), None)
+        if future is not None and not future.cancelled():
+            try:
+                return future.result()
+            except Exception as ex:
+                self.Log.warning(F"Preloading {path} failed: {ex}")
+        return self.Decode(path, width, height)
+
+    def Shutdown(self):
+        self.Executor.shutdown(wait=False, cancel_futures=True)
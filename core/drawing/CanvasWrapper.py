@@ -1,7 +1,11 @@
 ﻿from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+import dataclasses, os
 
 from PIL import Image, ImageTk
 from config import FormattedTextElementSettings, TextElementSettings
+from config.DisplaySettings import DisplaySettings
 from config.SquareElementSettings import SquareElementSettings
 from config.StackedEmojiElementSettings import StackedEmojiElementSettings
 from config.StackedIconElementSettings import StackedIconElementSettings
@@ -9,19 +13,56 @@ from core.drawing.CachedImage import CachedImage
 from core.store.EmojiStore import EmojiStore
 from data.EmojiDisplay import EmojiDisplay
 from data.IconDisplay import IconDisplay
+from .BackgroundImageCache import BackgroundImageCache, ResizedImageTier
+from .BackgroundImageLoader import BackgroundImageLoader
+from .IconAtlas import IconAtlas
+from .PilCanvas import PilCanvas, PilPhoto
+from .StackedSpriteCache import StackedSpriteCache
+from .TextSpriteCache import TextSpriteCache
 from .ElementStore import ElementStore
 from helpers import DateTimeHelpers
 from helpers import PlatformHelpers
 
 class CanvasWrapper:
-    def __init__(self, canvas, canvasType:str):
+    def __init__(self, canvas, canvasType:str, settings: DisplaySettings = None, basePath: str = None):
         self.Canvas = canvas
         self.CanvasType = canvasType
+        # "tk" draws on a tk.Canvas; "pil" draws on a PilCanvas, which has the same item API and rasterizes on demand.
+        self.HasCanvas = canvasType in ("tk", "pil")
+        self.Photo = PilPhoto if canvasType == "pil" else ImageTk.PhotoImage
         self.EmojiFont = "Noto Color Emoji" if PlatformHelpers.IsRaspberryPi() else "Segoe UI Emoji"
-
-        self.CachedBackgroundImages: dict[str, ImageTk.PhotoImage] = {}
-        self.CachedImages: list[CachedImage] = []
+        settings = settings or DisplaySettings()
+
+        secondTier = None
+        if (settings.BackgroundSecondTier == "Memory"):
+            secondTier = ResizedImageTier(settings.BackgroundSecondTierMB * 1024 * 1024)
+        elif (settings.BackgroundSecondTier == "Disk" and basePath):
+            secondTier = ResizedImageTier(settings.BackgroundSecondTierMB * 1024 * 1024, os.path.join(basePath, "assets", "cache", "backgrounds"))
+
+        self.CachedBackgroundImages = BackgroundImageCache(settings.BackgroundCacheMB * 1024 * 1024)
+        self.BackgroundLoader = BackgroundImageLoader(secondTier=secondTier)
+        self.CachedImages: dict[tuple[str, int, int], CachedImage] = {}
+        self.IconAtlas = None
+        if (settings.IconAtlas and basePath):
+            self.IconAtlas = IconAtlas(os.path.join(basePath, "assets", "icons"), settings.IconAtlasCellSize)
+            self.IconAtlas.BuildAsync()
+        self.StrokeMode = settings.StrokeMode
+        self.StackedSpriteDefault = settings.StackedSprites
+        self.TextSprites = TextSpriteCache(canvas, settings.TextSpriteCacheSize, self.Photo)
+        self.StackedSprites = StackedSpriteCache(self.TextSprites, self.IconAtlas, settings.StackedSpriteCacheSize, self.Photo)
         self.CurrentElements: list[ElementStore] = []
+        self.ItemsCreated = 0
+        self.ItemsDeleted = 0
+        # Shapes that never change after they are drawn go on an offscreen layer that is flattened into the background image.
+        self.StaticLayer = settings.StaticLayer
+        self.StaticCanvas = PilCanvas(background=None)
+        self.StaticImage: Optional[Image.Image] = None
+        self.StaticDirty = False
+        self.StaticBase: Optional[tuple[str, Image.Image]] = None
+        # Identifies what is on the static layer; cached backgrounds are keyed by it, so redrawing identical outlines keeps them.
+        self.StaticSignature: Optional[int] = None
+        self.Background: Optional[ElementStore] = None
+        self.BackgroundPath: Optional[str] = None
 
     def FormattedTextElement(self, date: datetime, settings: FormattedTextElementSettings, xOffset: int = 0, yOffset: int = 0) -> ElementStore:
         if (not settings.Enabled):
@@ -62,7 +103,7 @@ class CanvasWrapper:
         if (settings.Justify):
             justify = settings.Justify
 
-        return self.Text(text, settings.X + xOffset, settings.Y + yOffset, fontFamily, fontSize, fontWeight, anchor, fillColor, stroke, strokeWidth, strokeColor, justify)
+        return self.Text(text, settings.X + xOffset, settings.Y + yOffset, fontFamily, fontSize, fontWeight, anchor, fillColor, stroke, strokeWidth, strokeColor, justify, settings.StrokeMode)
 
     def TextElement(self, text:str, settings: TextElementSettings, xOffset: int = 0, yOffset: int = 0) -> ElementStore:
         if (not settings.Enabled):
@@ -97,15 +138,25 @@ class CanvasWrapper:
         if (settings.Justify):
             justify = settings.Justify
 
-        return self.Text(text, settings.X + xOffset, settings.Y + yOffset, fontFamily, fontSize, fontWeight, anchor, fillColor, stroke, strokeWidth, strokeColor, justify)
+        return self.Text(text, settings.X + xOffset, settings.Y + yOffset, fontFamily, fontSize, fontWeight, anchor, fillColor, stroke, strokeWidth, strokeColor, justify, settings.StrokeMode)
 
-    def EmojiText(self, text: str, x: int, y: int, fontSize: int = 16, fontWeight: str = "normal", anchor:str = "nw", fillColor:str = "white", stroke:bool = False, strokeAmount: int = 2, strokeColor: str = "black", justify: str = "left") -> ElementStore:
-        return self.Text(text, x, y, self.EmojiFont, fontSize, fontWeight, anchor, fillColor, stroke, strokeAmount, strokeColor, justify)
+    def EmojiText(self, text: str, x: int, y: int, fontSize: int = 16, fontWeight: str = "normal", anchor:str = "nw", fillColor:str = "white", stroke:bool = False, strokeAmount: int = 2, strokeColor: str = "black", justify: str = "left", strokeMode: str = None) -> ElementStore:
+        return self.Text(text, x, y, self.EmojiFont, fontSize, fontWeight, anchor, fillColor, stroke, strokeAmount, strokeColor, justify, strokeMode)
 
-    def Text(self, text: str, x: int, y: int, fontFamily: str = "Arial", fontSize: int = 16, fontWeight: str = "normal", anchor:str = "nw", fillColor:str = "white", stroke:bool = False, strokeAmount: int = 2, strokeColor: str = "black", justify: str = "left") -> ElementStore:
+    def Text(self, text: str, x: int, y: int, fontFamily: str = "Arial", fontSize: int = 16, fontWeight: str = "normal", anchor:str = "nw", fillColor:str = "white", stroke:bool = False, strokeAmount: int = 2, strokeColor: str = "black", justify: str = "left", strokeMode: str = None) -> ElementStore:
         es = ElementStore(self)
-        if (self.CanvasType == "tk"):
+        if (self.HasCanvas):
             fontDescriptor = [fontFamily, fontSize, fontWeight]
+            if (stroke and strokeColor and strokeAmount and (strokeMode or self.StrokeMode) == "Sprite"):
+                sprite = (fontFamily, fontSize, fontWeight, fillColor, strokeColor, strokeAmount, justify)
+                photo = self.TextSprites.Get(text, *sprite)
+                if (photo is not None):
+                    es.Photo = photo
+                    es.Sprite = sprite
+                    es.AddPrimaryElement(self.Canvas.create_image(x, y, image = photo, anchor = anchor))
+                    self.Track(es)
+                    return es
+
             if (stroke and strokeColor and strokeAmount):
                 xStroke = list(range(-1 * strokeAmount, strokeAmount + 1))
                 yStroke = list(range(-1 * strokeAmount, strokeAmount + 1))
@@ -115,23 +166,27 @@ class CanvasWrapper:
             
             es.AddPrimaryElement(self.Canvas.create_text(x, y, text = text, anchor = anchor, fill = fillColor, font = fontDescriptor, justify = justify));
 
-        self.CurrentElements.append(es)
+        self.Track(es)
         return es
 
-    def Line(self, x1, y1, x2, y2, width:int = 2, arrow:str = None, fillColor: str = "white", smooth: bool = False, stroke: bool = False, strokeColor: str = "black", strokeAmount: int = 2) -> ElementStore:
+    def Line(self, x1, y1, x2, y2, width:int = 2, arrow:str = None, fillColor: str = "white", smooth: bool = False, stroke: bool = False, strokeColor: str = "black", strokeAmount: int = 2, strokeMode: str = None, static: bool = False) -> ElementStore:
         es = ElementStore(self)
-        if (self.CanvasType == "tk"):
-            if (stroke and strokeColor and strokeAmount):
+        if (self.HasCanvas):
+            canvas = self.CreateCanvas(es, static)
+            if (stroke and strokeColor and strokeAmount and (strokeMode or self.StrokeMode) == "Sprite"):
+                # A single wider line underneath outlines a line the same way the offset grid does.
+                es.AddBackingElement(canvas.create_line(x1, y1, x2, y2, fill = strokeColor, width = width + strokeAmount * 2, smooth = smooth, arrow = arrow))
+            elif (stroke and strokeColor and strokeAmount):
                 xStroke = list(range(-1 * strokeAmount, strokeAmount + 1))
                 yStroke = list(range(-1 * strokeAmount, strokeAmount + 1))
                 for xs in xStroke:
                     for ys in yStroke:
-                        es.AddBackingElement(self.Canvas.create_line(x1 + xs, y1 + ys, x2 + xs, y2 + ys, fill = strokeColor, width = width, smooth = smooth, arrow = arrow))
+                        es.AddBackingElement(canvas.create_line(x1 + xs, y1 + ys, x2 + xs, y2 + ys, fill = strokeColor, width = width, smooth = smooth, arrow = arrow))
                         
 
-            es.AddPrimaryElement(self.Canvas.create_line(x1, y1, x2, y2, fill = fillColor, width = width, smooth = smooth, arrow= arrow))
+            es.AddPrimaryElement(canvas.create_line(x1, y1, x2, y2, fill = fillColor, width = width, smooth = smooth, arrow= arrow))
 
-        self.CurrentElements.append(es)
+        self.Track(es)
         return es
 
     def SquareElement(self, settings: SquareElementSettings, xOffset: int = 0, yOffset: int = 0) -> ElementStore:
@@ -154,106 +209,191 @@ class CanvasWrapper:
 
         return self.Rectangle(x1 + xOffset, y1 + yOffset, x2 + xOffset, y2 + yOffset, borderWidth=borderWidth, fillColor=fillColor, outlineColor=borderColor)
 
-    def Rectangle(self, x1:int, y1:int, x2:int, y2:int, borderWidth: int = 2, fillColor: str = '', outlineColor: str = "white") -> ElementStore:
+    def Rectangle(self, x1:int, y1:int, x2:int, y2:int, borderWidth: int = 2, fillColor: str = '', outlineColor: str = "white", static: bool = False) -> ElementStore:
         es = ElementStore(self)
-        if (self.CanvasType == "tk"):
-            es.AddPrimaryElement(self.Canvas.create_rectangle(x1, y1, x2, y2, outline=outlineColor, fill=fillColor, width=borderWidth))
+        if (self.HasCanvas):
+            es.AddPrimaryElement(self.CreateCanvas(es, static).create_rectangle(x1, y1, x2, y2, outline=outlineColor, fill=fillColor, width=borderWidth))
 
-        self.CurrentElements.append(es)
+        self.Track(es)
         return es
 
-    def Oval(self, x1: int, y1:int, x2:int, y2: int, borderWidth: int = 2, fillColor: str = '', outlineColor: str = "white") -> ElementStore:
+    def Oval(self, x1: int, y1:int, x2:int, y2: int, borderWidth: int = 2, fillColor: str = '', outlineColor: str = "white", static: bool = False) -> ElementStore:
         es = ElementStore(self)
-        if (self.CanvasType == "tk"):
-            es.AddPrimaryElement(self.Canvas.create_oval(x1, y1, x2, y2, width=borderWidth, fill=fillColor, outline=outlineColor))
+        if (self.HasCanvas):
+            es.AddPrimaryElement(self.CreateCanvas(es, static).create_oval(x1, y1, x2, y2, width=borderWidth, fill=fillColor, outline=outlineColor))
 
-        self.CurrentElements.append(es)
+        self.Track(es)
         return es
 
     def BackgroundImage(self, path: str) -> ElementStore:
         es = ElementStore(self)
-        if (self.CanvasType == "tk"):
-            if path in self.CachedBackgroundImages:
-                es.AddPrimaryElement(self.Canvas.create_image(0, 0, image=self.CachedBackgroundImages[path], anchor="nw"))
-                self.CurrentElements.append(es)
-                return es
-            imgtk = None
-            if self.Canvas.winfo_ismapped():
-                img = Image.open(path)
-                img = img.resize((self.Canvas.winfo_width(), self.Canvas.winfo_height()), Image.Resampling.LANCZOS)
-                imgtk = ImageTk.PhotoImage(img)
-                self.CachedBackgroundImages[path] = imgtk
+        if (self.HasCanvas):
+            self.CachedBackgroundImages.Pin(self.BackgroundKey(path))
+            imgtk = self.CachedBackgroundImages.Get(self.BackgroundKey(path))
+            if imgtk is None and self.Canvas.winfo_ismapped():
+                imgtk = self.BackgroundPhoto(path)
 
             es.AddPrimaryElement(self.Canvas.create_image(0, 0, image=imgtk, anchor="nw"))
+            self.Background = es
+            self.BackgroundPath = path
 
-        self.CurrentElements.append(es)
+        self.Track(es)
         return es
 
     def Image(self, path: str, x: int, y:int, width:int, height:int) -> ElementStore:
         es = ElementStore(self)
-        if (self.CanvasType == "tk"):
-            cachedImage = next(
-                    (img for img in self.CachedImages
-                        if img.Path == path
-                        and img.Width == width
-                        and img.Height == height), None
-                )
-
-            if cachedImage:
-                es.AddPrimaryElement(self.Canvas.create_image(x, y, image=cachedImage.Image, anchor="nw"))
-
-            imgtk = None
-            img = Image.open(path)
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
-            imgtk = ImageTk.PhotoImage(img)
-            self.CachedImages.append(CachedImage(path, imgtk, width, height))
+        if (self.HasCanvas):
+            es.AddPrimaryElement(self.Canvas.create_image(x, y, image=self.CachedPhoto(path, width, height), anchor="nw"))
 
-            es.AddPrimaryElement(self.Canvas.create_image(x, y, image=imgtk, anchor="nw"))
+        self.Track(es)
+        return es
 
-        self.CurrentElements.append(es)
+    def PilImage(self, img: "Image.Image", x: int, y: int) -> ElementStore:
+        es = ElementStore(self)
+        if (self.HasCanvas):
+            # The canvas does not keep its own reference, so the PhotoImage lives on the ElementStore.
+            es.Photo = self.Photo(img)
+            es.AddPrimaryElement(self.Canvas.create_image(x, y, image=es.Photo, anchor="nw"))
+
+        self.Track(es)
         return es
 
+    def ChangePilImage(self, es:ElementStore, img: "Image.Image", x: int, y: int):
+        if (es.IsDeleted):
+            return
+
+        if (self.HasCanvas):
+            es.Photo = self.Photo(img)
+            self.Canvas.itemconfig(es.PrimaryElement, image=es.Photo)
+            self.Canvas.coords(es.PrimaryElement, x, y)
+
     def ChangeBackgroundImage(self, es:ElementStore, path:str):
         if (es.IsDeleted):
             return
 
-        if (self.CanvasType == "tk"):
-            if path in self.CachedBackgroundImages:
-                self.Canvas.itemconfig(es.PrimaryElement, image=self.CachedBackgroundImages[path])
-            elif self.Canvas.winfo_ismapped():
-                img = Image.open(path)
-                img = img.resize((self.Canvas.winfo_width(), self.Canvas.winfo_height()), Image.Resampling.LANCZOS)
-                imgtk = ImageTk.PhotoImage(img)
-                self.CachedBackgroundImages[path] = imgtk
+        if (self.HasCanvas):
+            imgtk = self.CachedBackgroundImages.Get(self.BackgroundKey(path))
+            if imgtk is None and self.Canvas.winfo_ismapped():
+                imgtk = self.BackgroundPhoto(path)
+            if imgtk is not None:
+                self.CachedBackgroundImages.Pin(self.BackgroundKey(path))
+                self.BackgroundPath = path
                 self.Canvas.itemconfig(es.PrimaryElement, image=imgtk)
 
+    def BackgroundPhoto(self, path: str) -> ImageTk.PhotoImage:
+        img = self.BackgroundLoader.Take(path, self.Canvas.winfo_width(), self.Canvas.winfo_height())
+        if (self.StaticLayer):
+            # Keep the undecorated image so a change to the static layer does not decode it again.
+            self.StaticBase = (path, img)
+            img = self.CompositeStatic(img)
+        imgtk = self.Photo(img)
+        self.CachedBackgroundImages.Put(self.BackgroundKey(path), imgtk)
+        return imgtk
+
+    def BackgroundKey(self, path: str) -> str:
+        if (not self.StaticLayer):
+            return path
+        return F"{path}#{self.StaticSignature}"
+
+    def CompositeStatic(self, img: "Image.Image") -> "Image.Image":
+        if (self.StaticImage is None or self.StaticImage.size != img.size):
+            return img
+        composite = img.convert("RGBA")
+        composite.alpha_composite(self.StaticImage)
+        return composite.convert("RGB")
+
+    def CreateCanvas(self, es:ElementStore, static: bool):
+        if (static and self.StaticLayer):
+            es.IsStatic = True
+            self.StaticDirty = True
+            return self.StaticCanvas
+        return self.Canvas
+
+    def CanvasFor(self, es:ElementStore):
+        # Any change to a static item means the background has to be composited again.
+        if (es.IsStatic):
+            self.StaticDirty = True
+            return self.StaticCanvas
+        return self.Canvas
+
+    def FlushStaticLayer(self):
+        if (not self.StaticDirty or not self.HasCanvas or not self.Canvas.winfo_ismapped()):
+            return
+
+        self.StaticDirty = False
+        width = self.Canvas.winfo_width()
+        height = self.Canvas.winfo_height()
+        signature = hash((width, height, repr([(item.Kind, item.Coords, sorted(item.Options.items())) for item in self.StaticCanvas.Items.values()])))
+        if (signature == self.StaticSignature):
+            # The items were redrawn exactly as they were, so every cached composite is still right.
+            return
+
+        self.StaticCanvas.Width = width
+        self.StaticCanvas.Height = height
+        self.StaticImage = self.StaticCanvas.Render() if self.StaticCanvas.Items else None
+        # Backgrounds composited with the old layer stay cached under the old signature and age out of the LRU.
+        self.StaticSignature = signature
+
+        path = self.BackgroundPath
+        if (self.Background is None or self.Background.IsDeleted or path is None):
+            return
+
+        if (self.StaticBase is not None and self.StaticBase[0] == path):
+            imgtk = self.Photo(self.CompositeStatic(self.StaticBase[1]))
+            self.CachedBackgroundImages.Put(self.BackgroundKey(path), imgtk)
+        else:
+            imgtk = self.BackgroundPhoto(path)
+        self.CachedBackgroundImages.Pin(self.BackgroundKey(path))
+        self.Canvas.itemconfig(self.Background.PrimaryElement, image=imgtk)
+
+    def PreloadBackgroundImage(self, path: str):
+        if (not self.HasCanvas or self.BackgroundKey(path) in self.CachedBackgroundImages or not self.Canvas.winfo_ismapped()):
+            return
+        self.BackgroundLoader.Preload(path, self.Canvas.winfo_width(), self.Canvas.winfo_height())
+
+    def IsBackgroundImageReady(self, path: str) -> bool:
+        if (not self.HasCanvas or self.BackgroundKey(path) in self.CachedBackgroundImages):
+            return True
+        return self.BackgroundLoader.IsReady(path, self.Canvas.winfo_width(), self.Canvas.winfo_height())
+
+    def HasBackgroundImageFailed(self, path: str) -> bool:
+        if (not self.HasCanvas or self.BackgroundKey(path) in self.CachedBackgroundImages):
+            return False
+        return self.BackgroundLoader.HasFailed(path, self.Canvas.winfo_width(), self.Canvas.winfo_height())
+
     def ChangeImage(self, es:ElementStore, path:str, width: int, height: int):
         if (es.IsDeleted):
             return
 
-        if (self.CanvasType == "tk"):
-            cachedImage = next(
-                    (img for img in self.CachedImages
-                        if img.Path == path
-                        and img.Width == width
-                        and img.Height == height), None
-                )
-
-            if cachedImage:
-                self.Canvas.itemconfig(es.PrimaryElement, image=cachedImage.Image)
-
-            else:
-                img = Image.open(path)
-                img = img.resize((width, height), Image.Resampling.LANCZOS)
-                imgtk = ImageTk.PhotoImage(img)
-                self.CachedImages.append(CachedImage(path, imgtk, width, height))
-                self.Canvas.itemconfig(es.PrimaryElement, image=imgtk)
+        if (self.HasCanvas):
+            self.Canvas.itemconfig(es.PrimaryElement, image=self.CachedPhoto(path, width, height))
+
+    def CachedPhoto(self, path: str, width: int, height: int) -> ImageTk.PhotoImage:
+        key = (path, width, height)
+        cachedImage = self.CachedImages.get(key)
+        if cachedImage is not None:
+            return cachedImage.Image
+
+        img = self.IconAtlas.Crop(path, width, height) if self.IconAtlas is not None else None
+        if img is None:
+            img = Image.open(path)
+            img = img.resize((width, height), Image.Resampling.LANCZOS)
+        imgtk = self.Photo(img)
+        self.CachedImages[key] = CachedImage(path, imgtk, width, height)
+        return imgtk
     
     def UpdateText(self, es:ElementStore, text: str):
         if (es.IsDeleted):
             return
 
-        if (self.CanvasType == "tk"):
+        if (self.HasCanvas):
+            if (es.Sprite is not None):
+                photo = self.TextSprites.Get(text, *es.Sprite)
+                if (photo is not None):
+                    es.Photo = photo
+                    self.Canvas.itemconfig(es.PrimaryElement, image=photo)
+                return
+
             for s in es.BackingElements:
                 self.Canvas.itemconfig(s, text=text)
             self.Canvas.itemconfig(es.PrimaryElement, text=text)
@@ -262,44 +402,110 @@ class CanvasWrapper:
         if (es.IsDeleted):
             return
 
-        if (self.CanvasType == "tk"):
-            for s in es.BackingElements:
-                self.Canvas.coords(s, x, y)
-            self.Canvas.coords(es.PrimaryElement, x, y)
+        if (self.HasCanvas):
+            canvas = self.CanvasFor(es)
+            if (es.BackingElements):
+                # Shift the stroke copies by the same delta so they keep their offsets around the primary item.
+                current = canvas.coords(es.PrimaryElement)
+                dx = x - current[0]
+                dy = y - current[1]
+                if (dx == 0 and dy == 0):
+                    return
+                for s in es.BackingElements:
+                    canvas.move(s, dx, dy)
+            canvas.coords(es.PrimaryElement, x, y)
 
     def MoveDouble(self, es:ElementStore, x1:int, y1:int, x2:int, y2:int):
         if (es.IsDeleted):
             return
 
-        if (self.CanvasType == "tk"):
+        if (self.HasCanvas):
+            canvas = self.CanvasFor(es)
+            for s in es.BackingElements:
+                canvas.coords(s, x1, y1, x2, y2)
+            canvas.coords(es.PrimaryElement, x1, y1, x2, y2)
+
+    def ChangeFillColor(self, es:ElementStore, color: str):
+        if (es.IsDeleted):
+            return
+
+        if (self.HasCanvas):
+            canvas = self.CanvasFor(es)
+            canvas.itemconfig(es.PrimaryElement, fill=color)
+
+    def SetVisible(self, es:ElementStore, visible: bool):
+        if (es.IsDeleted or es.IsHidden != visible):
+            return
+
+        if (self.HasCanvas):
+            canvas = self.CanvasFor(es)
+            state = "normal" if visible else "hidden"
             for s in es.BackingElements:
-                self.Canvas.coords(s, x1, y1, x2, y2)
-            self.Canvas.coords(es.PrimaryElement, x1, y1, x2, y2)
+                canvas.itemconfig(s, state=state)
+            canvas.itemconfig(es.PrimaryElement, state=state)
+
+        es.IsHidden = not visible
 
     def Delete(self, es:ElementStore):
         if (es.IsDeleted):
             return
 
-        if (self.CanvasType == "tk"):
+        if (self.HasCanvas):
+            canvas = self.CanvasFor(es)
             for e in es.BackingElements:
-                self.Canvas.delete(e)
-            self.Canvas.delete(es.PrimaryElement)
+                canvas.delete(e)
+            canvas.delete(es.PrimaryElement)
 
         es.IsDeleted = True
+        self.ItemsDeleted += 1
 
         if (es in self.CurrentElements):
             self.CurrentElements.remove(es)
 
+    def Track(self, es:ElementStore):
+        self.CurrentElements.append(es)
+        self.ItemsCreated += 1
+
     def Clear(self):
-        if (self.CanvasType == "tk"):
+        if (self.HasCanvas):
             self.Canvas.delete("all")
+            if (self.StaticCanvas.Items):
+                self.StaticCanvas.delete("all")
+                self.StaticDirty = True
+            self.Background = None
+            self.BackgroundPath = None
             for e in self.CurrentElements:
                 e.IsDeleted = True
+            self.ItemsDeleted += len(self.CurrentElements)
+            self.CurrentElements.clear()
 
     def StackedEmojiElement(self, emoji:EmojiDisplay, settings: StackedEmojiElementSettings, xOffset: int = 0, yOffset: int = 0) -> EmojiStore:
         if (not settings.Enabled):
             return None
 
+        layers = self.StackedEmojiLayers(emoji, settings, xOffset, yOffset)
+        if (self.UseStackedSprite(settings)):
+            es = self.StackedSprite(None, layers)
+            if (es is not None):
+                return EmojiStore(back=es, composite=True)
+
+        return EmojiStore(
+            back=self.Text(*layers[0]),
+            middle=self.Text(*layers[1]),
+            front=self.Text(*layers[2])
+            )
+
+    def ChangeStackedEmoji(self, store:EmojiStore, emoji:EmojiDisplay, settings: StackedEmojiElementSettings, xOffset: int = 0, yOffset: int = 0):
+        layers = self.StackedEmojiLayers(emoji, settings, xOffset, yOffset)
+        if (store.IsComposite):
+            self.ChangeStackedSprite(store.Back, None, layers)
+            return
+
+        store.Back.UpdateText(emoji.Back)
+        store.Middle.UpdateText(emoji.Middle)
+        store.Front.UpdateText(emoji.Front)
+
+    def StackedEmojiLayers(self, emoji:EmojiDisplay, settings: StackedEmojiElementSettings, xOffset: int = 0, yOffset: int = 0) -> list[tuple]:
         fontFamily = self.EmojiFont
         if (settings.FontFamily):
             fontFamily = settings.FontFamily
@@ -328,7 +534,7 @@ class CanvasWrapper:
         if (settings.Justify):
             justify = settings.Justify
 
-        def CreateAdjustedEmoji(el:TextElementSettings, layerText:str, fontSizeOffset:int):
+        def AdjustedLayer(el:TextElementSettings, layerText:str, fontSizeOffset:int):
             adjFontFamily = el.FontFamily if el.FontFamily is not None else fontFamily
             adjFontSize = fontSize + fontSizeOffset + el.FontSize
             adjFontWeight = el.FontWeight if el.FontWeight is not None else fontWeight
@@ -338,21 +544,45 @@ class CanvasWrapper:
             adjStrokeWidth = el.StrokeWidth if el.StrokeWidth is not None else strokeWidth
             adjFillColor = el.FillColor if el.FillColor is not None else fillColor
             adjJustify = el.Justify if el.Justify is not None else justify
+            adjStrokeMode = el.StrokeMode if el.StrokeMode is not None else settings.StrokeMode
             adjX = settings.X + xOffset + el.X
             adjY = settings.Y + yOffset + el.Y
 
-            return self.Text(layerText, adjX, adjY, adjFontFamily, adjFontSize, adjFontWeight, adjAnchor, adjFillColor, adjStroke, adjStrokeWidth, adjStrokeColor, adjJustify)
+            return (layerText, adjX, adjY, adjFontFamily, adjFontSize, adjFontWeight, adjAnchor, adjFillColor, adjStroke, adjStrokeWidth, adjStrokeColor, adjJustify, adjStrokeMode)
 
-        return EmojiStore(
-            back=CreateAdjustedEmoji(settings.Back, emoji.Back, 0),
-            middle=CreateAdjustedEmoji(settings.Middle, emoji.Middle, -2),
-            front=CreateAdjustedEmoji(settings.Front, emoji.Front, -4)
-            )
+        return [
+            AdjustedLayer(settings.Back, emoji.Back, 0),
+            AdjustedLayer(settings.Middle, emoji.Middle, -2),
+            AdjustedLayer(settings.Front, emoji.Front, -4)
+            ]
 
     def StackedIconElement(self, path:str, icon:IconDisplay, settings: StackedIconElementSettings, xOffset: int = 0, yOffset: int = 0) -> EmojiStore:
         if (not settings.Enabled):
             return None
 
+        image, layers = self.StackedIconLayers(path, icon, settings, xOffset, yOffset)
+        if (self.UseStackedSprite(settings)):
+            es = self.StackedSprite(image, layers)
+            if (es is not None):
+                return EmojiStore(back=es, composite=True)
+
+        return EmojiStore(
+            back=self.Image(*image),
+            middle=self.Text(*layers[0]),
+            front=self.Text(*layers[1])
+            )
+
+    def ChangeStackedIcon(self, store:EmojiStore, path:str, icon:IconDisplay, settings: StackedIconElementSettings, xOffset: int = 0, yOffset: int = 0):
+        image, layers = self.StackedIconLayers(path, icon, settings, xOffset, yOffset)
+        if (store.IsComposite):
+            self.ChangeStackedSprite(store.Back, image, layers)
+            return
+
+        store.Back.ChangeImage(path, settings.Width, settings.Height)
+        store.Middle.UpdateText(icon.Middle)
+        store.Front.UpdateText(icon.Front)
+
+    def StackedIconLayers(self, path:str, icon:IconDisplay, settings: StackedIconElementSettings, xOffset: int = 0, yOffset: int = 0) -> tuple[tuple, list[tuple]]:
         fontFamily = self.EmojiFont
         if (settings.FontFamily):
             fontFamily = settings.FontFamily
@@ -396,9 +626,7 @@ class CanvasWrapper:
         if (anchor == "sw" or anchor == "s" or anchor == "sw"):
             textPosY += settings.Height
 
-        iconImg = self.Image(path, xPos, yPos, width, height)
-
-        def CreateAdjustedEmoji(el:TextElementSettings, layerText:str, fontSizeOffset:int):
+        def AdjustedLayer(el:TextElementSettings, layerText:str, fontSizeOffset:int):
             adjFontFamily = el.FontFamily if el.FontFamily is not None else fontFamily
             adjFontSize = fontSize + fontSizeOffset + el.FontSize
             adjFontWeight = el.FontWeight if el.FontWeight is not None else fontWeight
@@ -408,14 +636,93 @@ class CanvasWrapper:
             adjStrokeWidth = el.StrokeWidth if el.StrokeWidth is not None else strokeWidth
             adjFillColor = el.FillColor if el.FillColor is not None else fillColor
             adjJustify = el.Justify if el.Justify is not None else justify
+            adjStrokeMode = el.StrokeMode if el.StrokeMode is not None else settings.StrokeMode
             adjX = textPosX + el.X
             adjY = textPosY + el.Y
 
-            return self.Text(layerText, adjX, adjY, adjFontFamily, adjFontSize, adjFontWeight, adjAnchor, adjFillColor, adjStroke, adjStrokeWidth, adjStrokeColor, adjJustify)
+            return (layerText, adjX, adjY, adjFontFamily, adjFontSize, adjFontWeight, adjAnchor, adjFillColor, adjStroke, adjStrokeWidth, adjStrokeColor, adjJustify, adjStrokeMode)
+
+        return ((path, xPos, yPos, width, height), [
+            AdjustedLayer(settings.Middle, icon.Middle, -2),
+            AdjustedLayer(settings.Front, icon.Front, -4)
+            ])
+
+    def UseStackedSprite(self, settings: StackedEmojiElementSettings | StackedIconElementSettings) -> bool:
+        return self.HasCanvas and (settings.Composite if settings.Composite is not None else self.StackedSpriteDefault)
+
+    def StackedSpriteKey(self, image: tuple, layers: list[tuple]) -> tuple[tuple, int, int]:
+        # Positions are made relative to the first item, so every placement of the same stack shares one sprite.
+        originX, originY = (image[1], image[2]) if image is not None else (layers[0][1], layers[0][2])
+        originX = round(originX)
+        originY = round(originY)
+        if (image is not None):
+            path, x, y, width, height = image
+            image = (path, round(x) - originX, round(y) - originY, width, height)
+        layers = tuple(
+            (text, round(x) - originX, round(y) - originY, fontFamily, fontSize, fontWeight, anchor, fillColor, bool(stroke and strokeColor and strokeWidth), strokeWidth, strokeColor, justify)
+            for text, x, y, fontFamily, fontSize, fontWeight, anchor, fillColor, stroke, strokeWidth, strokeColor, justify, _ in layers
+            if text)
+        return ((image, layers), originX, originY)
+
+    def StackedSprite(self, image: tuple, layers: list[tuple]) -> ElementStore:
+        key, originX, originY = self.StackedSpriteKey(image, layers)
+        sprite = self.StackedSprites.Get(key)
+        if (sprite is None):
+            return None
 
-        return EmojiStore(
-            back=iconImg,
-            middle=CreateAdjustedEmoji(settings.Middle, icon.Middle, -2),
-            front=CreateAdjustedEmoji(settings.Front, icon.Front, -4)
-            )
+        photo, dx, dy = sprite
+        es = ElementStore(self)
+        es.Photo = photo
+        es.AddPrimaryElement(self.Canvas.create_image(originX + dx, originY + dy, image=photo, anchor="nw"))
+        self.Track(es)
+        return es
+
+    def ChangeStackedSprite(self, es: ElementStore, image: tuple, layers: list[tuple]):
+        if (es.IsDeleted):
+            return
+
+        key, originX, originY = self.StackedSpriteKey(image, layers)
+        sprite = self.StackedSprites.Get(key)
+        if (sprite is None):
+            # Nothing left to draw, e.g. every layer is empty.
+            self.SetVisible(es, False)
+            return
+
+        photo, dx, dy = sprite
+        if (photo is not es.Photo):
+            es.Photo = photo
+            self.Canvas.itemconfig(es.PrimaryElement, image=photo)
+        self.Canvas.coords(es.PrimaryElement, originX + dx, originY + dy)
+        self.SetVisible(es, True)
+
+    def WarmFonts(self, settings):
+        # Looks up every font the settings name on a background thread, so the first screen can already use sprites.
+        fonts = []
+        pending = [settings]
+        seen = set()
+        while pending:
+            value = pending.pop()
+            if id(value) in seen or not dataclasses.is_dataclass(value) or isinstance(value, type):
+                continue
+            seen.add(id(value))
+            if isinstance(value, TextElementSettings):
+                defaultFamily = self.EmojiFont if isinstance(value, (StackedEmojiElementSettings, StackedIconElementSettings)) else "Arial"
+                fonts.append((value.FontFamily or defaultFamily, value.FontWeight or "normal"))
+            for f in dataclasses.fields(value):
+                child = getattr(value, f.name, None)
+                pending.extend(child if isinstance(child, (list, tuple)) else [child])
+        self.TextSprites.WarmFontsAsync(fonts)
+
+    def WarmStackedEmoji(self, settings: StackedEmojiElementSettings, emojis: Callable[[], Iterable[EmojiDisplay]]):
+        if (not settings.Enabled or not self.UseStackedSprite(settings)):
+            return
+        # Tk may only be queried from this thread, so the point size is resolved before the worker starts.
+        self.TextSprites.Pixels(12)
+        self.StackedSprites.WarmAsync(lambda: (self.StackedSpriteKey(None, self.StackedEmojiLayers(e, settings))[0] for e in emojis()))
+
+    def WarmStackedIcon(self, settings: StackedIconElementSettings, icons: Callable[[], Iterable[IconDisplay]], iconPath: Callable[[IconDisplay], str]):
+        if (not settings.Enabled or not self.UseStackedSprite(settings)):
+            return
+        self.TextSprites.Pixels(12)
+        self.StackedSprites.WarmAsync(lambda: (self.StackedSpriteKey(*self.StackedIconLayers(iconPath(i), i, settings))[0] for i in icons()))
 
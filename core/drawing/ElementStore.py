@@ -3,6 +3,10 @@
         self.PrimaryElement = ""
         self.BackingElements = []
         self.IsDeleted = False
+        self.IsHidden = False
+        self.IsStatic = False
+        self.Photo = None
+        self.Sprite = None
         self.Wrapper = wrapper
 
     def AddPrimaryElement(self, id:str):
@@ -17,12 +21,21 @@
     def ChangeImage(self, path: str, width: int, height: int):
         self.Wrapper.ChangeImage(self, path, width, height)
 
+    def ChangePilImage(self, img, x: int, y: int):
+        self.Wrapper.ChangePilImage(self, img, x, y)
+
     def MoveSingle(self, x:int, y:int):
         self.Wrapper.MoveSingle(self, x, y)
 
     def MoveDouble(self, x1: int, y1: int, x2: int, y2: int):
         self.Wrapper.MoveDouble(self, x1, y1, x2, y2)
 
+    def ChangeFillColor(self, color: str):
+        self.Wrapper.ChangeFillColor(self, color)
+
+    def SetVisible(self, visible: bool):
+        self.Wrapper.SetVisible(self, visible)
+
     def ChangeBackgroundImage(self, path: str):
         self.Wrapper.ChangeBackgroundImage(self, path)
 
@@ -0,0 +1,57 @@
+﻿import glob, logging, math, os, threading
+
+from typing import Optional
+
+from PIL import Image
+
+class IconAtlas:
+    # All Icon-*.png files decoded once and packed into one RGBA sheet of fixed-size cells.
+    def __init__(self, directory: str, cellSize: int = 256):
+        self.Log = logging.getLogger("IconAtlas")
+        self.Directory = directory
+        self.CellSize = cellSize
+        self.Cells: dict[str, tuple[int, int]] = {}
+        self.Sheet: Optional[Image.Image] = None
+        self.IsReady = False
+
+    def BuildAsync(self):
+        threading.Thread(target=self.Build, name="IconAtlas", daemon=True).start()
+
+    def Build(self):
+        paths = sorted(glob.glob(os.path.join(self.Directory, "Icon-*.png")))
+        if not paths:
+            return
+
+        columns = math.ceil(math.sqrt(len(paths)))
+        rows = math.ceil(len(paths) / columns)
+        sheet = Image.new("RGBA", (columns * self.CellSize, rows * self.CellSize))
+        cells = {}
+
+        for i, path in enumerate(paths):
+            x = (i % columns) * self.CellSize
+            y = (i // columns) * self.CellSize
+            try:
+                with Image.open(path) as img:
+                    img = img.convert("RGBA").resize((self.CellSize, self.CellSize), Image.Resampling.LANCZOS)
+                sheet.paste(img, (x, y))
+                cells[os.path.normpath(path)] = (x, y)
+            except Exception as ex:
+                self.Log.warning(F"Could not add {path} to the icon atlas: {ex}")
+
+        self.Sheet = sheet
+        self.Cells = cells
+        self.IsReady = True
+        self.Log.debug(F"Packed {len(cells)} icons into a {sheet.width}x{sheet.height} atlas.")
+
+    def Crop(self, path: str, width: int, height: int) -> Optional[Image.Image]:
+        if not self.IsReady or width > self.CellSize or height > self.CellSize:
+            return None
+        cell = self.Cells.get(os.path.normpath(path))
+        if cell is None:
+            return None
+
+        x, y = cell
+        img = self.Sheet.crop((x, y, x + self.CellSize, y + self.CellSize))
+        if (width, height) != (self.CellSize, self.CellSize):
+            img = img.resize((width, height), Image.Resampling.LANCZOS)
+        return img
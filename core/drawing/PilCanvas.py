@@ -0,0 +1,197 @@
+﻿import itertools, logging, math
+
+from typing import Optional
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from .StackedSpriteCache import AnchorOffset
+from .TextSpriteCache import TextSpriteCache
+
+class PilPhoto:
+    # Stands in for ImageTk.PhotoImage on the PIL backend, which needs no Tk interpreter.
+    def __init__(self, image: Image.Image):
+        self.Image = image.convert("RGBA") if image.mode != "RGBA" else image
+
+    def width(self) -> int:
+        return self.Image.width
+
+    def height(self) -> int:
+        return self.Image.height
+
+class PilCanvasItem:
+    def __init__(self, kind: str, coords: list[float], options: dict):
+        self.Kind = kind
+        self.Coords = coords
+        self.Options = options
+        self.Rendered: Optional[Image.Image] = None
+
+class PilCanvas:
+    # Retained-mode replacement for the subset of tk.Canvas that CanvasWrapper uses. Items are only drawn when Render is called.
+    def __init__(self, width: int = 1920, height: int = 1080, background: Optional[str] = "#000", pixelsPerPoint: float = 96 / 72):
+        self.Log = logging.getLogger("PilCanvas")
+        self.Width = width
+        self.Height = height
+        self.Background = background
+        self.PixelsPerPoint = pixelsPerPoint
+        self.Items: dict[int, PilCanvasItem] = {}
+        self.Ids = itertools.count(1)
+        self.Fonts = TextSpriteCache(self)
+        self.DefaultFonts: dict[int, ImageFont.ImageFont] = {}
+
+    def _Create(self, kind: str, coords, options: dict) -> int:
+        id = next(self.Ids)
+        self.Items[id] = PilCanvasItem(kind, [float(c) for c in coords], options)
+        return id
+
+    def create_text(self, x, y, **options) -> int:
+        return self._Create("text", (x, y), options)
+
+    def create_line(self, *coords, **options) -> int:
+        return self._Create("line", coords, options)
+
+    def create_rectangle(self, x1, y1, x2, y2, **options) -> int:
+        return self._Create("rectangle", (x1, y1, x2, y2), options)
+
+    def create_oval(self, x1, y1, x2, y2, **options) -> int:
+        return self._Create("oval", (x1, y1, x2, y2), options)
+
+    def create_image(self, x, y, **options) -> int:
+        return self._Create("image", (x, y), options)
+
+    def coords(self, id, *coords):
+        item = self.Items.get(id)
+        if item is None:
+            return []
+        if coords:
+            item.Coords = [float(c) for c in coords]
+        return list(item.Coords)
+
+    def move(self, id, dx, dy):
+        item = self.Items.get(id)
+        if item is not None:
+            item.Coords = [c + (dx if i % 2 == 0 else dy) for i, c in enumerate(item.Coords)]
+
+    def itemconfig(self, id, **options):
+        item = self.Items.get(id)
+        if item is not None:
+            item.Options.update(options)
+            item.Rendered = None
+
+    def delete(self, id):
+        if id == "all":
+            self.Items.clear()
+        else:
+            self.Items.pop(id, None)
+
+    def winfo_width(self) -> int:
+        return self.Width
+
+    def winfo_height(self) -> int:
+        return self.Height
+
+    def winfo_ismapped(self) -> bool:
+        return True
+
+    def winfo_fpixels(self, distance: str) -> float:
+        return float(distance[:-1]) * self.PixelsPerPoint if distance.endswith("p") else float(distance)
+
+    def winfo_rgb(self, color: str) -> tuple[int, int, int]:
+        r, g, b = ImageColor.getrgb(color)[:3]
+        return (r * 257, g * 257, b * 257)
+
+    def Render(self) -> Image.Image:
+        # A background of None leaves the frame transparent, so it can be layered over another image.
+        background = (0, 0, 0, 0) if self.Background is None else (self.Color(self.Background) or (0, 0, 0))
+        frame = Image.new("RGBA", (self.Width, self.Height), background)
+        draw = ImageDraw.Draw(frame)
+        for item in list(self.Items.values()):
+            if item.Options.get("state") == "hidden":
+                continue
+            try:
+                self.DrawItem(frame, draw, item)
+            except Exception as ex:
+                self.Log.debug(F"Could not draw {item.Kind} item: {ex}")
+        return frame
+
+    def Save(self, path: str):
+        self.Render().convert("RGB").save(path)
+
+    def DrawItem(self, frame: Image.Image, draw: ImageDraw.ImageDraw, item: PilCanvasItem):
+        options = item.Options
+        if item.Kind == "rectangle" or item.Kind == "oval":
+            x1, y1, x2, y2 = item.Coords
+            box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+            outline = self.Color(options.get("outline", "black"))
+            width = int(options.get("width", 1)) if outline is not None else 0
+            shape = draw.rectangle if item.Kind == "rectangle" else draw.ellipse
+            shape(box, fill=self.Color(options.get("fill")), outline=outline, width=width)
+        elif item.Kind == "line":
+            fill = self.Color(options.get("fill", "black"))
+            width = int(options.get("width", 1))
+            points = list(zip(item.Coords[::2], item.Coords[1::2]))
+            draw.line(points, fill=fill, width=width)
+            arrow = options.get("arrow")
+            if arrow in ("last", "both"):
+                self.DrawArrowHead(draw, points[-2], points[-1], width, fill)
+            if arrow in ("first", "both"):
+                self.DrawArrowHead(draw, points[1], points[0], width, fill)
+        elif item.Kind == "text":
+            if item.Rendered is None:
+                item.Rendered = self.RenderText(options)
+            self.Paste(frame, item.Rendered, item.Coords, options.get("anchor", "center"))
+        elif item.Kind == "image":
+            photo = options.get("image")
+            if photo is not None:
+                self.Paste(frame, photo.Image, item.Coords, options.get("anchor", "center"))
+
+    def DrawArrowHead(self, draw: ImageDraw.ImageDraw, start: tuple, end: tuple, width: int, fill):
+        # Tk's default arrowshape is (8, 10, 3): 10 pixels long, reaching 3 pixels past each edge of the line.
+        angle = math.atan2(end[1] - start[1], end[0] - start[0])
+        length = 10
+        spread = width / 2 + 3
+        back = (end[0] - length * math.cos(angle), end[1] - length * math.sin(angle))
+        left = (back[0] + spread * math.sin(angle), back[1] - spread * math.cos(angle))
+        right = (back[0] - spread * math.sin(angle), back[1] + spread * math.cos(angle))
+        draw.polygon([end, left, right], fill=fill)
+
+    def RenderText(self, options: dict) -> Image.Image:
+        text = str(options.get("text", ""))
+        family, size, weight = (list(options.get("font") or ["Arial", 12, "normal"]) + [12, "normal"])[:3]
+        fill = options.get("fill", "black")
+        justify = options.get("justify", "left")
+        rendered = self.Fonts.Render(text, family, int(size), weight, fill, fill, 0, justify)
+        if rendered is not None:
+            return rendered
+
+        # Missing fonts still produce a legible frame with PIL's built-in font.
+        pixels = self.Fonts.Pixels(int(size))
+        font = self.DefaultFonts.get(pixels)
+        if font is None:
+            font = self.DefaultFonts[pixels] = ImageFont.load_default(pixels)
+        left, top, right, bottom = ImageDraw.Draw(Image.new("RGBA", (1, 1))).multiline_textbbox((0, 0), text, font=font, align=justify)
+        img = Image.new("RGBA", (max(math.ceil(right), 1), max(math.ceil(bottom), 1)), (0, 0, 0, 0))
+        ImageDraw.Draw(img).multiline_text((0, 0), text, font=font, fill=self.Color(fill), align=justify)
+        return img
+
+    def Paste(self, frame: Image.Image, img: Image.Image, coords: list[float], anchor: str):
+        dx, dy = AnchorOffset(anchor, img.width, img.height)
+        x = round(coords[0]) + dx
+        y = round(coords[1]) + dy
+        # alpha_composite needs the source clipped to the frame.
+        left = max(0, -x)
+        top = max(0, -y)
+        right = min(img.width, self.Width - x)
+        bottom = min(img.height, self.Height - y)
+        if right <= left or bottom <= top:
+            return
+        if (left, top, right, bottom) != (0, 0, img.width, img.height):
+            img = img.crop((left, top, right, bottom))
+        frame.alpha_composite(img, (x + left, y + top))
+
+    def Color(self, color: Optional[str]):
+        if not color:
+            return None
+        try:
+            return ImageColor.getrgb(color)
+        except ValueError:
+            return None
@@ -0,0 +1,129 @@
+﻿import logging, threading
+
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from PIL import Image, ImageTk
+
+from .IconAtlas import IconAtlas
+from .TextSpriteCache import TextSpriteCache
+
+def AnchorOffset(anchor: str, width: int, height: int) -> tuple[int, int]:
+    # Top-left corner of a width x height box placed at (0, 0) with a Tk anchor.
+    x = 0
+    y = 0
+    if anchor in ("n", "center", "s"):
+        x = -(width // 2)
+    elif anchor in ("ne", "e", "se"):
+        x = -width
+    if anchor in ("w", "center", "e"):
+        y = -(height // 2)
+    elif anchor in ("sw", "s", "se"):
+        y = -height
+    return (x, y)
+
+class StackedSpriteCache:
+    # Stacked icons and emoji flattened into one RGBA image per unique combination, shown as a single canvas image item.
+    # A key is (image, layers) with positions relative to the element origin:
+    #   image:  (path, x, y, width, height) or None
+    #   layers: tuple of (text, x, y, fontFamily, fontSize, fontWeight, anchor, fillColor, stroke, strokeWidth, strokeColor, justify)
+    def __init__(self, textSprites: TextSpriteCache, iconAtlas: Optional[IconAtlas] = None, maxEntries: int = 256, photo: Callable[[Image.Image], object] = ImageTk.PhotoImage):
+        self.Log = logging.getLogger("StackedSpriteCache")
+        self.TextSprites = textSprites
+        self.Photo = photo
+        self.IconAtlas = iconAtlas
+        self.MaxEntries = maxEntries
+        self.Images: OrderedDict[tuple, Optional[tuple[Image.Image, int, int]]] = OrderedDict()
+        self.Photos: OrderedDict[tuple, tuple[ImageTk.PhotoImage, int, int]] = OrderedDict()
+        self.Lock = threading.Lock()
+        self.Hits = 0
+        self.Misses = 0
+
+    def Get(self, key: tuple) -> Optional[tuple[ImageTk.PhotoImage, int, int]]:
+        # UI thread only; returns the sprite and the offset of its top-left corner from the element origin.
+        entry = self.Photos.get(key)
+        if entry is not None:
+            self.Hits += 1
+            self.Photos.move_to_end(key)
+            return entry
+
+        self.Misses += 1
+        with self.Lock:
+            warmed = key in self.Images
+            built = self.Images.pop(key, None)
+        if not warmed:
+            _, layers = key
+            if not all([self.TextSprites.FontReady(layer[3], layer[5]) for layer in layers]):
+                return None
+            built = self.Build(key)
+        if built is None:
+            return None
+
+        img, dx, dy = built
+        entry = (self.Photo(img), dx, dy)
+        self.Photos[key] = entry
+        while len(self.Photos) > self.MaxEntries:
+            self.Photos.popitem(last=False)
+        return entry
+
+    def Build(self, key: tuple) -> Optional[tuple[Image.Image, int, int]]:
+        image, layers = key
+        parts: list[tuple[Image.Image, int, int]] = []
+        try:
+            if image is not None:
+                path, x, y, width, height = image
+                parts.append((self.Icon(path, width, height), x, y))
+            for text, x, y, fontFamily, fontSize, fontWeight, anchor, fillColor, stroke, strokeWidth, strokeColor, justify in layers:
+                rendered = self.TextSprites.Render(text, fontFamily, fontSize, fontWeight, fillColor, strokeColor, strokeWidth if stroke else 0, justify)
+                if rendered is None:
+                    return None
+                ax, ay = AnchorOffset(anchor, rendered.width, rendered.height)
+                parts.append((rendered, x + ax, y + ay))
+        except Exception as ex:
+            self.Log.warning(F"Could not build stacked sprite for {key}: {ex}")
+            return None
+        if not parts:
+            return None
+
+        left = min(x for _, x, _ in parts)
+        top = min(y for _, _, y in parts)
+        right = max(x + img.width for img, x, _ in parts)
+        bottom = max(y + img.height for img, _, y in parts)
+        sprite = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+        for img, x, y in parts:
+            sprite.alpha_composite(img, (x - left, y - top))
+        return (sprite, left, top)
+
+    def Icon(self, path: str, width: int, height: int) -> Image.Image:
+        if self.IconAtlas is not None:
+            img = self.IconAtlas.Crop(path, width, height)
+            if img is not None:
+                return img
+        with Image.open(path) as img:
+            return img.convert("RGBA").resize((width, height), Image.Resampling.LANCZOS)
+
+    def WarmAsync(self, keys: Callable[[], Iterable[tuple]]):
+        # Builds images on a background thread; the PhotoImages are still created lazily on the UI thread.
+        threading.Thread(target=self.Warm, args=(keys,), name="StackedSpriteWarmup", daemon=True).start()
+
+    def Warm(self, keys: Callable[[], Iterable[tuple]]):
+        built = 0
+        for key in dict.fromkeys(keys()):
+            if key in self.Photos or key in self.Images:
+                continue
+            img = self.Build(key)
+            with self.Lock:
+                self.Images[key] = img
+                while len(self.Images) > self.MaxEntries:
+                    self.Images.popitem(last=False)
+            built += 1
+        self.Log.debug(F"Pre-built {built} stacked sprites.")
+
+    def Stats(self) -> dict:
+        return {
+            "Entries": len(self.Photos),
+            "Pending": len(self.Images),
+            "MaxEntries": self.MaxEntries,
+            "Hits": self.Hits,
+            "Misses": self.Misses,
+        }
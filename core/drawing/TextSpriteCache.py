@@ -0,0 +1,186 @@
+﻿import logging, math, shutil, subprocess, threading
+
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont, ImageTk
+
+# Colour emoji fonts such as Noto Color Emoji only contain bitmaps at this size.
+BitmapFontSize = 109
+
+class TextSpriteCache:
+    # Stroked text rendered once by PIL into an RGBA sprite, so an outlined label is one canvas item instead of (2n+1)² copies.
+    def __init__(self, canvas, maxEntries: int = 512, photo: Callable[[Image.Image], object] = ImageTk.PhotoImage):
+        self.Log = logging.getLogger("TextSpriteCache")
+        self.Canvas = canvas
+        self.Photo = photo
+        self.MaxEntries = maxEntries
+        self.Entries: OrderedDict[tuple, ImageTk.PhotoImage] = OrderedDict()
+        self.FontPaths: dict[tuple[str, str], Optional[str]] = {}
+        # Font lookups run fc-match, which can take seconds, so they happen on a warm-up thread and never on the UI thread.
+        self.FontLock = threading.Lock()
+        self.PendingFonts: set[tuple[str, str]] = set()
+        self.Fonts: dict[tuple[str, str, int], Optional[tuple[ImageFont.FreeTypeFont, float]]] = {}
+        self.PixelsPerPoint: Optional[float] = None
+        # FreeType faces are not thread safe, and sprites may also be rendered by a warm-up thread.
+        self.RenderLock = threading.Lock()
+        self.Hits = 0
+        self.Misses = 0
+        self.Failures = 0
+
+    def Get(self, text: str, fontFamily: str, fontSize: int, fontWeight: str, fillColor: str, strokeColor: str, strokeWidth: int, justify: str = "left") -> Optional[ImageTk.PhotoImage]:
+        key = (text, fontFamily, fontSize, fontWeight, fillColor, strokeColor, strokeWidth, justify)
+        photo = self.Entries.get(key)
+        if photo is not None:
+            self.Hits += 1
+            self.Entries.move_to_end(key)
+            return photo
+
+        self.Misses += 1
+        if not self.FontReady(fontFamily, fontWeight):
+            # Drawn with stroke items until the font file has been found.
+            return None
+        try:
+            img = self.Render(text, fontFamily, fontSize, fontWeight, fillColor, strokeColor, strokeWidth, justify)
+        except Exception as ex:
+            self.Log.debug(F"Could not render '{text}' in {fontFamily}: {ex}")
+            img = None
+        if img is None:
+            self.Failures += 1
+            return None
+
+        # Evicting only drops the cache's reference; labels on screen keep theirs through ElementStore.Photo.
+        photo = self.Photo(img)
+        self.Entries[key] = photo
+        while len(self.Entries) > self.MaxEntries:
+            self.Entries.popitem(last=False)
+        return photo
+
+    def Render(self, text: str, fontFamily: str, fontSize: int, fontWeight: str, fillColor: str, strokeColor: str, strokeWidth: int, justify: str = "left") -> Optional[Image.Image]:
+        # Safe off the UI thread once PixelsPerPoint is known.
+        with self.RenderLock:
+            return self._Render(text, fontFamily, self.Pixels(fontSize), fontWeight, fillColor, strokeColor, strokeWidth, justify)
+
+    def _Render(self, text: str, fontFamily: str, size: int, fontWeight: str, fillColor: str, strokeColor: str, strokeWidth: int, justify: str) -> Optional[Image.Image]:
+        loaded = self.Font(fontFamily, fontWeight, size)
+        if loaded is None:
+            return None
+        font, scale = loaded
+        strokeWidth = round(strokeWidth / scale) if strokeWidth else 0
+
+        measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        left, top, right, bottom = measure.multiline_textbbox((0, 0), text, font=font, stroke_width=strokeWidth, align=justify, embedded_color=True)
+        # Keep the full line box like a Tk text item, so anchors line up with the backing-item mode.
+        ascent, descent = font.getmetrics()
+        left = math.floor(min(left, 0))
+        top = math.floor(min(top, 0))
+        right = math.ceil(right)
+        bottom = math.ceil(max(bottom, (text.count("\n") + 1) * (ascent + descent)))
+
+        img = Image.new("RGBA", (max(right - left, 1), max(bottom - top, 1)), (0, 0, 0, 0))
+        ImageDraw.Draw(img).multiline_text(
+            (-left, -top), text, font=font, fill=self.Rgb(fillColor), align=justify, embedded_color=True,
+            stroke_width=strokeWidth, stroke_fill=self.Rgb(strokeColor) if strokeWidth else None)
+        if scale != 1:
+            img = img.resize((max(round(img.width * scale), 1), max(round(img.height * scale), 1)), Image.Resampling.LANCZOS)
+        return img
+
+    def Pixels(self, fontSize: int) -> int:
+        # Tk sizes are points when positive and pixels when negative.
+        if fontSize < 0:
+            return -fontSize
+        if self.PixelsPerPoint is None:
+            self.PixelsPerPoint = self.Canvas.winfo_fpixels("1p")
+        return max(round(fontSize * self.PixelsPerPoint), 1)
+
+    def Rgb(self, color: str) -> tuple[int, int, int]:
+        try:
+            return ImageColor.getrgb(color)[:3]
+        except ValueError:
+            r, g, b = self.Canvas.winfo_rgb(color)
+            return (r >> 8, g >> 8, b >> 8)
+
+    def Font(self, fontFamily: str, fontWeight: str, size: int) -> Optional[tuple[ImageFont.FreeTypeFont, float]]:
+        key = (fontFamily, fontWeight, size)
+        if key in self.Fonts:
+            return self.Fonts[key]
+
+        loaded = None
+        path = self.FontPath(fontFamily, fontWeight)
+        if path is not None:
+            try:
+                loaded = (ImageFont.truetype(path, size), 1)
+            except OSError:
+                # Bitmap-only fonts are drawn at their native size and scaled down to the requested one.
+                try:
+                    loaded = (ImageFont.truetype(path, BitmapFontSize), size / BitmapFontSize)
+                except OSError as ex:
+                    self.Log.info(F"Could not load {path} at {size}px, falling back to stroke items: {ex}")
+        self.Fonts[key] = loaded
+        return loaded
+
+    def FontReady(self, fontFamily: str, fontWeight: str) -> bool:
+        # UI thread; starts looking the font up in the background if nobody has yet.
+        key = (fontFamily, fontWeight)
+        if key in self.FontPaths:
+            return True
+        self.WarmFontsAsync([key])
+        return False
+
+    def WarmFontsAsync(self, fonts: Iterable[tuple[str, str]]):
+        with self.FontLock:
+            fonts = [f for f in dict.fromkeys(fonts) if f not in self.FontPaths and f not in self.PendingFonts]
+            self.PendingFonts.update(fonts)
+        if fonts:
+            threading.Thread(target=self.WarmFonts, args=(fonts,), name="FontWarmup", daemon=True).start()
+
+    def WarmFonts(self, fonts: Iterable[tuple[str, str]]):
+        for fontFamily, fontWeight in fonts:
+            try:
+                self.FontPath(fontFamily, fontWeight)
+            finally:
+                with self.FontLock:
+                    self.PendingFonts.discard((fontFamily, fontWeight))
+
+    def FontPath(self, fontFamily: str, fontWeight: str) -> Optional[str]:
+        # Blocking; call from a worker thread, or after FontReady has returned True.
+        key = (fontFamily, fontWeight)
+        if key in self.FontPaths:
+            return self.FontPaths[key]
+
+        bold = fontWeight == "bold"
+        path = None
+        if shutil.which("fc-match"):
+            pattern = F"{fontFamily}:weight=bold" if bold else fontFamily
+            try:
+                result = subprocess.run(["fc-match", "-f", "%{file}", pattern], capture_output=True, text=True, timeout=5)
+                path = result.stdout.strip() or None
+            except Exception as ex:
+                self.Log.warning(F"fc-match failed for {pattern}: {ex}")
+        else:
+            # Without fontconfig, let PIL search the system font folder for the usual Windows file names.
+            baseName = fontFamily.replace(" ", "").lower()
+            for candidate in ([baseName + "bd.ttf"] if bold else []) + [baseName + ".ttf", fontFamily + ".ttf"]:
+                try:
+                    ImageFont.truetype(candidate, 12)
+                    path = candidate
+                    break
+                except OSError:
+                    continue
+
+        if path is None:
+            self.Log.info(F"No font file found for {fontFamily}, stroked text will use stroke items.")
+        with self.FontLock:
+            self.FontPaths[key] = path
+        return path
+
+    def Stats(self) -> dict:
+        return {
+            "Entries": len(self.Entries),
+            "MaxEntries": self.MaxEntries,
+            "Hits": self.Hits,
+            "Misses": self.Misses,
+            "Failures": self.Failures,
+            "Fonts": len(self.FontPaths),
+            "PendingFonts": len(self.PendingFonts),
+        }
@@ -1,3 +1,6 @@
-﻿from .CachedImage import CachedImage
+﻿from .BackgroundImageLoader import BackgroundImageLoader
+from .CachedImage import CachedImage
 from .CanvasWrapper import CanvasWrapper
 from .ElementStore import ElementStore
+from .PilCanvas import PilCanvas, PilPhoto
+from .TextSpriteCache import TextSpriteCache
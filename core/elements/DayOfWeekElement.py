@@ -19,7 +19,7 @@ class DayOfWeekElement(ElementBase):
         store.DayOfWeek = self.Wrapper.FormattedTextElement(now, self.Settings.DayOfWeek)
         tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         delta = tomorrow - now
-        return ElementRefresh.OnMidnight()
+        return ElementRefresh.OnFormatChange(self.Settings.DayOfWeek.Format)
 
     def Refresh(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> ElementRefresh:
         if (not store.DayOfWeek or store.DayOfWeek.IsDeleted):
@@ -29,4 +29,4 @@ class DayOfWeekElement(ElementBase):
         store.DayOfWeek.UpdateText(DateTimeHelpers.HourSafeToString(now, self.Settings.DayOfWeek.Format))
         tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         delta = tomorrow - now
-        return ElementRefresh.OnMidnight()
+        return ElementRefresh.OnFormatChange(self.Settings.DayOfWeek.Format)
@@ -1,4 +1,8 @@
-﻿from datetime import datetime, timedelta
+﻿import math
+
+from datetime import datetime, timedelta
+
+from helpers.DateTimeHelpers import DateTimeHelpers
 
 class ElementRefresh:
     OnUpdateCurrentData: str = "UpdateCurrentData"
@@ -18,7 +22,7 @@ class ElementRefresh:
         now = datetime.now()
         tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         delta = tomorrow - now
-        er.Delay = int(delta.total_seconds()) * 1000
+        er.Delay = math.ceil(delta.total_seconds() * 1000)
         return er
 
     @staticmethod
@@ -48,4 +52,22 @@ class ElementRefresh:
         er.Delay = int(delta.total_seconds() * 1000)
         return er
 
-    
\ No newline at end of file
+    @staticmethod
+    def At(moment: datetime) -> "ElementRefresh":
+        er = ElementRefresh(ElementRefresh.OnTimer)
+        delta = moment - datetime.now()
+        er.Delay = max(0, math.ceil(delta.total_seconds() * 1000))
+        return er
+
+    @staticmethod
+    def OnFormatChange(format: str) -> "ElementRefresh":
+        # Wakes exactly when HourSafeToString(now, format) would next render differently.
+        moment = DateTimeHelpers.NextFormatChange(datetime.now(), format)
+        if (moment is None):
+            return ElementRefresh.OnMidnight()
+        return ElementRefresh.At(moment)
+
+    @staticmethod
+    def NextElapsedSecond(start: datetime) -> "ElementRefresh":
+        elapsed = (datetime.now() - start).total_seconds()
+        return ElementRefresh.At(start + timedelta(seconds=math.floor(elapsed) + 1))
@@ -20,7 +20,7 @@ class FullDateElement(ElementBase):
         store.FullDate = self.Wrapper.FormattedTextElement(now, self.Settings.FullDate)
         tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         delta = tomorrow - now
-        return ElementRefresh.OnMidnight()
+        return ElementRefresh.OnFormatChange(self.Settings.FullDate.Format)
 
     def Refresh(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> int:
         if (not store.FullDate or store.FullDate.IsDeleted):
@@ -30,4 +30,4 @@ class FullDateElement(ElementBase):
         store.FullDate.UpdateText(DateTimeHelpers.HourSafeToString(now, self.Settings.FullDate.Format))
         tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         delta = tomorrow - now
-        return ElementRefresh.OnMidnight()
\ No newline at end of file
+        return ElementRefresh.OnFormatChange(self.Settings.FullDate.Format)
\ No newline at end of file
@@ -25,7 +25,7 @@ class HumiditySquareElement(ElementBase):
 
         size = config.Size
         store.HumiditySquare.FillRect = self.Wrapper.Rectangle(config.X + 1, config.Y + size, config.X + size - 2, config.Y + size - 2, fillColor="#00BFFF",outlineColor=None)
-        store.HumiditySquare.OutsideRect = self.Wrapper.Rectangle(config.X, config.Y, config.X + size, config.Y + size, outlineColor="white", borderWidth=2)
+        store.HumiditySquare.OutsideRect = self.Wrapper.Rectangle(config.X, config.Y, config.X + size, config.Y + size, outlineColor="white", borderWidth=2, static=True)
         store.HumiditySquare.Emoji = self.Wrapper.EmojiElement("💦", config.Emoji, xOffset = config.X + size // 2, yOffset = config.Y + size // 2)
         store.HumiditySquare.Text = self.Wrapper.TextElement("--%", config.Text, xOffset = config.X + size // 2, yOffset = config.Y + size // 2)
 
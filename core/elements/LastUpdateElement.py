@@ -1,11 +1,10 @@
-﻿from datetime import datetime
-from config.WeatherConfig import WeatherConfig
+﻿from config.WeatherConfig import WeatherConfig
 from config.WeatherSettings import WeatherSettings
 from core.drawing.CanvasWrapper import CanvasWrapper
 from core.elements.ElementRefresh import *
 from core.elements.ElementBase import ElementBase
 from data import *
-from helpers import DateTimeHelpers, Delay
+from helpers import DateTimeHelpers
 from core.store.WeatherDisplayStore import WeatherDisplayStore
 
 class LastUpdateElement(ElementBase):
@@ -13,9 +12,7 @@ class LastUpdateElement(ElementBase):
         self.Wrapper = wrapper
         self.Config = config
         self.Settings = config.Weather
-        er = ElementRefresh(ElementRefresh.OnUpdateCurrentData, ElementRefresh.OnTimer)
-        er.Delay = Delay.FromMinutes(15)
-        self.ElementRefresh = er
+        self.ElementRefresh = ElementRefresh(ElementRefresh.OnUpdateCurrentData)
 
     def Initialize(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> int:
         store.LastUpdate = self.Wrapper.FormattedTextElement(current.LastUpdate, self.Settings.LastUpdated)
@@ -25,6 +22,6 @@ class LastUpdateElement(ElementBase):
         if (not store.LastUpdate or store.LastUpdate.IsDeleted):
             return self.Initialize(store, forecast, current, history, sunData)
 
-        now = datetime.now()
-        store.LastUpdate.UpdateText(DateTimeHelpers.HourSafeToString(now, self.Settings.LastUpdated.Format))
+        if (current.LastUpdate is not None):
+            store.LastUpdate.UpdateText(DateTimeHelpers.HourSafeToString(current.LastUpdate, self.Settings.LastUpdated.Format))
         return self.ElementRefresh
\ No newline at end of file
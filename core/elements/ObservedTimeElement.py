@@ -1,11 +1,10 @@
-﻿from datetime import datetime
-from config.WeatherConfig import WeatherConfig
+﻿from config.WeatherConfig import WeatherConfig
 from config.WeatherSettings import WeatherSettings
 from core.drawing.CanvasWrapper import CanvasWrapper
 from core.elements.ElementRefresh import *
 from core.elements.ElementBase import ElementBase
 from data import *
-from helpers import DateTimeHelpers, Delay
+from helpers import DateTimeHelpers
 from core.store.WeatherDisplayStore import WeatherDisplayStore
 
 class ObservedTimeElement(ElementBase):
@@ -13,9 +12,7 @@ class ObservedTimeElement(ElementBase):
         self.Wrapper = wrapper
         self.Config = config
         self.Settings = config.Weather
-        er = ElementRefresh(ElementRefresh.OnUpdateCurrentData, ElementRefresh.OnTimer)
-        er.Delay = Delay.FromMinutes(15)
-        self.ElementRefresh = er
+        self.ElementRefresh = ElementRefresh(ElementRefresh.OnUpdateCurrentData)
 
     def Initialize(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> int:
         store.ObservedTime = self.Wrapper.FormattedTextElement(current.ObservedTimeLocal, self.Settings.Observed)
@@ -25,6 +22,6 @@ class ObservedTimeElement(ElementBase):
         if (not store.ObservedTime or store.ObservedTime.IsDeleted):
             return self.Initialize(store, forecast, current, history, sunData)
 
-        now = datetime.now()
-        store.ObservedTime.UpdateText(DateTimeHelpers.HourSafeToString(now, self.Settings.Observed.Format))
+        if (current.ObservedTimeLocal is not None):
+            store.ObservedTime.UpdateText(DateTimeHelpers.HourSafeToString(current.ObservedTimeLocal, self.Settings.Observed.Format))
         return self.ElementRefresh
\ No newline at end of file
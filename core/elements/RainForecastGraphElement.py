@@ -1,5 +1,9 @@
 ﻿from datetime import datetime, timedelta
-import logging
+import logging, math
+
+import numpy as np
+
+from PIL import Image
 
 from config.IconType import IconType
 from config.SettingsEnums import PrecipitationType
@@ -8,61 +12,42 @@ from .ElementBase import ElementBase
 from .ElementRefresh import ElementRefresh
 from core.drawing import CanvasWrapper
 from config import WeatherSettings
-from helpers import Delay, WeatherHelpers
+from helpers import DateTimeHelpers, Delay, WeatherHelpers
 from data import *
+from data.IconDisplay import IconDisplay
+from core.store.RainForecastHourStore import RainForecastHourStore
 from core.store.WeatherDisplayStore import WeatherDisplayStore
 
-def GetCloudCover(bucket: datetime, forecast:ForecastData) -> float:
-        bucketName = bucket.strftime("%Y-%m-%d %H:%M")
-        for h in forecast.Next24Hours:
-            if (h.Time == bucketName):
-                return h.Conditions.CloudCover
-        return 0
-
-def CalculateChannel(channel1, channel2, percent):
-    return int(channel1 + (channel2 - channel1) * percent)
-
-def CalculateColor(color1, color2, percent: float):
-    r = CalculateChannel(color1[0], color2[0], percent)
-    g = CalculateChannel(color1[1], color2[1], percent)
-    b = CalculateChannel(color1[2], color2[2], percent)
+CloudGrayColor = np.array((169, 169, 169), dtype=np.float64)
 
-    return (r,g,b)
+def GetHourlyCloudCover(startHour: datetime, hours: int, forecast:ForecastData) -> np.ndarray:
+    byTime = {h.Time: h.Conditions.CloudCover for h in forecast.Next24Hours}
+    return np.array([byTime.get((startHour + timedelta(hours=i)).strftime("%Y-%m-%d %H:%M")) or 0 for i in range(hours)], dtype=np.float64)
 
-def CalculateTimeRatio(currentTime: datetime, time1: datetime, time2: datetime) -> float:
-    totalDuration = (time2 - time1).total_seconds()
-    elapsed = (currentTime - time1).total_seconds()
-    ratio = elapsed / totalDuration
-
-    return max(0.0, min(1.0, ratio))
-
-def CalculateMinuteGradients(forecast:ForecastData, sunData:SunData, pixelWidth:int):
+def CalculateMinuteGradients(forecast:ForecastData, sunData:SunData, pixelWidth:int) -> tuple[np.ndarray, np.ndarray]:
+    # Returns (main, cloud) colors as (pixelWidth, 3) uint8 arrays, one row per pixel column over the next 24 hours.
     secondsPerPixel = 86400 / pixelWidth
 
-    startTime = datetime.now().replace()
-    currentTime = startTime
-    endTime = datetime.now() + timedelta(hours=24)
+    startTime = datetime.now()
+    offsets = np.arange(1, pixelWidth + 1, dtype=np.float64) * secondsPerPixel
 
-    cloudGrayColor = (169, 169, 169)
+    baseColors = sunData.GetSkyColorSeries(startTime, offsets)
 
-    pixelTimes = []
-    while (currentTime < endTime):
-        currentTime = currentTime + timedelta(seconds=secondsPerPixel)
+    startHour = startTime.replace(minute=0, second=0, microsecond=0)
+    sinceStartHour = (startTime - startHour).total_seconds() + offsets
+    hours = int(sinceStartHour[-1] // 3600) + 2
+    cloudRatio = np.interp(sinceStartHour, np.arange(hours) * 3600.0, GetHourlyCloudCover(startHour, hours, forecast))
 
-        baseColorHex = sunData.GetSkyColor(currentTime)
-        baseColor = tuple(int(baseColorHex[j:j+2], 16) for j in (1, 3, 5))
+    base = baseColors.astype(np.float64)
+    cloudColors = (base + (CloudGrayColor - base) * cloudRatio[:, None]).astype(np.int64).astype(np.uint8)
 
-        leftBucket = currentTime.replace(minute=0, second=0, microsecond=0)
-        rightBucket = leftBucket + timedelta(hours=1)
-        leftCloud = GetCloudCover(leftBucket, forecast)
-        rightCloud = GetCloudCover(rightBucket, forecast)
-        timeRatio = CalculateTimeRatio(currentTime, leftBucket, rightBucket)
-        cloudRatio = (1 - timeRatio) * leftCloud + timeRatio * rightCloud
+    return (baseColors, cloudColors)
 
-        cloudColor = CalculateColor(baseColor, cloudGrayColor, cloudRatio)
-        pixelTimes.append({"Cloud": cloudColor, "Main": baseColor})
-
-    return pixelTimes
+def BuildGradientStrip(mainColors: np.ndarray, cloudColors: np.ndarray, cloudHeight: int, height: int) -> Image.Image:
+    rows = np.empty((height, len(mainColors), 3), dtype=np.uint8)
+    rows[:cloudHeight] = cloudColors
+    rows[cloudHeight:] = mainColors
+    return Image.fromarray(rows, "RGB")
 
 class RainForecastGraphElement(ElementBase):
     def __init__(self, wrapper:CanvasWrapper, config: WeatherConfig):
@@ -72,9 +57,67 @@ class RainForecastGraphElement(ElementBase):
 
     def Initialize(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> ElementRefresh:
         config = self.Settings.RainForecast
+        if (config.Enabled):
+            self.Wrapper.WarmStackedEmoji(config.Emoji, lambda: WeatherConditions.DisplayCombinations()[1])
+            self.Wrapper.WarmStackedIcon(config.Icon, lambda: [i for i in WeatherConditions.DisplayCombinations()[0] if i.Icon != IconType.Unknown], self.IconPath)
 
         return self.Refresh(store,forecast, current, history, sunData)
 
+    def IconPath(self, icon: IconDisplay) -> str:
+        basePath = self.Config._basePath
+        folder = "/assets/icons/"
+        stoke = "-Outline" if self.Settings.CurrentTempIcon.Stroke else ""
+        return F'{basePath}{folder}Icon-{icon.Icon.value}{stoke}.png'
+
+    def UpdateSkyGradient(self, store: WeatherDisplayStore, forecast: ForecastData, sunData: SunData, gradientWidth: int, secondsPerPixel: float):
+        config = self.Settings.RainForecast
+        graph = store.RainForecastGraph
+        gradientHeight = 35
+        cloudHeight = config.SkyGradient.CloudHeight if config.SkyGradient.EnableCloud else 0
+        y = config.Y + config.BarMaxHeight
+        limit = gradientWidth + config.BarSpacing
+
+        now = datetime.now()
+        secondsPastHour = now.minute * 60 + now.second
+        firstHour = datetime.strptime(forecast.Next24Hours[0].Time, "%Y-%m-%d %H:%M")
+        currentHour = now.replace(minute=0,second=0,microsecond=0)
+        if (firstHour < currentHour):
+            secondsPastHour += 60 * 60
+        pushRight = int(secondsPastHour / secondsPerPixel) + config.X
+
+        # The strip is pinned to the graph's time axis, so until the axis or its inputs change
+        # advancing time only trims the columns that have slipped into the past.
+        # The data objects are held and compared with "is": an id() can be handed to a new forecast once the old one is freed.
+        key = (firstHour, gradientWidth, config.X, y, limit, cloudHeight)
+        sameSources = graph.SkyGradientSources is not None and graph.SkyGradientSources[0] is forecast and graph.SkyGradientSources[1] is sunData
+        isAlive = graph.SkyGradient is not None and not graph.SkyGradient.IsDeleted
+        if (isAlive and sameSources and graph.SkyGradientKey == key and graph.SkyGradientShownX == pushRight):
+            return
+        if (graph.SkyGradientStrip is None or not sameSources or graph.SkyGradientKey != key or pushRight < graph.SkyGradientX):
+            visible = limit - pushRight + 1
+            if (visible <= 0):
+                graph.ClearSkyGradient()
+                return
+            mainColors, cloudColors = CalculateMinuteGradients(forecast, sunData, gradientWidth)
+            graph.SkyGradientStrip = BuildGradientStrip(mainColors[:visible], cloudColors[:visible], cloudHeight, gradientHeight)
+            graph.SkyGradientKey = key
+            graph.SkyGradientSources = (forecast, sunData)
+            graph.SkyGradientX = pushRight
+
+        trim = pushRight - graph.SkyGradientX
+        if (trim >= graph.SkyGradientStrip.width):
+            graph.ClearSkyGradient()
+            return
+        strip = graph.SkyGradientStrip
+        if (trim > 0):
+            strip = strip.crop((trim, 0, strip.width, strip.height))
+
+        if (isAlive):
+            graph.SkyGradient.ChangePilImage(strip, pushRight, y)
+        else:
+            graph.SkyGradient = self.Wrapper.PilImage(strip, pushRight, y)
+        graph.SkyGradientShownX = pushRight
+
     def Refresh(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> ElementRefresh:
         config = self.Settings.RainForecast
         er = ElementRefresh.NextHour()
@@ -86,9 +129,31 @@ class RainForecastGraphElement(ElementBase):
         if (not forecast.Next24Hours or len(forecast.Next24Hours) < 1):
             return er
 
-        store.RainForecastGraph.Clear()
+        # The full layout only changes with a new forecast or a new hour; in between, ticks just advance the gradient.
+        graph = store.RainForecastGraph
+        layoutKey = (datetime.now().replace(minute=0, second=0, microsecond=0), self.Settings.Precipitation)
+        if (graph.LayoutForecast is not forecast or graph.LayoutKey != layoutKey or graph.IsDeleted()):
+            self.UpdateLayout(store, forecast)
+            graph.LayoutKey = layoutKey
+            graph.LayoutForecast = forecast
 
-        HasRain = False
+        if (config.SkyGradient.Enable):
+            gradientWidth = (config.BarWidth + config.BarSpacing) * 24
+            secondsPerPixel = 86400 / gradientWidth
+            self.UpdateSkyGradient(store, forecast, sunData, gradientWidth, secondsPerPixel)
+
+            now = datetime.now()
+            secondsPastHour = now.minute * 60 + now.second + now.microsecond / 1000000
+            nextPixel = (int(secondsPastHour / secondsPerPixel) + 1) * secondsPerPixel
+            er.Delay = min(er.Delay, math.ceil((nextPixel - secondsPastHour) * 1000))
+        else:
+            graph.ClearSkyGradient()
+
+        return er
+
+    def UpdateLayout(self, store: WeatherDisplayStore, forecast: ForecastData):
+        config = self.Settings.RainForecast
+        graph = store.RainForecastGraph
 
         barWidth = config.BarWidth
         barSpacing = config.BarSpacing
@@ -97,80 +162,97 @@ class RainForecastGraphElement(ElementBase):
         y_start = config.Y
         rainAddon = '"' if self.Settings.Precipitation == PrecipitationType.IN else 'mm'
 
-        if (config.SkyGradient.Enable):
-            gradientWidth = (barWidth + barSpacing) * 24
-            secondsPerPixel = 86400 / gradientWidth
-            er.Delay = int(secondsPerPixel * 1000)
-            colorPixels = CalculateMinuteGradients(forecast, sunData, gradientWidth)
-            now = datetime.now()
-            gradientHeight = 35
-            secondsPastHour = now.minute * 60 + now.second
-
-            firstHour = datetime.strptime(forecast.Next24Hours[0].Time, "%Y-%m-%d %H:%M")
-            currentHour = now.replace(minute=0,second=0,microsecond=0)
-
-            if (firstHour < currentHour):
-                secondsPastHour += 60 * 60
-
-            pushRight = int(secondsPastHour / secondsPerPixel) + x_start
-            i = 0
-            cloudHeight = config.SkyGradient.CloudHeight if config.SkyGradient.EnableCloud else 0
-            for pixel in colorPixels:
-                if (pushRight + i > gradientWidth + barSpacing):
-                    continue
-                fillColor = f"#{pixel['Main'][0]:02x}{pixel['Main'][1]:02x}{pixel['Main'][2]:02x}"
-                cloudFillColor = f"#{pixel['Cloud'][0]:02x}{pixel['Cloud'][1]:02x}{pixel['Cloud'][2]:02x}"
-
-                if (config.SkyGradient.EnableCloud):
-                    store.RainForecastGraph.CloudGradientLines.append(self.Wrapper.Line(pushRight + i, y_start + barMaxHeight, pushRight + i, y_start + barMaxHeight + cloudHeight, fillColor=cloudFillColor))
-                
-                store.RainForecastGraph.AmbientLightLines.append(self.Wrapper.Line(pushRight + i, y_start + barMaxHeight + cloudHeight, pushRight + i, y_start + barMaxHeight + gradientHeight, fillColor=fillColor))
-                i += 1
+        geometry = (x_start, y_start, barWidth, barSpacing, barMaxHeight)
+        if (graph.Geometry != geometry or graph.IsDeleted()):
+            graph.Clear()
+            graph.Geometry = geometry
 
+        hours = forecast.Next24Hours[:24]
+        while (len(graph.Hours) > len(hours)):
+            graph.Hours.pop().Delete()
+        while (len(graph.Hours) < len(hours)):
+            graph.Hours.append(RainForecastHourStore())
+
+        HasRain = False
         max_rain = 100  # Max rain chance is 100%
-        for i, hour_data in enumerate(forecast.Next24Hours[:24]):
+        for i, hour_data in enumerate(hours):
+            slot = graph.Hours[i]
             rain_chance = hour_data.RainChance
             rain_amount = hour_data.Conditions.RainRate
             cloudCoverPercentage = int(hour_data.Conditions.CloudCover * 100)
             if rain_amount > 0:
                 HasRain = True
-            
-            time_str = hour_data.Time
-            Time = datetime.strptime(time_str, "%Y-%m-%d %H:%M")
+
+            Time = datetime.strptime(hour_data.Time, "%Y-%m-%d %H:%M")
             WeatherEmoji = hour_data.Conditions.GetEmoji()
             WeatherIcon = hour_data.Conditions.GetIcon()
 
             bar_height = (rain_chance / max_rain) * barMaxHeight
             x = x_start + i * (barWidth + barSpacing)
+            labelX = x + 2 + barWidth // 2
+
+            if (slot.PrecipitationChance is None):
+                slot.PrecipitationChance = self.Wrapper.Rectangle(
+                    x, y_start + barMaxHeight - bar_height, x + barWidth, y_start + barMaxHeight,
+                    fillColor="blue", outlineColor=""
+                )
+            elif (slot.Values.get("BarHeight") != bar_height):
+                slot.PrecipitationChance.MoveDouble(x, y_start + barMaxHeight - bar_height, x + barWidth, y_start + barMaxHeight)
+            slot.Values["BarHeight"] = bar_height
+
+            hourText = DateTimeHelpers.HourSafeToString(Time, config.Hour.Format)
+            if (slot.HourLabel is None):
+                slot.HourLabel = self.Wrapper.FormattedTextElement(Time, config.Hour, xOffset = labelX, yOffset = y_start - 24)
+            elif (slot.Values.get("Hour") != hourText):
+                slot.HourLabel.UpdateText(hourText)
+            slot.Values["Hour"] = hourText
+
+            emojiText = (WeatherEmoji.Back, WeatherEmoji.Middle, WeatherEmoji.Front)
+            if (slot.WeatherEmoji is None):
+                slot.WeatherEmoji = self.Wrapper.StackedEmojiElement(WeatherEmoji, config.Emoji, xOffset=labelX, yOffset=y_start + 107)
+            elif (slot.Values.get("Emoji") != emojiText):
+                self.Wrapper.ChangeStackedEmoji(slot.WeatherEmoji, WeatherEmoji, config.Emoji, xOffset=labelX, yOffset=y_start + 107)
+            slot.Values["Emoji"] = emojiText
 
-            store.RainForecastGraph.PrecipitationChances.append(self.Wrapper.Rectangle(
-                x, y_start + barMaxHeight - bar_height, x + barWidth, y_start + barMaxHeight,
-                fillColor="blue", outlineColor=""
-            ))
-
-
-            store.RainForecastGraph.HourLabels.append(self.Wrapper.FormattedTextElement(Time, config.Hour, xOffset = x + 2 + barWidth // 2, yOffset = y_start - 24))
-            weatherEmoji = self.Wrapper.StackedEmojiElement(WeatherEmoji, config.Emoji, xOffset=x + 2 + barWidth // 2, yOffset=y_start + 107)
-            if weatherEmoji is not None:
-                store.RainForecastGraph.WeatherEmojis.append(weatherEmoji)
             if (WeatherIcon.Icon != IconType.Unknown):
-                basePath = self.Config._basePath
-                folder = "/assets/icons/"
-                stoke = "-Outline" if self.Settings.CurrentTempIcon.Stroke else ""
-                icon = F'Icon-{WeatherIcon.Icon.value}{stoke}.png'
-                path = F'{basePath}{folder}{icon}'
-                weatherIcon = self.Wrapper.StackedIconElement(path, WeatherIcon, config.Icon, xOffset=x-5, yOffset=y_start + 100)
-                if weatherIcon is not None:
-                    store.RainForecastGraph.WeatherIcons.append(weatherIcon)
-            store.RainForecastGraph.CloudCoverPercentages.append(self.Wrapper.TextElement(F"{cloudCoverPercentage}%", config.CloudCover, xOffset=x + 2 + barWidth // 2, yOffset=y_start + 135))
-            
-            if rain_amount > 0:
-                store.RainForecastGraph.PrecipitationAmounts.append(self.Wrapper.TextElement(f"{rain_amount}{rainAddon}", config.RainAmount, xOffset=x + 2 + barWidth // 2, yOffset=y_start - 40))
+                path = self.IconPath(WeatherIcon)
+                iconValue = (path, WeatherIcon.Middle, WeatherIcon.Front)
+                if (slot.WeatherIcon is None):
+                    slot.WeatherIcon = self.Wrapper.StackedIconElement(path, WeatherIcon, config.Icon, xOffset=x-5, yOffset=y_start + 100)
+                elif (slot.Values.get("Icon") != iconValue):
+                    self.Wrapper.ChangeStackedIcon(slot.WeatherIcon, path, WeatherIcon, config.Icon, xOffset=x-5, yOffset=y_start + 100)
+                slot.Values["Icon"] = iconValue
+            elif (slot.WeatherIcon is not None):
+                slot.WeatherIcon.Delete()
+                slot.WeatherIcon = None
+                slot.Values.pop("Icon", None)
+
+            cloudText = F"{cloudCoverPercentage}%"
+            if (slot.CloudCoverPercentage is None):
+                slot.CloudCoverPercentage = self.Wrapper.TextElement(cloudText, config.CloudCover, xOffset=labelX, yOffset=y_start + 135)
+            elif (slot.Values.get("CloudCover") != cloudText):
+                slot.CloudCoverPercentage.UpdateText(cloudText)
+            slot.Values["CloudCover"] = cloudText
 
-        store.TopLine = self.Wrapper.Line(x_start, y_start, x_start + ((barSpacing + barWidth) * 24), y_start, fillColor="white")
-        store.BottomLine = self.Wrapper.Line(x_start, y_start + barMaxHeight, x_start + ((barSpacing + barWidth) * 24), y_start + barMaxHeight, fillColor="white")
-
-        if not HasRain:
-            store.RainForecastGraph.NoRainWarning = self.Wrapper.TextElement("No Rain Detected in the next 24 Hours", config.NoRainWarning, xOffset = x_start + ((barWidth + barSpacing) * 12), yOffset = y_start + 25)
-
-        return er
\ No newline at end of file
+            if rain_amount > 0:
+                rainText = f"{rain_amount}{rainAddon}"
+                if (slot.PrecipitationAmount is None):
+                    slot.PrecipitationAmount = self.Wrapper.TextElement(rainText, config.RainAmount, xOffset=labelX, yOffset=y_start - 40)
+                elif (slot.Values.get("RainAmount") != rainText):
+                    slot.PrecipitationAmount.UpdateText(rainText)
+                slot.Values["RainAmount"] = rainText
+            elif (slot.PrecipitationAmount is not None):
+                slot.PrecipitationAmount.Delete()
+                slot.PrecipitationAmount = None
+                slot.Values.pop("RainAmount", None)
+
+        if (graph.TopLine is None):
+            graph.TopLine = self.Wrapper.Line(x_start, y_start, x_start + ((barSpacing + barWidth) * 24), y_start, fillColor="white", static=True)
+        if (graph.BottomLine is None):
+            graph.BottomLine = self.Wrapper.Line(x_start, y_start + barMaxHeight, x_start + ((barSpacing + barWidth) * 24), y_start + barMaxHeight, fillColor="white", static=True)
+
+        if (HasRain and graph.NoRainWarning is not None):
+            graph.NoRainWarning.Delete()
+            graph.NoRainWarning = None
+        elif (not HasRain and graph.NoRainWarning is None):
+            graph.NoRainWarning = self.Wrapper.TextElement("No Rain Detected in the next 24 Hours", config.NoRainWarning, xOffset = x_start + ((barWidth + barSpacing) * 12), yOffset = y_start + 25)
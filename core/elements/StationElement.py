@@ -19,7 +19,8 @@ class StationElement(ElementBase):
 
     def Initialize(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> int:
         if (current.Source != "Station"):
-            return
+            # Still scheduled, so the label appears once a station reading comes in.
+            return self.ElementRefresh
 
         store.Station = self.Wrapper.TextElement(F"Station: {current.StationId}", self.Settings.Station)
         return self.ElementRefresh
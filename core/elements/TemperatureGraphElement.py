@@ -1,7 +1,9 @@
-﻿from collections import defaultdict
-import logging
+﻿import logging
 from config.WeatherConfig import WeatherConfig
-from core.store import WeatherDisplayStore
+from config.TextElementSettings import TextElementSettings
+from core.drawing.ElementStore import ElementStore
+from core.store import TemperatureGraphPointStore, TemperatureGraphStore, WeatherDisplayStore
+from data.HistoryStore import HistoryStore, ToEpoch
 from . import ElementRefresh, ElementBase
 from .ElementRefresh import *
 from helpers import Delay
@@ -40,8 +42,8 @@ class TemperatureGraphElement(ElementBase):
         width = config.Width
         height = config.Height
 
-        self.Wrapper.Line(x, y, x+width, y, fillColor="white", width=2, smooth=True)
-        self.Wrapper.Line(x, y+height, x+width, y+height, fillColor="white", width=2, smooth=True)
+        self.Wrapper.Line(x, y, x+width, y, fillColor="white", width=2, smooth=True, static=True)
+        self.Wrapper.Line(x, y+height, x+width, y+height, fillColor="white", width=2, smooth=True, static=True)
 
         return self.Refresh(store, forecast, current, history, sunData)
 
@@ -50,19 +52,11 @@ class TemperatureGraphElement(ElementBase):
         if (not config.Enabled):
             return self.ElementRefresh
 
-        for i in store.TemperatureGraph.ConnectingLines:
-            i.Delete()
-        for i in store.TemperatureGraph.Points:
-            i.Delete()
-        for i in store.TemperatureGraph.SmallTemps:
-            i.Delete()
-        for i in store.TemperatureGraph.TimeTemps:
-            i.Delete()
-
-        store.TemperatureGraph.ConnectingLines.clear()
-        store.TemperatureGraph.Points.clear()
-        store.TemperatureGraph.SmallTemps.clear()
-        store.TemperatureGraph.TimeTemps.clear()
+        graph = store.TemperatureGraph
+        if (any(s.IsDeleted() for s in graph.Slots)):
+            graph.Clear()
+        while (len(graph.Slots) < 25):
+            graph.Slots.append(TemperatureGraphPointStore())
 
         now = datetime.now()
         x = config.X
@@ -70,36 +64,36 @@ class TemperatureGraphElement(ElementBase):
         width = config.Width
         height = config.Height
 
-        hourlyTemps = defaultdict(list)
-
         minTime = now.replace(minute=0,second=0,microsecond=0) - timedelta(hours=24)
+        coords = []
+        historyStore = history.Store
+        hourlyTemps = self.UpdateHourlyTemps(graph, historyStore, minTime, now)
         high = forecast.Daytime.High
         low = forecast.Nighttime.Low
+        if (high is None or low is None):
+            # Until the forecast arrives, the graph is scaled to the temperatures seen so far.
+            known = [total / count for total, count in hourlyTemps.values()]
+            if (current.CurrentTemp is not None):
+                known.append(current.CurrentTemp)
+            if (not known):
+                for slot in graph.Slots:
+                    slot.Hide()
+                return self.ElementRefresh
+            high = max(known) if high is None else high
+            low = min(known) if low is None else low
         tempRange = max(high - low, 1)
-        tempPoints = []
-        coords = []
-        maxTimestamp = datetime.min
-        minTimestamp = datetime.max
-
-        for line in history.Lines:
-            utcTimestamp = line.ObservedTimeLocal.replace(tzinfo=None)
-            if (utcTimestamp > maxTimestamp):
-                maxTimestamp = utcTimestamp
-            if (utcTimestamp < minTimestamp):
-                minTimestamp = utcTimestamp
-            hourBucket = utcTimestamp.replace(minute=0,second=0,microsecond=0)
-            if minTime <= hourBucket <= now:
-                hourlyTemps[hourBucket].append(line.CurrentTemp)
 
-        self.Log.debug(F'Elements between {minTimestamp.strftime("%d/%m/%Y %H:%M:%S")} and {maxTimestamp.strftime("%d/%m/%Y %H:%M:%S")}')
+        if (historyStore.Count > 0):
+            minTimestamp = datetime.fromtimestamp(historyStore.TimestampAt(0))
+            maxTimestamp = datetime.fromtimestamp(historyStore.TimestampAt(historyStore.Count - 1))
+            self.Log.debug(F'Elements between {minTimestamp.strftime("%d/%m/%Y %H:%M:%S")} and {maxTimestamp.strftime("%d/%m/%Y %H:%M:%S")}')
 
         for i in range(24):
             hour = now - timedelta(hours=23-i)
             bucket = hour.replace(minute=0, second=0, microsecond=0)
-            values = hourlyTemps.get(bucket, [])
+            total, count = hourlyTemps.get(bucket, (0, 0))
             bucketDisplay = bucket.strftime("%I").lstrip('0') + bucket.strftime("%p")[0].lower()
-            avgTemp = sum(values) / len(values) if values else None
-            tempPoints.append(avgTemp)
+            avgTemp = total / count if count else None
 
             xPos = x + i * (width / 24)
             if avgTemp is not None:
@@ -110,28 +104,99 @@ class TemperatureGraphElement(ElementBase):
             coords.append((xPos, yPos, avgTemp, bucketDisplay))
 
         xPos = x + 24 * (width / 24)
-        norm = (current.CurrentTemp - low) / tempRange
-        yPos = y + height * (1 - norm)
+        yPos = None
+        if (current.CurrentTemp is not None):
+            norm = (current.CurrentTemp - low) / tempRange
+            yPos = y + height * (1 - norm)
         bucketDisplay = current.ObservedTimeLocal.strftime("%I").lstrip('0') + current.ObservedTimeLocal.strftime(":%M")
         coords.append((xPos, yPos, current.CurrentTemp, bucketDisplay))
 
         prevValidIndex = None
 
         for i, (xCur, yCur, norm, bucketDisplay) in enumerate(coords):
-            if yCur is not None:
-                store.TemperatureGraph.Points.append(self.Wrapper.Oval(xCur - 2, yCur - 2, xCur + 2, yCur + 2, fillColor="white", outlineColor=""))
-                smallTemp = self.Wrapper.TextElement(F"{norm:.1f}", self.Settings.TemperatureGraph.SmallText, xCur, yCur+2)
-                if smallTemp is not None:
-                    store.TemperatureGraph.SmallTemps.append(smallTemp)
-                timeTemp = self.Wrapper.TextElement(bucketDisplay, self.Settings.TemperatureGraph.TimeTemps, xCur, yCur+9)
-                if timeTemp is not None:
-                    store.TemperatureGraph.TimeTemps.append(timeTemp)
-
-                if prevValidIndex is not None:
-                    xPrev, yPrev, avgTemp, prevBucket = coords[prevValidIndex]
-                    color = GetColorForTemp(avgTemp, low, high)
-                    store.TemperatureGraph.ConnectingLines.append(self.Wrapper.Line(xPrev, yPrev, xCur, yCur, fillColor=color, width=2, smooth=True))
-
-                prevValidIndex = i
-
-        return self.ElementRefresh
\ No newline at end of file
+            slot = graph.Slots[i]
+            if yCur is None:
+                slot.Hide()
+                continue
+
+            self.UpdatePoint(slot, xCur, yCur)
+            slot.SmallTemp = self.UpdateText(slot, "SmallTemp", slot.SmallTemp, F"{norm:.1f}", config.SmallText, xCur, yCur+2)
+            slot.TimeTemp = self.UpdateText(slot, "TimeTemp", slot.TimeTemp, bucketDisplay, config.TimeTemps, xCur, yCur+9)
+
+            if prevValidIndex is not None:
+                xPrev, yPrev, avgTemp, prevBucket = coords[prevValidIndex]
+                self.UpdateSegment(slot, (xPrev, yPrev, xCur, yCur), GetColorForTemp(avgTemp, low, high))
+            elif slot.Segment is not None:
+                slot.Segment.SetVisible(False)
+
+            prevValidIndex = i
+
+        return self.ElementRefresh
+
+    def UpdateHourlyTemps(self, graph: TemperatureGraphStore, historyStore: HistoryStore, minTime: datetime, now: datetime) -> dict[datetime, list[float]]:
+        # Completed hours never change, so only observations newer than the last refresh are folded in.
+        if (graph.HistorySource is not historyStore or graph.HistoryGeneration != historyStore.Generation):
+            graph.ResetBuckets()
+            graph.HistorySource = historyStore
+            graph.HistoryGeneration = historyStore.Generation
+
+        startEpoch = ToEpoch(minTime.astimezone())
+        if (graph.LastEpoch is not None):
+            startEpoch = max(startEpoch, graph.LastEpoch + 1)
+        startIndex = historyStore.IndexAtOrAfter(startEpoch)
+        endIndex = historyStore.IndexAtOrAfter(ToEpoch(now.astimezone()) + 1)
+        timestamps = historyStore.TimestampColumn(startIndex, endIndex)
+        temps = historyStore.Column("CurrentTemp", startIndex, endIndex)
+
+        hourlyTemps = graph.HourlyTemps
+        for timestamp, temp in zip(timestamps, temps):
+            if temp is None:
+                continue
+            hourBucket = datetime.fromtimestamp(timestamp).replace(minute=0,second=0,microsecond=0)
+            entry = hourlyTemps.get(hourBucket)
+            if entry is None:
+                hourlyTemps[hourBucket] = [temp, 1]
+            else:
+                entry[0] += temp
+                entry[1] += 1
+        if (timestamps):
+            graph.LastEpoch = timestamps[-1]
+
+        for bucket in [b for b in hourlyTemps if b < minTime]:
+            del hourlyTemps[bucket]
+        return hourlyTemps
+
+    def UpdatePoint(self, slot: TemperatureGraphPointStore, xCur: float, yCur: float):
+        if (slot.Point is None):
+            slot.Point = self.Wrapper.Oval(xCur - 2, yCur - 2, xCur + 2, yCur + 2, fillColor="white", outlineColor="")
+        elif (slot.Values.get("Point") != (xCur, yCur)):
+            slot.Point.MoveDouble(xCur - 2, yCur - 2, xCur + 2, yCur + 2)
+        slot.Point.SetVisible(True)
+        slot.Values["Point"] = (xCur, yCur)
+
+    def UpdateText(self, slot: TemperatureGraphPointStore, name: str, es: ElementStore, text: str, settings: TextElementSettings, xCur: float, yCur: float) -> ElementStore:
+        if (es is None):
+            es = self.Wrapper.TextElement(text, settings, xCur, yCur)
+            if (es is None):
+                return None
+        else:
+            if (slot.Values.get(name + "Text") != text):
+                es.UpdateText(text)
+            if (slot.Values.get(name) != (xCur, yCur)):
+                es.MoveSingle(settings.X + xCur, settings.Y + yCur)
+            es.SetVisible(True)
+        slot.Values[name + "Text"] = text
+        slot.Values[name] = (xCur, yCur)
+        return es
+
+    def UpdateSegment(self, slot: TemperatureGraphPointStore, line: tuple, color: str):
+        if (slot.Segment is None):
+            slot.Segment = self.Wrapper.Line(*line, fillColor=color, width=2, smooth=True)
+        else:
+            if (slot.Values.get("Segment") != line):
+                slot.Segment.MoveDouble(*line)
+            if (slot.Values.get("SegmentColor") != color):
+                slot.Segment.ChangeFillColor(color)
+            slot.Segment.SetVisible(True)
+        slot.Values["Segment"] = line
+        slot.Values["SegmentColor"] = color
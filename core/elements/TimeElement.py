@@ -17,7 +17,7 @@ class TimeElement(ElementBase):
     def Initialize(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> ElementRefresh:
         now = datetime.now()
         store.Time = self.Wrapper.FormattedTextElement(now, self.Settings.Time)
-        return ElementRefresh.NextSecond()
+        return ElementRefresh.OnFormatChange(self.Settings.Time.Format)
 
     def Refresh(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> ElementRefresh:
         if (not store.Time or store.Time.IsDeleted):
@@ -25,4 +25,4 @@ class TimeElement(ElementBase):
 
         now = datetime.now()
         store.Time.UpdateText(DateTimeHelpers.HourSafeToString(now, self.Settings.Time.Format))
-        return ElementRefresh.NextSecond()
\ No newline at end of file
+        return ElementRefresh.OnFormatChange(self.Settings.Time.Format)
\ No newline at end of file
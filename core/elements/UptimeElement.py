@@ -18,7 +18,7 @@ class UptimeElement(ElementBase):
     def Initialize(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> int:
         uptime = F"Uptime: {DateTimeHelpers.GetReadableTimeBetween(self.Start)}"
         store.Uptime = self.Wrapper.TextElement(uptime, self.Settings.Uptime)
-        return ElementRefresh.NextSecond()
+        return ElementRefresh.NextElapsedSecond(self.Start)
 
     def Refresh(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> int:
         if (not store.Uptime or store.Uptime.IsDeleted):
@@ -26,4 +26,4 @@ class UptimeElement(ElementBase):
 
         uptime = F"Uptime: {DateTimeHelpers.GetReadableTimeBetween(self.Start)}"
         store.Uptime.UpdateText(uptime)
-        return ElementRefresh.NextSecond()
\ No newline at end of file
+        return ElementRefresh.NextElapsedSecond(self.Start)
\ No newline at end of file
@@ -20,6 +20,7 @@ class WeatherEmojiElement(ElementBase):
         if (not self.Settings.CurrentTempEmoji.Enabled):
             return self.ElementRefresh
 
+        self.Wrapper.WarmStackedEmoji(self.Settings.CurrentTempEmoji, lambda: WeatherConditions.DisplayCombinations()[1])
         emoji = current.Conditions.GetEmoji()
         store.WeatherEmoji = self.Wrapper.StackedEmojiElement(emoji, self.Settings.CurrentTempEmoji)
         return self.ElementRefresh
@@ -34,7 +35,5 @@ class WeatherEmojiElement(ElementBase):
 
         emoji = current.Conditions.GetEmoji()
 
-        store.WeatherEmoji.Front.UpdateText(emoji.Front)
-        store.WeatherEmoji.Middle.UpdateText(emoji.Middle)
-        store.WeatherEmoji.Back.UpdateText(emoji.Back)
+        self.Wrapper.ChangeStackedEmoji(store.WeatherEmoji, emoji, self.Settings.CurrentTempEmoji)
         return self.ElementRefresh
\ No newline at end of file
@@ -4,6 +4,7 @@ from core.drawing.CanvasWrapper import CanvasWrapper
 from core.elements.ElementRefresh import *
 from core.elements.ElementBase import ElementBase
 from data import *
+from data.IconDisplay import IconDisplay
 from helpers import Delay
 from core.store.WeatherDisplayStore import WeatherDisplayStore
 
@@ -19,17 +20,22 @@ class WeatherIconElement(ElementBase):
     def Initialize(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> int:
         if (not self.Settings.CurrentTempIcon.Enabled):
             return self.ElementRefresh
+        if (current.Conditions.SunAngle is None):
+            # The skeleton's stand-in conditions carry no sun angle, and without one there is no icon to pick yet.
+            return self.ElementRefresh
 
         emoji = current.Conditions.GetIcon()
+        path = self.IconPath(emoji)
+
+        self.Wrapper.WarmStackedIcon(self.Settings.CurrentTempIcon, lambda: WeatherConditions.DisplayCombinations()[0], self.IconPath)
+        store.WeatherIcon = self.Wrapper.StackedIconElement(path, emoji, self.Settings.CurrentTempIcon)
+        return self.ElementRefresh
 
+    def IconPath(self, icon: IconDisplay) -> str:
         basePath = self.Config._basePath
         folder = "/assets/icons/"
         stoke = "-Outline" if self.Settings.CurrentTempIcon.Stroke else ""
-        icon = F'Icon-{emoji.Icon.value}{stoke}.png'
-        path = F'{basePath}{folder}{icon}'
-
-        store.WeatherIcon = self.Wrapper.StackedIconElement(path, emoji, self.Settings.CurrentTempIcon)
-        return self.ElementRefresh
+        return F'{basePath}{folder}Icon-{icon.Icon.value}{stoke}.png'
 
     def Refresh(self, store: WeatherDisplayStore, forecast: ForecastData, current: CurrentData, history: HistoryData, sunData: SunData) -> int:
         if (not store.WeatherIcon or store.WeatherIcon.IsDeleted):
@@ -38,16 +44,11 @@ class WeatherIconElement(ElementBase):
             store.WeatherIcon.Delete()
             store.WeatherIcon = None
             return self.ElementRefresh
+        if (current.Conditions.SunAngle is None):
+            return self.ElementRefresh
 
         emoji = current.Conditions.GetIcon()
+        path = self.IconPath(emoji)
 
-        basePath = self.Config._basePath
-        folder = "/assets/icons/"
-        stoke = "-Outline" if self.Settings.CurrentTempIcon.Stroke else ""
-        icon = F'Icon-{emoji.Icon.value}{stoke}.png'
-        path = F'{basePath}{folder}{icon}'
-
-        store.WeatherIcon.Front.UpdateText(emoji.Front)
-        store.WeatherIcon.Middle.UpdateText(emoji.Middle)
-        store.WeatherIcon.Back.ChangeImage(path, self.Settings.CurrentTempIcon.Width, self.Settings.CurrentTempIcon.Height)
+        self.Wrapper.ChangeStackedIcon(store.WeatherIcon, path, emoji, self.Settings.CurrentTempIcon)
         return self.ElementRefresh
\ No newline at end of file
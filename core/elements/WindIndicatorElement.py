@@ -31,7 +31,7 @@ class WindIndicatorElement(ElementBase):
         y = config.Y
         radius = config.Size
 
-        self.Wrapper.Oval(x - radius, y - radius, x + radius, y + radius, outlineColor="white", borderWidth=3)
+        self.Wrapper.Oval(x - radius, y - radius, x + radius, y + radius, outlineColor="white", borderWidth=3, static=True)
 
         store.WindIndicator.HistoryArrows = []
         for i in range(config.HistoryArrows):
@@ -83,21 +83,22 @@ class WindIndicatorElement(ElementBase):
         compass = directions[index]
         self.Wrapper.UpdateText(store.WindIndicator.Direction, f"{direction:.0f}° ({compass})")
 
-        deduped_lines = []
+        deduped_directions = []
         last_direction = direction
-        for line in history.Lines[1:]:
-            if not hasattr(line, "WindDirection") or line.WindDirection is None:
+        historyStore = history.Store
+        for i in range(historyStore.Count - 2, -1, -1):
+            pastDirection = historyStore.Value("WindDirection", i)
+            if pastDirection is None:
                 continue
-            if line.WindDirection != last_direction:
-                deduped_lines.append(line)
-                last_direction = line.WindDirection
-            if len(deduped_lines) >= config.HistoryArrows:
+            if pastDirection != last_direction:
+                deduped_directions.append(pastDirection)
+                last_direction = pastDirection
+            if len(deduped_directions) >= config.HistoryArrows:
                 break
 
         historyDirections = []
 
-        for i, (line, arrowStore) in enumerate(zip(deduped_lines, store.WindIndicator.HistoryArrows)):
-            pastDirection = line.WindDirection
+        for i, (pastDirection, arrowStore) in enumerate(zip(deduped_directions, store.WindIndicator.HistoryArrows)):
             angleRad = math.radians(pastDirection - 90)
             fadedX = x + math.cos(angleRad) * radius * 0.95
             fadedY = y + math.sin(angleRad) * radius * 0.95
@@ -3,14 +3,16 @@ from core.drawing.ElementStore import ElementStore
 
 
 class EmojiStore:
-    def __init__(self, front:ElementStore = None, middle:ElementStore = None, back:ElementStore = None):
+    def __init__(self, front:ElementStore = None, middle:ElementStore = None, back:ElementStore = None, composite:bool = False):
         self.Front: Optional[ElementStore] = front
         self.Middle: Optional[ElementStore] = middle
         self.Back: Optional[ElementStore] = back
         self.IsDeleted: bool = False
+        # A composite store draws every layer as one pre-rendered image held in Back.
+        self.IsComposite: bool = composite
 
     def Delete(self):
-        self.Front.Delete()
-        self.Middle.Delete()
-        self.Back.Delete()
+        for layer in (self.Front, self.Middle, self.Back):
+            if (layer is not None):
+                layer.Delete()
         self.IsDeleted = True
\ No newline at end of file
@@ -1,61 +1,63 @@
 ﻿from typing import Optional
 from core.drawing.ElementStore import ElementStore
 from core.store.EmojiStore import EmojiStore
+from core.store.RainForecastHourStore import RainForecastHourStore
 
 class RainForecastGraphStore:
     def __init__(self):
-        self.CloudGradientLines:list[ElementStore] = []
-        self.AmbientLightLines:list[ElementStore] = []
-        self.PrecipitationAmounts:list[ElementStore] = []
-        self.PrecipitationChances:list[ElementStore] = []
-        self.WeatherEmojis:list[EmojiStore] = []
-        self.WeatherIcons:list[EmojiStore] = []
-        self.CloudCoverPercentages:list[ElementStore] = []
-        self.HourLabels:list[ElementStore] = []
+        self.SkyGradient:Optional[ElementStore] = None
+        self.SkyGradientStrip = None
+        self.SkyGradientKey = None
+        # The forecast and sun objects the strip was built from, compared by identity.
+        self.SkyGradientSources = None
+        self.SkyGradientX = 0
+        self.SkyGradientShownX = None
+        self.Hours:list[RainForecastHourStore] = []
+        self.LayoutKey = None
+        self.LayoutForecast = None
+        self.Geometry = None
         self.TopLine:Optional[ElementStore] = None
         self.BottomLine:Optional[ElementStore] = None
         self.NoRainWarning:Optional[ElementStore] = None
         self.DebugEmojiTime:list[ElementStore] = []
         self.DebugCloudCoverTime:list[ElementStore] = []
 
+    def ClearSkyGradient(self):
+        if (self.SkyGradient is not None):
+            self.SkyGradient.Delete()
+        self.SkyGradient = None
+        self.SkyGradientStrip = None
+        self.SkyGradientKey = None
+        self.SkyGradientSources = None
+        self.SkyGradientShownX = None
+
+    def IsDeleted(self) -> bool:
+        items = [self.TopLine, self.BottomLine, self.NoRainWarning]
+        return any(i is not None and i.IsDeleted for i in items) or any(h.IsDeleted() for h in self.Hours)
+
     def Clear(self):
-        for e in self.CloudGradientLines:
-            e.Delete()
-        self.CloudGradientLines.clear()
-        for e in self.AmbientLightLines:
-            e.Delete()
-        self.AmbientLightLines.clear()
-        for e in self.PrecipitationAmounts:
-            e.Delete()
-        self.PrecipitationAmounts.clear()
-        for e in self.PrecipitationChances:
-            e.Delete()
-        self.PrecipitationChances.clear()
-        for e in self.WeatherEmojis:
-            e.Delete()
-        self.WeatherEmojis.clear()
-        for e in self.CloudCoverPercentages:
-            e.Delete()
-        self.CloudCoverPercentages.clear()
-        for e in self.HourLabels:
-            e.Delete()
-        self.HourLabels.clear()
+        for h in self.Hours:
+            h.Delete()
+        self.Hours.clear()
         for e in self.DebugEmojiTime:
             e.Delete()
         self.DebugEmojiTime.clear()
         for e in self.DebugCloudCoverTime:
             e.Delete()
-        for e in self.WeatherIcons:
-            e.Delete()
-        self.WeatherIcons.clear()
+        self.DebugCloudCoverTime.clear()
 
         if (self.TopLine is not None):
             self.TopLine.Delete()
+        self.TopLine = None
 
         if (self.BottomLine is not None):
             self.BottomLine.Delete()
+        self.BottomLine = None
 
         if (self.NoRainWarning is not None):
             self.NoRainWarning.Delete()
-        
+        self.NoRainWarning = None
 
+        self.LayoutKey = None
+        self.LayoutForecast = None
+        self.Geometry = None
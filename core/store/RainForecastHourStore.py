@@ -0,0 +1,38 @@
+﻿from typing import Optional
+from core.drawing.ElementStore import ElementStore
+from core.store.EmojiStore import EmojiStore
+
+class RainForecastHourStore:
+    def __init__(self):
+        self.PrecipitationChance:Optional[ElementStore] = None
+        self.PrecipitationAmount:Optional[ElementStore] = None
+        self.HourLabel:Optional[ElementStore] = None
+        self.CloudCoverPercentage:Optional[ElementStore] = None
+        self.WeatherEmoji:Optional[EmojiStore] = None
+        self.WeatherIcon:Optional[EmojiStore] = None
+        # Last values drawn into each item, so unchanged items are left alone.
+        self.Values:dict[str, object] = {}
+
+    def Items(self) -> list:
+        return [self.PrecipitationChance, self.PrecipitationAmount, self.HourLabel, self.CloudCoverPercentage, self.WeatherEmoji, self.WeatherIcon]
+
+    def IsDeleted(self) -> bool:
+        for i in self.Items():
+            if (isinstance(i, EmojiStore)):
+                if (i.IsDeleted or any(l is not None and l.IsDeleted for l in (i.Front, i.Middle, i.Back))):
+                    return True
+            elif (i is not None and i.IsDeleted):
+                return True
+        return False
+
+    def Delete(self):
+        for i in self.Items():
+            if (i is not None):
+                i.Delete()
+        self.PrecipitationChance = None
+        self.PrecipitationAmount = None
+        self.HourLabel = None
+        self.CloudCoverPercentage = None
+        self.WeatherEmoji = None
+        self.WeatherIcon = None
+        self.Values.clear()
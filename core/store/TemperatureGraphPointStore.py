@@ -0,0 +1,30 @@
+﻿from typing import Optional
+from core.drawing.ElementStore import ElementStore
+
+class TemperatureGraphPointStore:
+    def __init__(self):
+        self.Point:Optional[ElementStore] = None
+        self.Segment:Optional[ElementStore] = None
+        self.SmallTemp:Optional[ElementStore] = None
+        self.TimeTemp:Optional[ElementStore] = None
+        # Last values drawn into each item, so unchanged items are left alone.
+        self.Values:dict[str, object] = {}
+
+    def Items(self) -> list[ElementStore]:
+        return [i for i in (self.Point, self.Segment, self.SmallTemp, self.TimeTemp) if i is not None]
+
+    def IsDeleted(self) -> bool:
+        return any(i.IsDeleted for i in self.Items())
+
+    def Hide(self):
+        for i in self.Items():
+            i.SetVisible(False)
+
+    def Delete(self):
+        for i in self.Items():
+            i.Delete()
+        self.Point = None
+        self.Segment = None
+        self.SmallTemp = None
+        self.TimeTemp = None
+        self.Values.clear()
@@ -1,9 +1,24 @@
-﻿from core.drawing.ElementStore import ElementStore
+﻿from datetime import datetime
+from core.store.TemperatureGraphPointStore import TemperatureGraphPointStore
 
 
 class TemperatureGraphStore:
     def __init__(self):
-        self.ConnectingLines:list[ElementStore] = []
-        self.Points:list[ElementStore] = []
-        self.SmallTemps:list[ElementStore] = []
-        self.TimeTemps:list[ElementStore] = []
\ No newline at end of file
+        self.Slots:list[TemperatureGraphPointStore] = []
+        # Running (sum, count) of temperatures per local hour, fed only with observations newer than LastEpoch.
+        self.HourlyTemps:dict[datetime, list[float]] = {}
+        # Held by reference rather than id(), which a new store can reuse once the old one is freed.
+        self.HistorySource = None
+        self.HistoryGeneration = None
+        self.LastEpoch = None
+
+    def ResetBuckets(self):
+        self.HourlyTemps.clear()
+        self.HistorySource = None
+        self.HistoryGeneration = None
+        self.LastEpoch = None
+
+    def Clear(self):
+        for s in self.Slots:
+            s.Delete()
+        self.Slots.clear()
@@ -1,7 +1,9 @@
 ﻿from .EmojiStore import EmojiStore
 from .HumiditySquareStore import HumiditySquareStore
 from .RainForecastGraphStore import RainForecastGraphStore
+from .RainForecastHourStore import RainForecastHourStore
 from .RainSquareStore import RainSquareStore
+from .TemperatureGraphPointStore import TemperatureGraphPointStore
 from .TemperatureGraphStore import TemperatureGraphStore
 from .WeatherDisplayStore import WeatherDisplayStore
 from .WindIndicatorStore import WindIndicatorStore
\ No newline at end of file
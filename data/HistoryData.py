@@ -2,6 +2,7 @@
 from datetime import datetime
 from typing import Optional, List
 
+from data.HistoryStore import HistoryStore, HistoryLinesView
 from data.WeatherConditions import WeatherConditions
 
 
@@ -25,4 +26,8 @@ class HistoryLine:
 
 @dataclass
 class HistoryData:
-    Lines: List[HistoryLine] = field(default_factory=list)
\ No newline at end of file
+    Store: HistoryStore = field(default_factory=HistoryStore)
+
+    @property
+    def Lines(self) -> HistoryLinesView:
+        return self.Store.Lines
\ No newline at end of file
@@ -0,0 +1,154 @@
+﻿import math
+
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+NumericColumns = ["WindDirection", "Humidity", "CurrentTemp", "FeelsLike", "HeatIndex", "DewPoint", "UVIndex", "Pressure"]
+
+def ToEpoch(timestamp: datetime) -> int:
+    if (timestamp.tzinfo is None):
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp())
+
+def LineTimestamp(line) -> Optional[datetime]:
+    return line.ObservedTimeUtc or line.LastUpdate
+
+class HistoryLinesView(Sequence):
+    # Read-only, newest-first view over a HistoryStore, matching the old List[HistoryLine] ordering.
+    def __init__(self, store: "HistoryStore"):
+        self.Store = store
+
+    def __len__(self) -> int:
+        return self.Store.Count
+
+    def __getitem__(self, index):
+        count = self.Store.Count
+        if isinstance(index, slice):
+            return [self.Store.LineAt(count - 1 - i) for i in range(*index.indices(count))]
+        if (index < 0):
+            index += count
+        if (index < 0 or index >= count):
+            raise IndexError("HistoryLinesView index out of range")
+        return self.Store.LineAt(count - 1 - index)
+
+    def __iter__(self) -> Iterator:
+        for i in range(self.Store.Count - 1, -1, -1):
+            yield self.Store.LineAt(i)
+
+class HistoryStore:
+    def __init__(self, capacity: int = 4096):
+        self.Capacity = capacity
+        self.Head = 0
+        self.Count = 0
+        # Bumped whenever existing rows are rewritten, so incremental readers know to start over.
+        self.Generation = 0
+        self.Timestamps = array("q", bytes(8 * capacity))
+        self.Columns = {name: array("d", [math.nan]) * capacity for name in NumericColumns}
+        self.Items: List[object] = [None] * capacity
+        self.Lines = HistoryLinesView(self)
+
+    def __len__(self) -> int:
+        return self.Count
+
+    def _Physical(self, index: int) -> int:
+        return (self.Head + index) % self.Capacity
+
+    def Append(self, line):
+        timestamp = LineTimestamp(line)
+        if (timestamp is None):
+            return
+        epoch = ToEpoch(timestamp)
+
+        if (self.Count > 0 and epoch < self.TimestampAt(self.Count - 1)):
+            self._Rebuild(self.Iterate(), [line])
+            return
+
+        if (self.Count == self.Capacity):
+            self._DropOldest()
+
+        p = self._Physical(self.Count)
+        self.Timestamps[p] = epoch
+        for name, column in self.Columns.items():
+            value = getattr(line, name, None)
+            column[p] = math.nan if value is None else float(value)
+        self.Items[p] = line
+        self.Count += 1
+
+    def Extend(self, lines: Iterable):
+        ordered = sorted((l for l in lines if LineTimestamp(l) is not None), key=lambda l: ToEpoch(LineTimestamp(l)))
+        if (not ordered):
+            return
+        if (self.Count == 0 or ToEpoch(LineTimestamp(ordered[0])) >= self.TimestampAt(self.Count - 1)):
+            for line in ordered:
+                self.Append(line)
+            return
+        self._Rebuild(self.Iterate(), ordered)
+
+    def _Rebuild(self, existing: Iterable, added: Iterable):
+        merged = sorted(list(existing) + list(added), key=lambda l: ToEpoch(LineTimestamp(l)))
+        self.Clear()
+        for line in merged[-self.Capacity:]:
+            self.Append(line)
+
+    def _DropOldest(self):
+        self.Items[self.Head] = None
+        self.Head = (self.Head + 1) % self.Capacity
+        self.Count -= 1
+
+    def ExpireBefore(self, cutoff: datetime) -> int:
+        cutoffEpoch = ToEpoch(cutoff)
+        expired = 0
+        while (self.Count > 0 and self.Timestamps[self.Head] < cutoffEpoch):
+            self._DropOldest()
+            expired += 1
+        return expired
+
+    def Clear(self):
+        self.Items = [None] * self.Capacity
+        self.Head = 0
+        self.Count = 0
+        self.Generation += 1
+
+    def TimestampAt(self, index: int) -> int:
+        return self.Timestamps[self._Physical(index)]
+
+    def LineAt(self, index: int):
+        return self.Items[self._Physical(index)]
+
+    def Value(self, name: str, index: int) -> Optional[float]:
+        value = self.Columns[name][self._Physical(index)]
+        return None if math.isnan(value) else value
+
+    def IndexAtOrAfter(self, epoch: int) -> int:
+        low = 0
+        high = self.Count
+        while (low < high):
+            middle = (low + high) // 2
+            if (self.TimestampAt(middle) < epoch):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def Window(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        # Logical [startIndex, endIndex) range of observations with start <= timestamp <= end.
+        return (self.IndexAtOrAfter(ToEpoch(start)), self.IndexAtOrAfter(ToEpoch(end) + 1))
+
+    def TimestampColumn(self, startIndex: int = 0, endIndex: Optional[int] = None) -> List[int]:
+        endIndex = self.Count if endIndex is None else endIndex
+        return [self.Timestamps[self._Physical(i)] for i in range(startIndex, endIndex)]
+
+    def Column(self, name: str, startIndex: int = 0, endIndex: Optional[int] = None) -> List[Optional[float]]:
+        endIndex = self.Count if endIndex is None else endIndex
+        column = self.Columns[name]
+        values = []
+        for i in range(startIndex, endIndex):
+            value = column[self._Physical(i)]
+            values.append(None if math.isnan(value) else value)
+        return values
+
+    def Iterate(self) -> Iterator:
+        for i in range(self.Count):
+            yield self.LineAt(i)
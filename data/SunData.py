@@ -3,6 +3,40 @@ from datetime import datetime, timedelta, time
 import math
 from typing import Optional
 
+import numpy as np
+
+SkyGradient = [
+    (-90, (11, 12, 42)),     # Deep night
+    (-18, (25, 25, 112)),    # Astronomical twilight
+    (-12, (128, 0, 128)),    # Nautical twilight
+    (-6,  (255, 140, 66)),   # Civil twilight
+    (0,   (255, 213, 128)),  # Sunrise/set
+    (6,   (176, 216, 255)),  # Early day
+    (20,  (135, 206, 235))   # Full day
+]
+
+# Sky colors precomputed every 0.1 degrees from -90 to 20, so a whole strip of elevations is one array index.
+SkyLutStep = 0.1
+
+def SkyColorRGB(angle: float) -> tuple[int, int, int]:
+    angle = max(SkyGradient[0][0], min(angle, SkyGradient[-1][0]))
+
+    for i in range(len(SkyGradient) - 1):
+        a1, c1 = SkyGradient[i]
+        a2, c2 = SkyGradient[i + 1]
+        if a1 <= angle <= a2:
+            ratio = (angle - a1) / (a2 - a1)
+            r = int(c1[0] + (c2[0] - c1[0]) * ratio)
+            g = int(c1[1] + (c2[1] - c1[1]) * ratio)
+            b = int(c1[2] + (c2[2] - c1[2]) * ratio)
+            return (r, g, b)
+
+    return (0, 0, 0)
+
+SkyColorLut = np.array(
+    [SkyColorRGB(SkyGradient[0][0] + i * SkyLutStep) for i in range(int(round((SkyGradient[-1][0] - SkyGradient[0][0]) / SkyLutStep)) + 1)],
+    dtype=np.uint8)
+
 @dataclass
 class DailySunTimes:
     Sunrise: Optional[datetime] = None
@@ -102,28 +136,39 @@ class SunData:
         return elevation
 
     def GetSkyColor(self, time: datetime) -> str:
-        angle = self.GetDegreesAboveHorizon(time)
-
-        gradient = [
-            (-90, (11, 12, 42)),     # Deep night
-            (-18, (25, 25, 112)),    # Astronomical twilight
-            (-12, (128, 0, 128)),    # Nautical twilight
-            (-6,  (255, 140, 66)),   # Civil twilight
-            (0,   (255, 213, 128)),  # Sunrise/set
-            (6,   (176, 216, 255)),  # Early day
-            (20,  (135, 206, 235))   # Full day
-        ]
-
-        angle = max(gradient[0][0], min(angle, gradient[-1][0]))
-
-        for i in range(len(gradient) - 1):
-            a1, c1 = gradient[i]
-            a2, c2 = gradient[i + 1]
-            if a1 <= angle <= a2:
-                ratio = (angle - a1) / (a2 - a1)
-                r = int(c1[0] + (c2[0] - c1[0]) * ratio)
-                g = int(c1[1] + (c2[1] - c1[1]) * ratio)
-                b = int(c1[2] + (c2[2] - c1[2]) * ratio)
-                return f"#{r:02x}{g:02x}{b:02x}"
-
-        return "#000000"
+        r, g, b = SkyColorRGB(self.GetDegreesAboveHorizon(time))
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def GetDegreesAboveHorizonSeries(self, start: datetime, offsets: np.ndarray) -> np.ndarray:
+        # Vectorized GetDegreesAboveHorizon for start + offsets (in seconds), with the same day handling.
+        start = start.replace(tzinfo=None)
+        todayDate = datetime.now().date()
+        startMidnight = datetime.combine(start.date(), time(0, 0))
+        dayIndex = np.floor(((start - startMidnight).total_seconds() + offsets) / 86400).astype(np.int64)
+
+        elevations = np.full(offsets.shape, -90.0)
+        if not self.Today.SolarNoon:
+            return elevations
+
+        phiRadians = math.radians(self.Latitude)
+        timeDiff = ((start - self.Today.SolarNoon).total_seconds() + offsets) / 3600
+        hourAngleRadians = np.radians(15 * timeDiff)
+
+        noons = {-1: self.Yesterday.SolarNoon, 0: self.Today.SolarNoon, 1: self.Tomorrow.SolarNoon}
+        for index in np.unique(dayIndex):
+            date = start.date() + timedelta(days=int(index))
+            if not noons.get((date - todayDate).days):
+                continue
+
+            mask = dayIndex == index
+            dayOfYear = date.timetuple().tm_yday
+            declinationRadians = math.radians(-23.44 * math.cos(math.radians(360 / 365 * (dayOfYear + 10))))
+            sinElevation = (math.sin(phiRadians) * math.sin(declinationRadians)
+                            + math.cos(phiRadians) * math.cos(declinationRadians) * np.cos(hourAngleRadians[mask]))
+            elevations[mask] = np.degrees(np.arcsin(sinElevation))
+
+        return elevations
+
+    def GetSkyColorSeries(self, start: datetime, offsets: np.ndarray) -> np.ndarray:
+        angles = np.clip(self.GetDegreesAboveHorizonSeries(start, offsets), SkyGradient[0][0], SkyGradient[-1][0])
+        return SkyColorLut[np.rint((angles - SkyGradient[0][0]) / SkyLutStep).astype(np.int64)]
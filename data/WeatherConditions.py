@@ -1,9 +1,16 @@
-﻿from datetime import datetime
+﻿import threading
+
+from datetime import datetime
+from itertools import product
+from typing import Optional
 from data.EmojiDisplay import EmojiDisplay
 from data.MoonPhase import MoonPhase
 from config.IconType import IconType
 from data.IconDisplay import IconDisplay
 
+_DisplayCombinations: Optional[tuple[list[IconDisplay], list[EmojiDisplay]]] = None
+_DisplayCombinationsLock = threading.Lock()
+
 class WeatherConditions:
     def __init__(self, 
                  time:datetime,                        # Local Time
@@ -90,9 +97,9 @@ class WeatherConditions:
         if self.CloudCover > 0.4:
             return EmojiDisplay(Back=background, Middle="☁")
         if self.WindGust > 15:
-            return EmojiDisplay(back=background, Middle="🌬")
+            return EmojiDisplay(Back=background, Middle="🌬")
         if self.IsFreezing:
-            return EmojiDisplay(back=background, Middle="🧊")
+            return EmojiDisplay(Back=background, Middle="🧊")
 
         return EmojiDisplay(Back=background)
 
@@ -214,3 +221,37 @@ class WeatherConditions:
             return IconDisplay(Icon=icon, Middle = "🧊" if self.IsFreezing else "")
 
         return IconDisplay(Icon=IconType.Unknown)
+
+    @staticmethod
+    def DisplayCombinations() -> tuple[list[IconDisplay], list[EmojiDisplay]]:
+        # Every distinct result of GetIcon and GetEmoji, found by trying one value from each side of every threshold they test.
+        global _DisplayCombinations
+        if _DisplayCombinations is not None:
+            return _DisplayCombinations
+
+        # Several sprite warm-up threads ask for this at startup; the lock makes the first one compute it and the rest wait for its result.
+        with _DisplayCombinationsLock:
+            if _DisplayCombinations is not None:
+                return _DisplayCombinations
+
+            icons = {}
+            emojis = {}
+            def Add(conditions: "WeatherConditions"):
+                icon = conditions.GetIcon()
+                emoji = conditions.GetEmoji()
+                icons.setdefault((icon.Icon, icon.Middle, icon.Front), icon)
+                emojis.setdefault((emoji.Back, emoji.Middle, emoji.Front), emoji)
+
+            # Hurricanes short-circuit both methods, so only the gust threshold matters.
+            for windGust in (0, 50):
+                Add(WeatherConditions(None, 0, 0, 0, None, windGust, 0, 10, 10, isHurricane=True))
+
+            for isWarning, isLightning, isFoggy, isHail, isFreezing in product((False, True), repeat=5):
+                for rainRate, snowRate, cloudCover, windGust, sunAngle in product((0, 0.1, 0.3, 1), (0, 0.5, 2, 5), (0, 0.3, 0.45, 0.55, 0.7, 0.82, 0.9), (0, 20), (-20, -17, -14, -8, -3, 3, 10)):
+                    for moon in (list(MoonPhase) if sunAngle < -18 else [None]):
+                        for visibility in ((0.5, 10) if isFoggy else (10,)):
+                            Add(WeatherConditions(None, rainRate, snowRate, cloudCover, moon, windGust, 0, visibility, sunAngle,
+                                isLightning, isFoggy, isFreezing, isHail, isWarning))
+
+            _DisplayCombinations = (list(icons.values()), list(emojis.values()))
+            return _DisplayCombinations
@@ -1,6 +1,7 @@
 ﻿from .CurrentData import CurrentData
 from .EmojiDisplay import EmojiDisplay
 from .HistoryData import HistoryData, HistoryLine
+from .HistoryStore import HistoryStore, HistoryLinesView
 from .MoonPhase import MoonPhase
 from .ForecastData import ForecastData, MoonPhase, DaytimeData, NighttimeData, HourlyForecast, RainTimesData
 from .SunData import SunData, DailySunTimes
@@ -1,5 +1,19 @@
-﻿from datetime import datetime
-
+﻿import re
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+# strftime directives (including the %-X variants handled by HourSafeToString) and the smallest unit each one displays.
+FormatUnits = {
+    "f": "second", "S": "second", "s": "second", "T": "second", "X": "second", "c": "second", "r": "second",
+    "M": "minute", "R": "minute",
+    "H": "hour", "I": "hour", "k": "hour", "l": "hour", "p": "hour", "P": "hour",
+    "d": "day", "e": "day", "a": "day", "A": "day", "j": "day", "w": "day", "u": "day", "x": "day", "D": "day", "F": "day",
+    "U": "day", "W": "day", "V": "day",
+    "b": "month", "B": "month", "h": "month", "m": "month",
+    "y": "year", "Y": "year", "G": "year", "C": "year",
+}
+UnitOrder = ["second", "minute", "hour", "day", "month", "year"]
 
 class DateTimeHelpers:
     @staticmethod
@@ -74,6 +88,30 @@ class DateTimeHelpers:
 
         return date.strftime(f)
 
+    @staticmethod
+    def SmallestFormatUnit(f: str) -> Optional[str]:
+        units = [FormatUnits[d] for d in re.findall(r"%-?([A-Za-z%])", f) if d in FormatUnits]
+        if (not units):
+            return None
+        return min(units, key=UnitOrder.index)
+
+    @staticmethod
+    def NextFormatChange(date: datetime, f: str) -> Optional[datetime]:
+        unit = DateTimeHelpers.SmallestFormatUnit(f)
+        if (unit == "second"):
+            return date.replace(microsecond=0) + timedelta(seconds=1)
+        if (unit == "minute"):
+            return date.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        if (unit == "hour"):
+            return date.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        if (unit == "day"):
+            return date.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        if (unit == "month"):
+            return (date.replace(day=1, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=32)).replace(day=1)
+        if (unit == "year"):
+            return date.replace(year=date.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        return None
+
     @staticmethod
     def Equal(d1:datetime, d2: datetime) -> bool:
         t1 = d1.replace(tzinfo=None)
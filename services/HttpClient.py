@@ -0,0 +1,119 @@
+﻿import logging, random, threading, time
+
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.WeatherConfig import WeatherConfig
+
+class HostMetrics:
+    def __init__(self, samples: int):
+        self.Requests = 0
+        self.Retries = 0
+        self.Failures = 0
+        self.StatusCodes: dict[int, int] = {}
+        self.Latencies: deque[float] = deque(maxlen=samples)
+
+    def Stats(self) -> dict:
+        latencies = sorted(self.Latencies)
+
+        def Percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        return {
+            "Requests": self.Requests,
+            "Retries": self.Retries,
+            "Failures": self.Failures,
+            "StatusCodes": dict(self.StatusCodes),
+            "P50Ms": Percentile(0.5),
+            "P95Ms": Percentile(0.95),
+            "MaxMs": round(latencies[-1], 1) if latencies else 0.0,
+        }
+
+class HttpClient:
+    # One keep-alive requests.Session per host, shared by every service, with timeouts and retries on 5xx and 429.
+    RetryStatus = {429, 500, 502, 503, 504}
+
+    def __init__(self, config: WeatherConfig, samples: int = 128):
+        self.Log = logging.getLogger("HttpClient")
+        self.Config = config
+        self.Samples = samples
+        self.Sessions: dict[str, requests.Session] = {}
+        self.Metrics: dict[str, HostMetrics] = {}
+        self.Lock = threading.Lock()
+
+    def Session(self, host: str) -> requests.Session:
+        with self.Lock:
+            session = self.Sessions.get(host)
+            if session is None:
+                poolSize = self.Config.Services.Http.PoolSize
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=poolSize)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.Sessions[host] = session
+                self.Metrics[host] = HostMetrics(self.Samples)
+            return session
+
+    def Get(self, url: str, params: dict = None, headers: dict = None) -> requests.Response:
+        settings = self.Config.Services.Http
+        host = urlsplit(url).netloc
+        session = self.Session(host)
+        timeout = (settings.ConnectTimeoutSeconds, settings.ReadTimeoutSeconds)
+
+        attempt = 0
+        while True:
+            retryAfter = None
+            start = time.perf_counter()
+            try:
+                response = session.get(url, params=params, headers=headers, timeout=timeout)
+            except requests.ConnectionError as ex:
+                # Read timeouts are not retried; a server that accepted the request but hung is unlikely to answer the next one.
+                self.Record(host, start, None)
+                if attempt >= settings.Retries:
+                    raise
+                self.Log.debug(F"{host} connection failed ({ex}), retrying.")
+            else:
+                self.Record(host, start, response.status_code)
+                if response.status_code not in self.RetryStatus or attempt >= settings.Retries:
+                    return response
+                retryAfter = response.headers.get("Retry-After")
+                response.close()
+                self.Log.debug(F"{host} returned {response.status_code}, retrying.")
+
+            attempt += 1
+            with self.Lock:
+                self.Metrics[host].Retries += 1
+            time.sleep(self.Backoff(attempt, retryAfter))
+
+    def Backoff(self, attempt: int, retryAfter: str = None) -> float:
+        settings = self.Config.Services.Http
+        if retryAfter is not None and retryAfter.isdigit():
+            return min(float(retryAfter), settings.MaxBackoffSeconds)
+        # Full jitter: a random wait up to the exponential ceiling, so clients do not retry in lockstep.
+        return random.uniform(0, min(settings.MaxBackoffSeconds, settings.BackoffSeconds * (2 ** attempt)))
+
+    def Record(self, host: str, start: float, status: int):
+        elapsed = (time.perf_counter() - start) * 1000
+        with self.Lock:
+            metrics = self.Metrics[host]
+            metrics.Requests += 1
+            metrics.Latencies.append(elapsed)
+            if status is None:
+                metrics.Failures += 1
+            else:
+                metrics.StatusCodes[status] = metrics.StatusCodes.get(status, 0) + 1
+
+    def Stats(self) -> dict:
+        with self.Lock:
+            return {host: metrics.Stats() for host, metrics in self.Metrics.items()}
+
+    def Close(self):
+        with self.Lock:
+            for session in self.Sessions.values():
+                session.close()
+            self.Sessions = {}
@@ -0,0 +1,209 @@
+﻿import logging, os, sqlite3, threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, time, timedelta, timezone
+from time import monotonic
+from typing import Iterable, List, Optional, Tuple
+
+from config.ObservationSettings import ObservationSettings
+
+from data.HistoryData import HistoryLine
+from data.HistoryStore import LineTimestamp, ToEpoch
+from data.MoonPhase import MoonPhase
+from data.WeatherConditions import WeatherConditions
+
+LineColumns = {
+    "Source": "TEXT",
+    "StationId": "TEXT",
+    "WindDirection": "INTEGER",
+    "Humidity": "REAL",
+    "CurrentTemp": "REAL",
+    "FeelsLike": "REAL",
+    "HeatIndex": "REAL",
+    "DewPoint": "REAL",
+    "UVIndex": "REAL",
+    "Pressure": "REAL",
+    "LastUpdate": "REAL",
+    "ObservedTimeLocal": "TEXT",
+}
+
+ConditionColumns = {
+    "RainRate": "REAL",
+    "SnowRate": "REAL",
+    "CloudCover": "REAL",
+    "WindGust": "REAL",
+    "WindSpeed": "REAL",
+    "Visibility": "REAL",
+    "SunAngle": "REAL",
+    "IsLightning": "INTEGER",
+    "IsFoggy": "INTEGER",
+    "IsFreezing": "INTEGER",
+    "IsHail": "INTEGER",
+    "IsWarning": "INTEGER",
+    "IsHurricane": "INTEGER",
+    "StateConditions": "TEXT",
+    "Moon": "TEXT",
+}
+
+RollupMetrics = ["CurrentTemp", "FeelsLike", "HeatIndex", "DewPoint", "Humidity", "Pressure", "UVIndex", "WindSpeed", "WindGust", "RainRate"]
+RollupAggregates = ["Min", "Max", "Avg", "Last"]
+RollupTiers = ["Hourly", "Daily"]
+
+def DayStart(epoch: int) -> int:
+    # Daily rollups follow local days, so a day's high and low match what the screen shows.
+    return int(datetime.combine(datetime.fromtimestamp(epoch).date(), time.min).timestamp())
+
+def NextDayStart(epoch: int) -> int:
+    return int(datetime.combine(datetime.fromtimestamp(epoch).date() + timedelta(days=1), time.min).timestamp())
+
+class ObservationDatabase:
+    # SQLite (WAL) store of every HistoryLine, keyed by observation time, with hourly and daily rollups kept far longer than the raw rows.
+    def __init__(self, path: str, settings: ObservationSettings):
+        self.Log = logging.getLogger("ObservationDatabase")
+        self.Path = path
+        self.Settings = settings
+        self.Lock = threading.Lock()
+        self.Executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ObservationWriter")
+        self.LastPrune = 0.0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.Connection = sqlite3.connect(path, check_same_thread=False)
+        self.Connection.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL only syncs at checkpoints; a power cut can lose the last few rows but never corrupts the file.
+        self.Connection.execute("PRAGMA synchronous=NORMAL")
+        self.CreateTables()
+
+        columns = ["Time"] + list(LineColumns) + list(ConditionColumns)
+        self.InsertSql = F"INSERT OR REPLACE INTO Observations ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        self.RollupSql = {tier: self.BuildRollupSql(tier) for tier in RollupTiers}
+
+    def CreateTables(self):
+        columns = ", ".join(F"{name} {kind}" for name, kind in {**LineColumns, **ConditionColumns}.items())
+        rollupColumns = ", ".join(F"{metric}{aggregate} REAL" for metric in RollupMetrics for aggregate in RollupAggregates)
+        with self.Connection:
+            # Time is the rowid, so range queries walk the primary key index.
+            self.Connection.execute(F"CREATE TABLE IF NOT EXISTS Observations (Time INTEGER PRIMARY KEY, {columns})")
+            for tier in RollupTiers:
+                self.Connection.execute(F"CREATE TABLE IF NOT EXISTS {tier} (Bucket INTEGER PRIMARY KEY, Samples INTEGER, {rollupColumns})")
+
+    def BuildRollupSql(self, tier: str) -> str:
+        columns = ["Bucket", "Samples"]
+        values = [":bucket", "COUNT(*)"]
+        for metric in RollupMetrics:
+            columns += [F"{metric}{aggregate}" for aggregate in RollupAggregates]
+            values += [F"MIN({metric})", F"MAX({metric})", F"AVG({metric})",
+                       F"(SELECT {metric} FROM Observations WHERE Time >= :start AND Time < :end AND {metric} IS NOT NULL ORDER BY Time DESC LIMIT 1)"]
+        return F"INSERT OR REPLACE INTO {tier} ({', '.join(columns)}) SELECT {', '.join(values)} FROM Observations WHERE Time >= :start AND Time < :end"
+
+    def Row(self, line: HistoryLine) -> tuple:
+        row = [ToEpoch(LineTimestamp(line))]
+        for name in LineColumns:
+            value = getattr(line, name, None)
+            if isinstance(value, datetime):
+                value = value.timestamp() if name == "LastUpdate" else value.isoformat()
+            row.append(value)
+
+        conditions = line.Conditions
+        for name in ConditionColumns:
+            value = getattr(conditions, name, None) if conditions is not None else None
+            if isinstance(value, MoonPhase):
+                value = value.value
+            row.append(value)
+        return tuple(row)
+
+    def Line(self, row: sqlite3.Row) -> HistoryLine:
+        local = datetime.fromisoformat(row["ObservedTimeLocal"]) if row["ObservedTimeLocal"] else None
+        conditions = WeatherConditions(time=local)
+        for name in ConditionColumns:
+            value = row[name]
+            if value is not None and name.startswith("Is"):
+                value = bool(value)
+            elif value is not None and name == "Moon":
+                value = MoonPhase(value)
+            setattr(conditions, name, value)
+
+        return HistoryLine(
+            **{name: row[name] for name in LineColumns if name not in ("LastUpdate", "ObservedTimeLocal")},
+            LastUpdate=datetime.fromtimestamp(row["LastUpdate"], timezone.utc) if row["LastUpdate"] is not None else None,
+            ObservedTimeLocal=local,
+            ObservedTimeUtc=datetime.fromtimestamp(row["Time"], timezone.utc),
+            Conditions=conditions)
+
+    def Append(self, lines: Iterable[HistoryLine]) -> Optional[Future]:
+        # Called from the UI thread; the insert and rollups happen on the writer thread.
+        lines = list(lines)
+        if lines:
+            return self.Executor.submit(self.Write, lines)
+        return None
+
+    def Write(self, lines: Iterable[HistoryLine]):
+        rows = [self.Row(line) for line in lines if LineTimestamp(line) is not None]
+        if not rows:
+            return
+
+        try:
+            with self.Lock, self.Connection:
+                self.Connection.executemany(self.InsertSql, rows)
+                for hour in sorted({row[0] // 3600 * 3600 for row in rows}):
+                    self.Connection.execute(self.RollupSql["Hourly"], {"bucket": hour, "start": hour, "end": hour + 3600})
+                for day in sorted({DayStart(row[0]) for row in rows}):
+                    self.Connection.execute(self.RollupSql["Daily"], {"bucket": day, "start": day, "end": NextDayStart(day)})
+                if monotonic() - self.LastPrune > 3600:
+                    self.Prune()
+        except sqlite3.Error as ex:
+            self.Log.warning(F"Could not store {len(rows)} observations: {ex}")
+
+    def Prune(self):
+        # Caller holds the lock and the transaction.
+        now = datetime.now(timezone.utc)
+        # Raw rows must outlive the day being rolled up, or its daily rollup would be recomputed from a partial day.
+        rawDays = max(self.Settings.RawDays, 2)
+        self.Connection.execute("DELETE FROM Observations WHERE Time < ?", (ToEpoch(now - timedelta(days=rawDays)),))
+        self.Connection.execute("DELETE FROM Hourly WHERE Bucket < ?", (ToEpoch(now - timedelta(days=self.Settings.HourlyDays)),))
+        self.Connection.execute("DELETE FROM Daily WHERE Bucket < ?", (ToEpoch(now - timedelta(days=self.Settings.DailyDays)),))
+        self.LastPrune = monotonic()
+
+    def Query(self, sql: str, params: tuple) -> List[sqlite3.Row]:
+        with self.Lock:
+            cursor = self.Connection.cursor()
+            cursor.row_factory = sqlite3.Row
+            return cursor.execute(sql, params).fetchall()
+
+    def Range(self, start: datetime, end: datetime) -> List[HistoryLine]:
+        # Raw observations with start <= time <= end, oldest first.
+        return [self.Line(row) for row in self.Query("SELECT * FROM Observations WHERE Time >= ? AND Time <= ? ORDER BY Time", (ToEpoch(start), ToEpoch(end)))]
+
+    def Rollups(self, tier: str, start: datetime, end: datetime) -> List[dict]:
+        if tier not in RollupTiers:
+            raise ValueError(F"Unknown rollup tier {tier}")
+        rows = self.Query(F"SELECT * FROM {tier} WHERE Bucket >= ? AND Bucket <= ? ORDER BY Bucket", (ToEpoch(start), ToEpoch(end)))
+        rollups = []
+        for row in rows:
+            rollup = dict(row)
+            rollup["Time"] = datetime.fromtimestamp(rollup.pop("Bucket"), timezone.utc).isoformat()
+            rollups.append(rollup)
+        return rollups
+
+    def Gaps(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        # Stretches of at least GapMinutes without an observation.
+        maxGap = self.Settings.GapMinutes * 60
+        times = [row[0] for row in self.Query("SELECT Time FROM Observations WHERE Time >= ? AND Time <= ? ORDER BY Time", (ToEpoch(start), ToEpoch(end)))]
+        edges = [ToEpoch(start)] + times + [ToEpoch(end)]
+        return [(datetime.fromtimestamp(a, timezone.utc), datetime.fromtimestamp(b, timezone.utc)) for a, b in zip(edges, edges[1:]) if b - a >= maxGap]
+
+    def Stats(self) -> dict:
+        stats = {}
+        for table in ["Observations"] + RollupTiers:
+            row = self.Query(F"SELECT COUNT(*), MIN(rowid), MAX(rowid) FROM {table}", ())[0]
+            stats[table] = {
+                "Rows": row[0],
+                "Oldest": datetime.fromtimestamp(row[1], timezone.utc).isoformat() if row[1] is not None else None,
+                "Newest": datetime.fromtimestamp(row[2], timezone.utc).isoformat() if row[2] is not None else None,
+            }
+        stats["Bytes"] = sum(os.path.getsize(p) for p in (self.Path, self.Path + "-wal") if os.path.exists(p))
+        return stats
+
+    def Close(self):
+        self.Executor.shutdown(wait=True)
+        with self.Lock:
+            self.Connection.close()
@@ -0,0 +1,122 @@
+﻿import logging, threading, time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+class CacheEntry:
+    def __init__(self):
+        self.Value: Any = None
+        self.HasValue = False
+        self.FetchedAt = 0.0
+        self.Error: Optional[Exception] = None
+        self.RetryAt = 0.0
+        self.IsRevalidating = False
+        self.FetchLock = threading.Lock()
+
+class ResponseCache:
+    # Shared TTL cache for service responses. Keys are tuples starting with the endpoint name, which the counters are grouped by.
+    def __init__(self, maxEntries: int = 256):
+        self.Log = logging.getLogger("ResponseCache")
+        self.MaxEntries = maxEntries
+        self.Entries: dict[tuple, CacheEntry] = {}
+        self.Counters: dict[str, dict[str, int]] = {}
+        self.Lock = threading.Lock()
+        self.Executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="CacheRevalidate")
+
+    def Get(self, key: tuple, fetch: Callable[[], Any], ttl: float, staleSeconds: float = 0, errorSeconds: float = 0) -> Any:
+        endpoint = key[0]
+        with self.Lock:
+            entry = self.Entries.get(key)
+            if entry is None:
+                self.Prune()
+                entry = self.Entries[key] = CacheEntry()
+
+            result = self.Lookup(entry, endpoint, ttl, staleSeconds)
+            if result is not None:
+                return result[0]
+
+            if entry.HasValue and time.monotonic() - entry.FetchedAt < ttl + staleSeconds:
+                # Serve the stale response now and fetch a new one in the background.
+                self.Count(endpoint, "StaleHits")
+                if not entry.IsRevalidating:
+                    entry.IsRevalidating = True
+                    self.Executor.submit(self.Revalidate, key, entry, fetch, errorSeconds)
+                return entry.Value
+
+        with entry.FetchLock:
+            # Another caller may have fetched it while this one waited.
+            with self.Lock:
+                result = self.Lookup(entry, endpoint, ttl, staleSeconds)
+                if result is not None:
+                    return result[0]
+                self.Count(endpoint, "Misses")
+            return self.Fetch(key, entry, fetch, errorSeconds)
+
+    def Lookup(self, entry: CacheEntry, endpoint: str, ttl: float, staleSeconds: float) -> Optional[tuple[Any]]:
+        now = time.monotonic()
+        if entry.HasValue and now - entry.FetchedAt < ttl:
+            self.Count(endpoint, "Hits")
+            return (entry.Value,)
+        if now < entry.RetryAt:
+            # The last fetch failed recently, so do not call the endpoint again yet.
+            self.Count(endpoint, "NegativeHits")
+            if entry.HasValue and now - entry.FetchedAt < ttl + staleSeconds:
+                return (entry.Value,)
+            raise entry.Error
+        return None
+
+    def Fetch(self, key: tuple, entry: CacheEntry, fetch: Callable[[], Any], errorSeconds: float) -> Any:
+        try:
+            value = fetch()
+        except Exception as ex:
+            with self.Lock:
+                self.Count(key[0], "Errors")
+                entry.Error = ex
+                entry.RetryAt = time.monotonic() + errorSeconds
+            raise
+
+        with self.Lock:
+            entry.Value = value
+            entry.HasValue = True
+            entry.FetchedAt = time.monotonic()
+            entry.Error = None
+            entry.RetryAt = 0.0
+        return value
+
+    def Revalidate(self, key: tuple, entry: CacheEntry, fetch: Callable[[], Any], errorSeconds: float):
+        try:
+            with entry.FetchLock:
+                with self.Lock:
+                    self.Count(key[0], "Revalidations")
+                self.Fetch(key, entry, fetch, errorSeconds)
+        except Exception as ex:
+            self.Log.warning(F"Revalidating {key[0]} failed: {ex}")
+        finally:
+            entry.IsRevalidating = False
+
+    def Prune(self):
+        if len(self.Entries) < self.MaxEntries:
+            return
+        # Drop the least recently fetched half; they are far past any TTL on a display that polls every few minutes.
+        stale = sorted(self.Entries.items(), key=lambda kv: kv[1].FetchedAt)[:len(self.Entries) // 2]
+        for key, entry in stale:
+            if not entry.IsRevalidating:
+                del self.Entries[key]
+
+    def Invalidate(self, endpoint: Optional[str] = None):
+        with self.Lock:
+            for key in [k for k in self.Entries if endpoint is None or k[0] == endpoint]:
+                del self.Entries[key]
+
+    def Count(self, endpoint: str, counter: str):
+        counters = self.Counters.get(endpoint)
+        if counters is None:
+            counters = self.Counters[endpoint] = {"Hits": 0, "StaleHits": 0, "NegativeHits": 0, "Misses": 0, "Errors": 0, "Revalidations": 0}
+        counters[counter] += 1
+
+    def Stats(self) -> dict:
+        with self.Lock:
+            return {
+                "Entries": len(self.Entries),
+                "Endpoints": {endpoint: dict(counters) for endpoint, counters in self.Counters.items()},
+            }
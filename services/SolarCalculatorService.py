@@ -0,0 +1,147 @@
+﻿import logging, math, threading
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from config.WeatherConfig import WeatherConfig
+
+from data.SunData import *
+
+# Zenith angles (degrees) for the NOAA sunrise/sunset and twilight definitions.
+SunriseZenith = 90.833
+CivilZenith = 96.0
+NauticalZenith = 102.0
+AstronomicalZenith = 108.0
+
+def JulianDay(date: datetime) -> float:
+    year = date.year
+    month = date.month
+    day = date.day
+    if (month <= 2):
+        year -= 1
+        month += 12
+    a = year // 100
+    b = 2 - a + a // 4
+    return math.floor(365.25 * (year + 4716)) + math.floor(30.6001 * (month + 1)) + day + b - 1524.5
+
+def JulianCentury(julianDay: float) -> float:
+    return (julianDay - 2451545.0) / 36525.0
+
+def SolarParameters(jc: float) -> tuple[float, float]:
+    # Returns (declination in degrees, equation of time in minutes) per the NOAA solar calculator.
+    meanLongitude = (280.46646 + jc * (36000.76983 + jc * 0.0003032)) % 360
+    meanAnomaly = 357.52911 + jc * (35999.05029 - 0.0001537 * jc)
+    eccentricity = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    anomalyRad = math.radians(meanAnomaly)
+
+    centerEquation = (math.sin(anomalyRad) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+                      + math.sin(2 * anomalyRad) * (0.019993 - 0.000101 * jc)
+                      + math.sin(3 * anomalyRad) * 0.000289)
+    trueLongitude = meanLongitude + centerEquation
+    omega = math.radians(125.04 - 1934.136 * jc)
+    apparentLongitude = trueLongitude - 0.00569 - 0.00478 * math.sin(omega)
+
+    meanObliquity = 23 + (26 + (21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))) / 60) / 60
+    obliquity = meanObliquity + 0.00256 * math.cos(omega)
+    obliquityRad = math.radians(obliquity)
+
+    declination = math.degrees(math.asin(math.sin(obliquityRad) * math.sin(math.radians(apparentLongitude))))
+
+    y = math.tan(obliquityRad / 2) ** 2
+    longitudeRad = math.radians(meanLongitude)
+    equationOfTime = 4 * math.degrees(
+        y * math.sin(2 * longitudeRad)
+        - 2 * eccentricity * math.sin(anomalyRad)
+        + 4 * eccentricity * y * math.sin(anomalyRad) * math.cos(2 * longitudeRad)
+        - 0.5 * y * y * math.sin(4 * longitudeRad)
+        - 1.25 * eccentricity * eccentricity * math.sin(2 * anomalyRad))
+
+    return (declination, equationOfTime)
+
+def HourAngle(latitude: float, declination: float, zenith: float) -> Optional[float]:
+    latitudeRad = math.radians(latitude)
+    declinationRad = math.radians(declination)
+    cosHourAngle = (math.cos(math.radians(zenith)) / (math.cos(latitudeRad) * math.cos(declinationRad))
+                    - math.tan(latitudeRad) * math.tan(declinationRad))
+    if (cosHourAngle < -1 or cosHourAngle > 1):
+        return None
+    return math.degrees(math.acos(cosHourAngle))
+
+class SolarCalculatorService:
+    def __init__(self, config: WeatherConfig, maxCachedDays: int = 32):
+        self.Log = logging.getLogger("SolarCalculatorService")
+        self.Config = config
+        self.MaxCachedDays = maxCachedDays
+        self.DailyCache: OrderedDict = OrderedDict()
+        # GetSunData is called from the current-data source pool and the fetch worker at the same time.
+        self.CacheLock = threading.Lock()
+
+    def GetSunData(self, latitude: float, longitude: float, date: datetime) -> SunData:
+        yesterday = self.QuerySunData(latitude, longitude, date - timedelta(days=1))
+        today = self.QuerySunData(latitude, longitude, date)
+        tomorrow = self.QuerySunData(latitude, longitude, date + timedelta(days=1))
+
+        return SunData(
+            today=today,
+            tomorrow=tomorrow,
+            yesterday=yesterday,
+            latitude=latitude
+        )
+
+    def QuerySunData(self, latitude: float, longitude: float, date: datetime) -> DailySunTimes:
+        date_str = date.strftime("%Y%m%d")
+        key = (date_str, round(latitude, 3), round(longitude, 3))
+
+        with self.CacheLock:
+            cached = self.DailyCache.get(key)
+            if cached is not None:
+                self.DailyCache.move_to_end(key)
+                return cached
+
+        julianDay = JulianDay(date)
+        solarNoon = self.CalculateSolarNoon(julianDay, longitude)
+
+        sunTimes = DailySunTimes(
+            Sunrise=self.CalculateEvent(date, julianDay, latitude, longitude, SunriseZenith, True),
+            Sunset=self.CalculateEvent(date, julianDay, latitude, longitude, SunriseZenith, False),
+            SolarNoon=self.ToLocalNaive(date, solarNoon),
+            CivilTwilightBegin=self.CalculateEvent(date, julianDay, latitude, longitude, CivilZenith, True),
+            CivilTwilightEnd=self.CalculateEvent(date, julianDay, latitude, longitude, CivilZenith, False),
+            NauticalTwilightBegin=self.CalculateEvent(date, julianDay, latitude, longitude, NauticalZenith, True),
+            NauticalTwilightEnd=self.CalculateEvent(date, julianDay, latitude, longitude, NauticalZenith, False),
+            AstronomicalTwilightBegin=self.CalculateEvent(date, julianDay, latitude, longitude, AstronomicalZenith, True),
+            AstronomicalTwilightEnd=self.CalculateEvent(date, julianDay, latitude, longitude, AstronomicalZenith, False),
+            Latitude=latitude
+        )
+
+        with self.CacheLock:
+            self.DailyCache[key] = sunTimes
+            while len(self.DailyCache) > self.MaxCachedDays:
+                self.DailyCache.popitem(last=False)
+        return sunTimes
+
+    def CalculateSolarNoon(self, julianDay: float, longitude: float) -> float:
+        # Minutes after 00:00 UTC, refined with the equation of time at the estimated noon.
+        noon = 720 - 4 * longitude
+        for _ in range(2):
+            declination, equationOfTime = SolarParameters(JulianCentury(julianDay + noon / 1440.0))
+            noon = 720 - 4 * longitude - equationOfTime
+        return noon
+
+    def CalculateEvent(self, date: datetime, julianDay: float, latitude: float, longitude: float, zenith: float, isRising: bool) -> Optional[datetime]:
+        minutes = 720 - 4 * longitude
+        for _ in range(2):
+            declination, equationOfTime = SolarParameters(JulianCentury(julianDay + minutes / 1440.0))
+            hourAngle = HourAngle(latitude, declination, zenith)
+            if (hourAngle is None):
+                return None
+            if (not isRising):
+                hourAngle = -hourAngle
+            minutes = 720 - 4 * (longitude + hourAngle) - equationOfTime
+
+        return self.ToLocalNaive(date, minutes)
+
+    def ToLocalNaive(self, date: datetime, minutesUtc: float) -> datetime:
+        midnightUtc = datetime(date.year, date.month, date.day, tzinfo=timezone.utc)
+        return (midnightUtc + timedelta(minutes=minutesUtc)).astimezone().replace(tzinfo=None, microsecond=0)
@@ -1,5 +1,6 @@
-﻿import logging, requests
+﻿import logging, threading
 
+from collections import OrderedDict
 from dateutil import parser
 from datetime import datetime, timedelta
 
@@ -7,12 +8,18 @@ from config.WeatherConfig import WeatherConfig
 
 from data.SunData import *
 
+from .HttpClient import HttpClient
+
 class SunriseSunsetService:
-    def __init__(self, config: WeatherConfig):
+    def __init__(self, config: WeatherConfig, maxCachedDays: int = 32, http: HttpClient = None):
         self.Log = logging.getLogger("SunriseSunsetService")
         self.Config = config
+        self.Http = http or HttpClient(config)
         self.AstroTimesUrl = "https://api.sunrise-sunset.org/json"
-        self.DailyCache = {}
+        self.MaxCachedDays = maxCachedDays
+        self.DailyCache: OrderedDict = OrderedDict()
+        # GetSunData is called from the current-data source pool and the fetch worker at the same time.
+        self.CacheLock = threading.Lock()
 
     def GetSunData(self, latitude: float, longitude: float, date: datetime) -> SunData:
         yesterday = self.QuerySunData(latitude, longitude, date - timedelta(days=1))
@@ -30,8 +37,11 @@ class SunriseSunsetService:
         date_str = date.strftime("%Y%m%d")
         key = (date_str, round(latitude, 3), round(longitude, 3))
 
-        if key in self.DailyCache:
-            return self.DailyCache[key]
+        with self.CacheLock:
+            cached = self.DailyCache.get(key)
+            if cached is not None:
+                self.DailyCache.move_to_end(key)
+                return cached
 
         localTimezone = datetime.now().astimezone().tzinfo
         tzid = getattr(localTimezone, "key", None) or str(localTimezone)
@@ -42,7 +52,7 @@ class SunriseSunsetService:
             "formatted": 0,
             "tzid": tzid
         }
-        response = requests.get(self.AstroTimesUrl, params=params)
+        response = self.Http.Get(self.AstroTimesUrl, params=params)
         response.raise_for_status()
         results = response.json()["results"]
 
@@ -61,5 +71,8 @@ class SunriseSunsetService:
             AstronomicalTwilightEnd=to_local_naive(results["astronomical_twilight_end"]),
         )
 
-        self.DailyCache[key] = sunTimes
+        with self.CacheLock:
+            self.DailyCache[key] = sunTimes
+            while len(self.DailyCache) > self.MaxCachedDays:
+                self.DailyCache.popitem(last=False)
         return sunTimes
@@ -1,4 +1,4 @@
-﻿import logging, requests
+﻿import logging
 from datetime import datetime, timedelta
 
 from config.IconType import IconType
@@ -7,64 +7,56 @@ from config.WeatherConfig import WeatherConfig
 
 from data.CurrentData import *
 from data.ForecastData import *
-from services.SunriseSunsetService import SunriseSunsetService
+
+from .HttpClient import HttpClient
+from .ResponseCache import ResponseCache
 
 class WeatherAPIService:
-    def __init__(self, config: WeatherConfig, sunriseSunsetService: SunriseSunsetService):
+    def __init__(self, config: WeatherConfig, sunService, cache: ResponseCache = None, http: HttpClient = None):
         self.Log = logging.getLogger("WeatherAPIService")
         self.Config = config
         self.CurrentUrl = "http://api.weatherapi.com/v1/current.json"
         self.ForecastUrl = "http://api.weatherapi.com/v1/forecast.json"
         self.AlertUrl = "http://api.weatherapi.com/v1/alerts.json"
         self.AstronomyUrl = "http://api.weatherapi.com/v1/astronomy.json"
-        self.LastWeatherAPICurrentData = None
-        self.LastWeatherAPIUpdate:Optional[datetime] = None
-        self.SunriseSunsetService = sunriseSunsetService
-        self.LastAlertUpdate: Optional[datetime] = None
-        self.LastWeatherAPIAlerts = None
-        self.LastAstronomyUpdate: Optional[datetime] = None
-        self.LastAstronomyData = None
-        
+        self.SunService = sunService
+        self.Cache = cache or ResponseCache()
+        self.Http = http or HttpClient(config)
+
+    def Cached(self, endpoint: str, ttl: int, query, *params):
+        settings = self.Config.Services.WeatherAPI
+        key = (F"WeatherAPI.{endpoint}", settings.Key, self.Config.Weather.Location, *params)
+        return self.Cache.Get(key, query, ttl, settings.StaleSeconds, settings.ErrorCacheSeconds)
 
     def GetCurrentData(self):
-        #Rate Limit = 15 minutes
-        if (self.LastWeatherAPIUpdate is None or self.LastWeatherAPIUpdate + timedelta(minutes=15) > datetime.now()):
-            self.LastWeatherAPIUpdate = datetime.now()
-            self.LastWeatherAPICurrentData = self.ParseCurrentData(self.QueryCurrentData())
-        return self.LastWeatherAPICurrentData
+        return self.ParseCurrentData(self.Cached("Current", self.Config.Services.WeatherAPI.CurrentCacheSeconds, self.QueryCurrentData))
 
     def GetAstronomyData(self):
-        if (self.LastAstronomyUpdate is None or self.LastAstronomyUpdate.date() != datetime.now().date()):
-            self.LastAstronomyUpdate = datetime.now()
-            self.LastAstronomyData = self.QueryAstronomyData()
-
-        return self.LastAstronomyData
+        date = datetime.now().strftime("%Y-%m-%d")
+        return self.Cached("Astronomy", self.Config.Services.WeatherAPI.AstronomyCacheSeconds, lambda: self.QueryAstronomyData(date), date)
 
     def GetAlertData(self):
-        if (self.LastAlertUpdate is None or self.LastAlertUpdate + timedelta(minutes=15) > datetime.now()):
-            self.LastAlertUpdate = datetime.now()
-            self.LastWeatherAPIAlerts = self.QueryAlertData()
-        return self.LastWeatherAPIAlerts
+        return self.Cached("Alerts", self.Config.Services.WeatherAPI.AlertsCacheSeconds, self.QueryAlertData)
 
     def GetForecastData(self):
-        return self.ParseForecastData(self.QueryForecastData())
+        return self.ParseForecastData(self.Cached("Forecast", self.Config.Services.WeatherAPI.ForecastCacheSeconds, self.QueryForecastData))
 
     def QueryCurrentData(self):
         params = {
             "key": self.Config.Services.WeatherAPI.Key,
             "q": self.Config.Weather.Location
         }
-        response = requests.get(self.CurrentUrl, params=params)
+        response = self.Http.Get(self.CurrentUrl, params=params)
         response.raise_for_status()
         return response.json()
 
-    def QueryAstronomyData(self):
+    def QueryAstronomyData(self, date: str):
         params = {
             "key": self.Config.Services.WeatherAPI.Key,
             "q": self.Config.Weather.Location,
-            "dt": datetime.now().strftime("%Y-%m-%d")
+            "dt": date
         }
-        response = requests.get(self.AstronomyUrl, params=params)
+        response = self.Http.Get(self.AstronomyUrl, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -73,7 +65,7 @@ class WeatherAPIService:
             "key": self.Config.Services.WeatherAPI.Key,
             "q": self.Config.Weather.Location
         }
-        response = requests.get(self.AlertUrl, params=params)
+        response = self.Http.Get(self.AlertUrl, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -85,7 +77,7 @@ class WeatherAPIService:
             "aqi": "no",
             "alerts": "yes"
         }
-        response = requests.get(self.ForecastUrl, params=params)
+        response = self.Http.Get(self.ForecastUrl, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -112,7 +104,7 @@ class WeatherAPIService:
 
         latitude = location["lat"]
         longitude = location["lon"]
-        sunData = self.SunriseSunsetService.GetSunData(latitude, longitude, observedLocal)
+        sunData = self.SunService.GetSunData(latitude, longitude, observedLocal)
         sunAngle = sunData.GetDegreesAboveHorizon(observedLocal)
 
         alerts = self.GetAlertData()
@@ -203,7 +195,7 @@ class WeatherAPIService:
         hourly = []
         for hour in Next24HourForecast:
             hour_time = datetime.strptime(hour["time"], "%Y-%m-%d %H:%M")
-            sun_data = self.SunriseSunsetService.GetSunData(Latitude, Longitude, hour_time)
+            sun_data = self.SunService.GetSunData(Latitude, Longitude, hour_time)
             sun_angle = sun_data.GetDegreesAboveHorizon(hour_time)
             condition_text = hour["condition"]["text"].lower()
 
@@ -1,26 +1,101 @@
-﻿import logging
-import requests
+﻿import logging, os, threading
 
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from datetime import datetime, timedelta, timezone
+from time import monotonic, perf_counter
+from typing import Callable, Optional
 
+from .HttpClient import HttpClient
+from .ObservationDatabase import ObservationDatabase
+from .ResponseCache import ResponseCache
 from .WeatherAPIService import WeatherAPIService
 from .WeatherUndergroundService import WeatherUndergroundService
 from .SunriseSunsetService import SunriseSunsetService
+from .SolarCalculatorService import SolarCalculatorService
 
 from config.WeatherConfig import WeatherConfig
 
 from data.CurrentData import CurrentData
 from data.ForecastData import *
-from data.HistoryData import HistoryData
+from data.HistoryData import HistoryData, HistoryLine
+from data.HistoryStore import LineTimestamp
 from data.SunData import *
 
+class SourceMetrics:
+    def __init__(self, samples: int = 64):
+        self.Requests = 0
+        self.Timeouts = 0
+        self.Errors = 0
+        self.Latencies: deque[float] = deque(maxlen=samples)
+
+    def Stats(self) -> dict:
+        latencies = sorted(self.Latencies)
+        return {
+            "Requests": self.Requests,
+            "Timeouts": self.Timeouts,
+            "Errors": self.Errors,
+            "P50Ms": round(latencies[len(latencies) // 2], 1) if latencies else 0.0,
+            "MaxMs": round(latencies[-1], 1) if latencies else 0.0,
+        }
+
 class WeatherService:
     def __init__(self, config: WeatherConfig):
         self.Log = logging.getLogger("WeatherService")
         self.Config = config
-        self.SunriseSunsetService = SunriseSunsetService(config)
-        self.WeatherAPIService = WeatherAPIService(config, self.SunriseSunsetService)
-        self.WeatherUndergroundService = WeatherUndergroundService(config, self.SunriseSunsetService)
+        self.SourceExecutor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="CurrentSource")
+        self.SourceFutures: dict[str, Future] = {}
+        self.SourceMetrics: dict[str, SourceMetrics] = {}
+        self.LastGoodCurrent: dict[str, CurrentData] = {}
+        self.SourceLock = threading.Lock()
+        self.Http = HttpClient(config)
+        self.ResponseCache = ResponseCache()
+        self.SunriseSunsetService = SunriseSunsetService(config, http=self.Http)
+        self.SolarCalculatorService = SolarCalculatorService(config)
+        self.WeatherAPIService = WeatherAPIService(config, self, self.ResponseCache, self.Http)
+        self.WeatherUndergroundService = WeatherUndergroundService(config, self, self.ResponseCache, self.Http)
+        self.Observations: Optional[ObservationDatabase] = None
+        if config.Services.Observations.Enabled:
+            self.Observations = ObservationDatabase(os.path.join(config._basePath, "assets", "observations.db"), config.Services.Observations)
+        # Everything before this has been asked for already; gaps left there are outages the provider has no data for either.
+        self.BackfilledUntil: Optional[datetime] = None
+
+    def Stats(self) -> dict:
+        return {
+            "Http": self.Http.Stats(),
+            "Cache": self.ResponseCache.Stats(),
+            "Sources": {source: metrics.Stats() for source, metrics in list(self.SourceMetrics.items())},
+            "Observations": self.Observations.Stats() if self.Observations is not None else None,
+        }
+
+    def CurrentSource(self, source: str) -> Optional[tuple[Callable[[], CurrentData], float]]:
+        match source:
+            case "WeatherAPI":
+                return (self.WeatherAPIService.GetCurrentData, self.Config.Services.WeatherAPI.DeadlineSeconds)
+            case "WeatherUnderground":
+                return (self.WeatherUndergroundService.GetCurrentData, self.Config.Services.WeatherUnderground.DeadlineSeconds)
+        return None
+
+    def FetchSource(self, source: str, fetch: Callable[[], CurrentData]) -> CurrentData:
+        start = perf_counter()
+        try:
+            data = fetch()
+            if data is None:
+                # Services report a failed request by returning None; it counts and falls back like an exception.
+                raise ValueError(F"{source} returned no data")
+        except Exception:
+            with self.SourceLock:
+                self.SourceMetrics[source].Errors += 1
+            raise
+        finally:
+            with self.SourceLock:
+                self.SourceMetrics[source].Latencies.append((perf_counter() - start) * 1000)
+
+        # Stored even when it arrives after the deadline, so the next cycle can use it.
+        if data:
+            with self.SourceLock:
+                self.LastGoodCurrent[source] = data
+        return data
 
     def GetCurrentData(self) -> CurrentData:
         selections = self.Config.Services.Selections.Current
@@ -29,16 +104,41 @@ class WeatherService:
 
         combined_data = CurrentData()
 
+        # Every source is fetched at once; each gets its own deadline measured from the same start.
+        start = monotonic()
+        futures: dict[str, tuple[Future, float]] = {}
         for source in selections:
-            match source:
-                case "WeatherAPI":
-                    new_data = self.WeatherAPIService.GetCurrentData()
-                case "WeatherUnderground":
-                    new_data = self.WeatherUndergroundService.GetCurrentData()
-                case _:
-                    self.Log.warn(f"Unknown weather source: {source}")
-                    continue
-
+            selected = self.CurrentSource(source)
+            if selected is None:
+                self.Log.warn(f"Unknown weather source: {source}")
+                continue
+
+            fetch, deadline = selected
+            with self.SourceLock:
+                metrics = self.SourceMetrics.setdefault(source, SourceMetrics())
+                metrics.Requests += 1
+            future = self.SourceFutures.get(source)
+            if future is None or future.done():
+                future = self.SourceFutures[source] = self.SourceExecutor.submit(self.FetchSource, source, fetch)
+            futures[source] = (future, deadline)
+
+        results: dict[str, CurrentData] = {}
+        for source, (future, deadline) in futures.items():
+            try:
+                results[source] = future.result(timeout=max(0.0, deadline - (monotonic() - start)))
+            except TimeoutError:
+                with self.SourceLock:
+                    self.SourceMetrics[source].Timeouts += 1
+                    results[source] = self.LastGoodCurrent.get(source)
+                self.Log.warning(f"{source} did not answer within {deadline}s, using its last values.")
+            except Exception as ex:
+                with self.SourceLock:
+                    results[source] = self.LastGoodCurrent.get(source)
+                self.Log.warning(f"{source} failed, using its last values: {ex}")
+
+        # Merged in selection order, so later sources overlay earlier ones as before.
+        for source in futures:
+            new_data = results.get(source)
             if new_data:
                 for field in new_data.__dataclass_fields__:
                     value = getattr(new_data, field)
@@ -60,17 +160,69 @@ class WeatherService:
         return None
 
     def GetHistoryData(self) -> HistoryData:
+        if self.Observations is None:
+            return self.FetchHistoryData()
+
+        # Served from the observation database; the network is only asked when part of the display's 26 hour window is missing.
+        now = datetime.now(timezone.utc)
+        start = now - timedelta(hours=26)
+        gaps = self.Observations.Gaps(start, now)
+        if self.BackfilledUntil is not None:
+            # Only the part of a gap after the last backfill can have new data, and it is worth asking once it spans GapMinutes.
+            minimum = timedelta(minutes=self.Config.Services.Observations.GapMinutes)
+            gaps = [(max(a, self.BackfilledUntil), b) for a, b in gaps if b - max(a, self.BackfilledUntil) >= minimum]
+        if gaps and self.HistorySource() is not None:
+            self.Log.info(F"Backfilling {len(gaps)} gaps in stored history, starting {gaps[0][0].astimezone():%Y-%m-%d %H:%M}.")
+            try:
+                fetched = self.FetchHistoryData()
+                if fetched is not None:
+                    # Rows already stored are left alone; only lines that fall inside a gap are written.
+                    pending = self.Observations.Append(l for l in fetched.Store.Iterate() if self.InGaps(LineTimestamp(l), gaps))
+                    if pending is not None:
+                        # This is the fetch worker, so waiting for the writer thread is fine, and the range read below then sees the rows.
+                        pending.result()
+                self.BackfilledUntil = now
+            except Exception as ex:
+                # With nothing stored there is nothing to show, so let the caller retry.
+                if not self.Observations.Range(start, now):
+                    raise
+                self.Log.warning(F"History backfill failed, using stored observations only: {ex}")
+
+        history = HistoryData()
+        history.Store.Extend(self.Observations.Range(start, now))
+        return history
+
+    def InGaps(self, timestamp: Optional[datetime], gaps: list[tuple[datetime, datetime]]) -> bool:
+        if timestamp is None:
+            return False
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return any(a < timestamp < b for a, b in gaps)
+
+    def RecordObservation(self, line: HistoryLine):
+        if self.Observations is not None:
+            self.Observations.Append([line])
+
+    def HistorySource(self) -> Optional[Callable[[], HistoryData]]:
         match self.Config.Services.Selections.History:
             case "WeatherUnderground":
-                return self.WeatherUndergroundService.GetHistoryData()
+                return self.WeatherUndergroundService.GetHistoryData
+        return None
+
+    def FetchHistoryData(self) -> HistoryData:
+        source = self.HistorySource()
+        if source is not None:
+            return source()
 
-        self.Log.warn(F"Current API Selection for HistoryData was {self.Config.Services.Seletions.History}, but that service is not configured.")
+        self.Log.warn(F"Current API Selection for HistoryData was {self.Config.Services.Selections.History}, but that service is not configured.")
         return None
 
     def GetSunData(self, latitude, longitude, date: datetime) -> SunData:
         match self.Config.Services.Selections.Sun:
             case "SunriseSunset":
                 return self.SunriseSunsetService.GetSunData(latitude, longitude, date)
+            case "SolarCalculator":
+                return self.SolarCalculatorService.GetSunData(latitude, longitude, date)
 
         self.Log.warn(F"Current API Selection for SunData was {self.Config.Services.Selections.Sun}, but that service is not configured for this operation.")
         return None
@@ -9,7 +9,9 @@ from config.SettingsEnums import *
 from data.CurrentData import CurrentData
 from data.HistoryData import HistoryData, HistoryLine
 from data.WeatherConditions import WeatherConditions
-from services.SunriseSunsetService import SunriseSunsetService
+
+from .HttpClient import HttpClient
+from .ResponseCache import ResponseCache
 
 def f_to_c(f:float) -> float: return (f - 32) * 5.0 / 9.0 if f is not None else None
 def inhg_to_mb(hg:float) -> float: return hg * 33.8639 if hg is not None else None
@@ -18,18 +20,43 @@ def miles_to_km(mi:int) -> int: return mi * 1.60934 if mi is not None else None
 def in_to_mm(inch:float) -> float: return inch * 25.4 if inch is not None else None
 
 class WeatherUndergroundService:
-    def __init__(self, config: WeatherConfig, sunriseSunsetService: SunriseSunsetService):
+    def __init__(self, config: WeatherConfig, sunService, cache: ResponseCache = None, http: HttpClient = None):
         self.Log = logging.getLogger("WeatherUndergroundService")
         self.StationUrl = "https://api.weather.com/v2/pws/observations/current"
         self.StationHistoryUrl = "https://api.weather.com/v2/pws/history/all"
         self.Config = config
-        self.SunriseSunsetService = sunriseSunsetService
+        self.SunService = sunService
+        self.Cache = cache or ResponseCache()
+        self.Http = http or HttpClient(config)
+
+    def IsConfigured(self) -> bool:
+        if not self.Config.Services.WeatherUnderground.Key or not self.Config.Weather.StationCode:
+            self.Log.debug("WUnderground station data not configured.")
+            return False
+        return True
+
+    def Cached(self, endpoint: str, ttl: int, query, *params):
+        settings = self.Config.Services.WeatherUnderground
+        key = (F"WeatherUnderground.{endpoint}", settings.Key, self.Config.Weather.StationCode, *params)
+        return self.Cache.Get(key, query, ttl, settings.StaleSeconds, settings.ErrorCacheSeconds)
 
     def GetCurrentData(self) -> CurrentData:
-        return self.ParseStationData(self.QueryStationData())
+        if not self.IsConfigured():
+            return None
+
+        try:
+            data = self.Cached("Observations", self.Config.Services.WeatherUnderground.ObservationCacheSeconds, self.QueryStationData)
+        except requests.RequestException as e:
+            self.Log.warn(f"Failed to fetch WUnderground station data: {e}")
+            return None
+        return self.ParseStationData(data)
 
     def GetHistoryData(self) -> HistoryData:
-        return self.ParseHistoryData(self.QueryHistoryData())
+        if not self.IsConfigured():
+            return self.ParseHistoryData(None)
+
+        hour = datetime.now().strftime("%Y%m%d%H")
+        return self.ParseHistoryData(self.Cached("History", self.Config.Services.WeatherUnderground.HistoryCacheSeconds, self.QueryHistoryData, hour))
 
     def GetWind(self, wind: float) -> float:
         if (wind is None): return None
@@ -86,7 +113,7 @@ class WeatherUndergroundService:
                 gust = self.GetWind(imperial.get("windgustAvg"))
                 wind = self.GetWind(imperial.get("windspeedAvg"))
 
-                sunData = self.SunriseSunsetService.GetSunData(obs.get("lat"), obs.get("lon"), timestampLocal) if obs.get("lat") and obs.get("lon") else None
+                sunData = self.SunService.GetSunData(obs.get("lat"), obs.get("lon"), timestampLocal) if obs.get("lat") and obs.get("lon") else None
                 sunAngle = sunData.GetDegreesAboveHorizon(timestampLocal) if sunData else None
 
                 conditions = WeatherConditions(
@@ -115,7 +142,7 @@ class WeatherUndergroundService:
                     Conditions=conditions
                 )
 
-                history.Lines.append(entry)
+                history.Store.Append(entry)
 
             except Exception as e:
                 self.Log.warning(f"Failed to parse observation: {e}")
@@ -136,7 +163,7 @@ class WeatherUndergroundService:
 
         lat = obs.get("lat")
         lon = obs.get("lon")
-        sunData = self.SunriseSunsetService.GetSunData(lat, lon, timestampLocal)
+        sunData = self.SunService.GetSunData(lat, lon, timestampLocal)
         sunAngle = sunData.GetDegreesAboveHorizon(timestampLocal)
 
         temp = self.GetTemperature(imperial.get("temp"))
@@ -178,10 +205,6 @@ class WeatherUndergroundService:
 
 
     def QueryStationData(self):
-        if not self.Config.Services.WeatherUnderground.Key or not self.Config.Weather.StationCode:
-            self.Log.debug("WUnderground station data not configured.")
-            return None
-
         params = {
             "apiKey": self.Config.Services.WeatherUnderground.Key,
             "stationId": self.Config.Weather.StationCode,
@@ -190,19 +213,11 @@ class WeatherUndergroundService:
             "numericPrecision": "decimal"
         }
 
-        try:
-            response = requests.get(self.StationUrl, params=params,headers={'Cache-Control': 'no-cache', "Pragma": 'no-cache'})
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            self.Log.warn(f"Failed to fetch WUnderground station data: {e}")
-            return None
+        response = self.Http.Get(self.StationUrl, params=params,headers={'Cache-Control': 'no-cache', "Pragma": 'no-cache'})
+        response.raise_for_status()
+        return response.json()
 
     def QueryHistoryData(self):
-        if not self.Config.Services.WeatherUnderground.Key or not self.Config.Weather.StationCode:
-            self.Log.debug("WUnderground station data not configured.")
-            return None
-
         now = datetime.now()
         nowUtc = datetime.now(timezone.utc)
         yesterday = now - timedelta(days=1)
@@ -230,7 +245,7 @@ class WeatherUndergroundService:
                 tries = 0
 
                 while (not isDayDone and tries < 3):
-                    response = requests.get(self.StationHistoryUrl, params=params, headers=headers)
+                    response = self.Http.Get(self.StationHistoryUrl, params=params, headers=headers)
                     response.raise_for_status()
                     data = response.json()
                     tries += 1
@@ -1,4 +1,8 @@
+﻿from .HttpClient import HttpClient
+from .ObservationDatabase import ObservationDatabase
+from .ResponseCache import ResponseCache
 from .WeatherService import WeatherService
 from .WeatherAPIService import WeatherAPIService
 from .WeatherUndergroundService import WeatherUndergroundService
 from .SunriseSunsetService import SunriseSunsetService
+from .SolarCalculatorService import SolarCalculatorService
@@ -0,0 +1,44 @@
+﻿import unittest
+
+from datetime import datetime, timedelta, timezone
+
+from core.elements.TemperatureGraphElement import TemperatureGraphElement
+from core.store import TemperatureGraphStore
+from data.HistoryData import HistoryLine
+from data.HistoryStore import HistoryStore
+from data.WeatherConditions import WeatherConditions
+
+def Store(temp: float, now: datetime) -> HistoryStore:
+    store = HistoryStore()
+    for minutes in (50, 40, 30):
+        observed = (now - timedelta(minutes=minutes)).astimezone(timezone.utc)
+        store.Append(HistoryLine(ObservedTimeUtc=observed, CurrentTemp=temp, Conditions=WeatherConditions(time=observed)))
+    return store
+
+class TestUpdateHourlyTemps(unittest.TestCase):
+    def setUp(self):
+        # UpdateHourlyTemps only reads its arguments, so the element needs no canvas.
+        self.Element = TemperatureGraphElement.__new__(TemperatureGraphElement)
+        self.Graph = TemperatureGraphStore()
+        self.Now = datetime.now()
+        self.MinTime = self.Now - timedelta(hours=3)
+
+    def Averages(self, store: HistoryStore) -> list[float]:
+        hourly = self.Element.UpdateHourlyTemps(self.Graph, store, self.MinTime, self.Now)
+        return sorted(total / count for total, count in hourly.values())
+
+    def test_SameStoreIsIncremental(self):
+        store = Store(10.0, self.Now)
+        self.assertEqual(self.Averages(store), self.Averages(store))
+
+    def test_FreshStoreWithSameGenerationStartsOver(self):
+        old = Store(10.0, self.Now)
+        self.assertTrue(all(a == 10.0 for a in self.Averages(old)))
+
+        fresh = Store(20.0, self.Now)
+        self.assertEqual(fresh.Generation, old.Generation)
+        self.assertTrue(all(a == 20.0 for a in self.Averages(fresh)))
+        self.assertIs(self.Graph.HistorySource, fresh)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+﻿import logging, threading, unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from data.CurrentData import CurrentData
+from services.WeatherService import WeatherService
+
+class TestGetCurrentData(unittest.TestCase):
+    def setUp(self):
+        # Only the current data fan-out is exercised, so the service is built without its HTTP clients and database.
+        self.Results = {}
+        service = WeatherService.__new__(WeatherService)
+        service.Log = logging.getLogger("TestWeatherService")
+        service.Config = SimpleNamespace(Services=SimpleNamespace(Selections=SimpleNamespace(Current=["Station"])))
+        service.SourceExecutor = ThreadPoolExecutor(max_workers=1)
+        service.SourceFutures = {}
+        service.SourceMetrics = {}
+        service.LastGoodCurrent = {}
+        service.SourceLock = threading.Lock()
+        service.CurrentSource = lambda source: (lambda: self.Results[source], 5.0)
+        self.Service = service
+
+    def tearDown(self):
+        self.Service.SourceExecutor.shutdown(wait=True)
+
+    def test_NoneFallsBackToLastGood(self):
+        self.Results["Station"] = CurrentData(CurrentTemp=21.5)
+        self.assertEqual(self.Service.GetCurrentData().CurrentTemp, 21.5)
+
+        self.Results["Station"] = None
+        self.assertEqual(self.Service.GetCurrentData().CurrentTemp, 21.5)
+        self.assertEqual(self.Service.SourceMetrics["Station"].Errors, 1)
+        self.assertEqual(self.Service.SourceMetrics["Station"].Requests, 2)
+
+    def test_NoneWithoutLastGoodReturnsNone(self):
+        self.Results["Station"] = None
+        self.assertIsNone(self.Service.GetCurrentData())
+        self.assertEqual(self.Service.SourceMetrics["Station"].Errors, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+﻿# Times the rain forecast sky gradient for a strip of the given width. Run from the repository root:
+#   python -m tools.BenchmarkSkyGradient [--width 1000] [--runs 200] [--target-ms 5]
+# The exit code is 1 when the median CalculateMinuteGradients time misses the target, so it can gate a Pi 5 check.
+import argparse, platform, sys
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from core.elements.RainForecastGraphElement import BuildGradientStrip, CalculateMinuteGradients
+from data.ForecastData import ForecastData, HourlyForecast
+from data.SunData import DailySunTimes, SunData
+from data.WeatherConditions import WeatherConditions
+
+def SampleSunData(now: datetime, latitude: float) -> SunData:
+    def Day(offset: int) -> DailySunTimes:
+        noon = datetime.combine((now + timedelta(days=offset)).date(), datetime.min.time()).replace(hour=12, minute=57)
+        return DailySunTimes(SolarNoon=noon, Latitude=latitude)
+    return SunData(Day(-1), Day(0), Day(1), latitude)
+
+def SampleForecast(now: datetime) -> ForecastData:
+    start = now.replace(minute=0, second=0, microsecond=0)
+    hours = []
+    for i in range(25):
+        time = start + timedelta(hours=i)
+        hours.append(HourlyForecast(Time=time.strftime("%Y-%m-%d %H:%M"), Conditions=WeatherConditions(time=time, cloudCover=(i * 37 % 100) / 100)))
+    return ForecastData(Next24Hours=hours)
+
+def Measure(function, runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        start = perf_counter()
+        function()
+        times.append((perf_counter() - start) * 1000)
+    return sorted(times)
+
+def Main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the rain forecast sky gradient.")
+    parser.add_argument("--width", type=int, default=1000, help="Strip width in pixels.")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--target-ms", type=float, default=5.0, help="Median CalculateMinuteGradients time to pass.")
+    args = parser.parse_args()
+
+    now = datetime.now()
+    forecast = SampleForecast(now)
+    sunData = SampleSunData(now, 40.7)
+
+    # The first call pays for NumPy's lazy setup, which a running screen only does once.
+    mainColors, cloudColors = CalculateMinuteGradients(forecast, sunData, args.width)
+    gradients = Measure(lambda: CalculateMinuteGradients(forecast, sunData, args.width), args.runs)
+    strips = Measure(lambda: BuildGradientStrip(mainColors, cloudColors, 10, 35), args.runs)
+
+    print(F"{platform.machine()} / {platform.python_implementation()} {platform.python_version()}, {args.width} px, {args.runs} runs")
+    for name, times in (("CalculateMinuteGradients", gradients), ("BuildGradientStrip", strips)):
+        print(F"{name:26} median {times[len(times) // 2]:7.3f} ms   p95 {times[int(len(times) * 0.95)]:7.3f} ms   max {times[-1]:7.3f} ms")
+
+    median = gradients[len(gradients) // 2]
+    passed = median <= args.target_ms
+    print(F"{'PASS' if passed else 'FAIL'}: median {median:.3f} ms against a {args.target_ms:g} ms target")
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -1,4 +1,6 @@
-﻿from flask import Flask, request, redirect, url_for, session, render_template_string
+﻿from datetime import datetime, timedelta, timezone
+
+from flask import Flask, jsonify, request, redirect, url_for, session, render_template_string
 
 from config import WeatherConfig
 from core import WeatherDisplay, WeatherEncoder
@@ -33,6 +35,43 @@ class AdminRoutes:
         def debug():
             return render_template_string(AdminDebugHtmlBuilder.Page(display, config))
 
+        @adminApp.route("/debug/profiling", methods=["POST"])
+        def debug_profiling():
+            if (request.form.get("action") == "reset"):
+                display.Profiler.Reset()
+            else:
+                display.Profiler.SetEnabled(request.form.get("enabled") == "true")
+            return redirect(url_for("debug") + "#tab-profiling")
+
+        @adminApp.route("/api/profiling", methods=["GET", "POST"])
+        def api_profiling():
+            if request.method == "POST":
+                body = request.get_json(silent=True) or {}
+                if ("Enabled" in body):
+                    display.Profiler.SetEnabled(bool(body["Enabled"]))
+                if (body.get("Reset")):
+                    display.Profiler.Reset()
+            return jsonify(display.Profiler.Stats())
+
+        @adminApp.route("/api/services")
+        def api_services():
+            return jsonify(service.Stats())
+
+        @adminApp.route("/api/observations")
+        def api_observations():
+            if (service.Observations is None):
+                return jsonify({"error": "The observation database is disabled."}), 404
+            tier = request.args.get("tier", "Hourly")
+            end = datetime.now(timezone.utc)
+            start = end - timedelta(days=request.args.get("days", 7, type=float))
+            try:
+                if (tier == "Raw"):
+                    lines = service.Observations.Range(start, end)
+                    return jsonify([{"Time": l.ObservedTimeUtc.isoformat(), "CurrentTemp": l.CurrentTemp, "Humidity": l.Humidity, "Pressure": l.Pressure, "WindSpeed": l.Conditions.WindSpeed, "RainRate": l.Conditions.RainRate} for l in lines])
+                return jsonify(service.Observations.Rollups(tier, start, end))
+            except ValueError as ex:
+                return jsonify({"error": str(ex)}), 400
+
         @adminApp.route("/")
         def admin_root():
             return render_template_string(AdminDashboardHtmlBuilder.Page(display, config))
\ No newline at end of file
@@ -23,6 +23,9 @@ def NavTabs():
       <li class="nav-item" role="presentation">
         <button class="nav-link" id="tab-logs-tab" data-bs-toggle="tab" data-bs-target="#tab-logs" type="button" role="tab">Logs</button>
       </li>
+      <li class="nav-item" role="presentation">
+        <button class="nav-link" id="tab-profiling-tab" data-bs-toggle="tab" data-bs-target="#tab-profiling" type="button" role="tab">Profiling</button>
+      </li>
     </ul>
         '''
 
@@ -51,6 +54,43 @@ def LogsTab():
       </div>
       '''
 
+def ProfilingTab(weatherDisplay: WeatherDisplay):
+    stats = weatherDisplay.Profiler.Stats()
+    rows = "".join(F'''
+          <tr>
+            <td>{e["Element"]}</td>
+            <td class="text-end">{e["Count"]}</td>
+            <td class="text-end">{e["P50Ms"]:.2f}</td>
+            <td class="text-end">{e["P95Ms"]:.2f}</td>
+            <td class="text-end">{e["MaxMs"]:.2f}</td>
+            <td class="text-end">{e["Created"]}</td>
+            <td class="text-end">{e["Deleted"]}</td>
+            <td class="text-end">{e["ElementsBefore"]} &rarr; {e["ElementsAfter"]}</td>
+          </tr>''' for e in stats["Elements"])
+    if not rows:
+        rows = '<tr><td colspan="8" class="text-center">No refreshes recorded.</td></tr>'
+    toggle = "false" if stats["Enabled"] else "true"
+    toggleLabel = "Disable" if stats["Enabled"] else "Enable"
+
+    return F'''
+      <div class="tab-pane fade" id="tab-profiling" role="tabpanel" aria-labelledby="tab-profiling-tab">
+        <div class="mb-3 d-flex align-items-center gap-2">
+          <span>Profiling is <strong>{"on" if stats["Enabled"] else "off"}</strong>. {stats["CurrentElements"]} canvas elements live, {stats["ItemsCreated"]} created and {stats["ItemsDeleted"]} deleted since start.</span>
+          <form method="post" action="/debug/profiling" class="ms-auto d-flex gap-2">
+            <input type="hidden" name="enabled" value="{toggle}">
+            <button class="btn btn-primary" type="submit">{toggleLabel}</button>
+            <button class="btn btn-secondary" type="submit" name="action" value="reset">Reset</button>
+          </form>
+        </div>
+        <table class="table table-sm table-striped">
+          <thead>
+            <tr><th>Element</th><th class="text-end">Refreshes</th><th class="text-end">p50 ms</th><th class="text-end">p95 ms</th><th class="text-end">Max ms</th><th class="text-end">Created</th><th class="text-end">Deleted</th><th class="text-end">Elements</th></tr>
+          </thead>
+          <tbody>{rows}
+          </tbody>
+        </table>
+      </div>
+      '''
 
 class AdminDebugHtmlBuilder:
     def Page(weatherDisplay: WeatherDisplay, weatherConfig: WeatherConfig):
@@ -63,6 +103,7 @@ class AdminDebugHtmlBuilder:
                                         {DebugTab("sun")}
                                         {DebugTab("config")}
                                         {LogsTab()}
+                                        {ProfilingTab(weatherDisplay)}
                                      ''',
                                      weatherDisplay=weatherDisplay,
                                      weatherConfig=weatherConfig)
\ No newline at end of file